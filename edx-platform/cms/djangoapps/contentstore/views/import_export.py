@@ -8,6 +8,7 @@ import os
 import re
 import shutil
 import tarfile
+from contextlib import contextmanager
 from path import Path as path
 from tempfile import mkdtemp
 
@@ -16,7 +17,7 @@ from django.contrib.auth.decorators import login_required
 from django.core.exceptions import SuspiciousOperation, PermissionDenied
 from django.core.files.temp import NamedTemporaryFile
 from django.core.servers.basehttp import FileWrapper
-from django.http import HttpResponse, HttpResponseNotFound, Http404
+from django.http import HttpResponse, HttpResponseNotFound, Http404, StreamingHttpResponse
 from django.utils.translation import ugettext as _
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_http_methods, require_GET
@@ -29,7 +30,9 @@ from xmodule.modulestore.django import modulestore
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import LibraryLocator
 from xmodule.modulestore.xml_importer import import_course_from_xml, import_library_from_xml
-from xmodule.modulestore.xml_exporter import export_course_to_xml, export_library_to_xml
+from xmodule.modulestore.xml_exporter import (
+    export_course_to_xml, export_library_to_xml, export_course_to_tarball, export_library_to_tarball
+)
 from xmodule.modulestore import COURSE_ROOT, LIBRARY_ROOT
 
 from student.auth import has_course_author_access
@@ -285,7 +288,8 @@ def _import_handler(request, courselike_key, root_name, successful_url, context_
                         settings.GITHUB_REPO_ROOT, [dirpath],
                         load_error_modules=False,
                         static_content_store=contentstore(),
-                        target_id=courselike_key
+                        target_id=courselike_key,
+                        static_content_threads=settings.COURSE_IMPORT_STATIC_CONTENT_THREADS,
                     )
 
                 new_location = courselike_items[0].location
@@ -398,15 +402,42 @@ def create_export_tarball(course_module, course_key, context):
     root_dir = path(mkdtemp())
 
     try:
+        with export_error_context(course_key, context):
+            if isinstance(course_key, LibraryLocator):
+                export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
+            else:
+                export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
+
+            logging.debug(u'tar file being generated at %s', export_file.name)
+            with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
+                tar_file.add(root_dir / name, arcname=name)
+    finally:
+        shutil.rmtree(root_dir / name)
+
+    return export_file
+
+
+def create_export_tarball_stream(course_module, course_key, context):
+    """
+    Exports the course, and returns an iterator over the chunks of its tarball, which streams the
+    course's static assets from the contentstore rather than staging the tarball on disk.
+
+    Updates the context with any error information if applicable.
+    """
+    name = course_module.url_name
+    with export_error_context(course_key, context):
         if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
-        else:
-            export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
+            return export_library_to_tarball(modulestore(), contentstore(), course_key, name)
+        return export_course_to_tarball(modulestore(), contentstore(), course_module.id, name)
 
-        logging.debug(u'tar file being generated at %s', export_file.name)
-        with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
 
+@contextmanager
+def export_error_context(course_key, context):
+    """
+    Updates the context with the information about any error exporting the course, and re-raises it.
+    """
+    try:
+        yield
     except SerializationError as exc:
         log.exception(u'There was an error exporting %s', course_key)
         unit = None
@@ -439,10 +470,6 @@ def create_export_tarball(course_module, course_key, context):
             'unit': None,
             'raw_err_msg': str(exc)})
         raise
-    finally:
-        shutil.rmtree(root_dir / name)
-
-    return export_file
 
 
 def send_tarball(tarball):
@@ -456,6 +483,16 @@ def send_tarball(tarball):
     return response
 
 
+def send_tarball_stream(chunks, name):
+    """
+    Streams the chunks of a tarball to the response, for use when sending a tar.gz file to the user
+    as it's generated.
+    """
+    response = StreamingHttpResponse(chunks, content_type='application/x-tgz')
+    response['Content-Disposition'] = 'attachment; filename=%s.tar.gz' % name.encode('utf-8')
+    return response
+
+
 @ensure_csrf_cookie
 @login_required
 @require_http_methods(("GET",))
@@ -504,6 +541,9 @@ def export_handler(request, course_key_string):
 
     if 'application/x-tgz' in requested_format:
         try:
+            if settings.COURSE_EXPORT_STREAMING:
+                chunks = create_export_tarball_stream(courselike_module, course_key, context)
+                return send_tarball_stream(chunks, courselike_module.url_name)
             tarball = create_export_tarball(courselike_module, course_key, context)
         except SerializationError:
             return render_to_response('export.html', context)
@@ -10,6 +10,7 @@ import os
 import shutil
 import tarfile
 import tempfile
+from io import BytesIO
 from path import Path as path
 from uuid import uuid4
 
@@ -17,6 +18,7 @@ from django.test.utils import override_settings
 from django.conf import settings
 
 from contentstore.tests.test_libraries import LibraryTestCase
+from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.xml_exporter import export_library_to_xml, export_course_to_xml
@@ -553,6 +555,25 @@ class ExportTestCase(CourseTestCase):
         resp = self.client.get(self.url + '?_accept=application/x-tgz')
         self._verify_export_succeeded(resp)
 
+    @override_settings(COURSE_EXPORT_STREAMING=True)
+    def test_export_targz_streaming(self):
+        """
+        Get a tar.gz file that's streamed as it's generated.
+        """
+        asset_key = StaticContent.compute_location(self.course.id, 'streamed.txt')
+        contentstore().save(StaticContent(asset_key, 'streamed.txt', 'text/plain', 'streamed asset'))
+
+        resp = self.client.get(self.url, HTTP_ACCEPT='application/x-tgz')
+        self._verify_export_succeeded(resp)
+        self.assertTrue(resp.streaming)
+
+        name = self.course.url_name
+        with tarfile.open(fileobj=BytesIO(''.join(resp.streaming_content)), mode='r:gz') as tar_file:
+            self.assertIn('{}/course.xml'.format(name), tar_file.getnames())
+            self.assertEqual(tar_file.extractfile('{}/static/streamed.txt'.format(name)).read(), 'streamed asset')
+            assets_policy = json.loads(tar_file.extractfile('{}/policies/assets.json'.format(name)).read())
+            self.assertEqual(assets_policy['streamed.txt']['contentType'], 'text/plain')
+
     def _verify_export_succeeded(self, resp):
         """ Export success helper method. """
         self.assertEquals(resp.status_code, 200)
@@ -339,6 +339,10 @@ XBLOCK_FIELD_DATA_WRAPPERS = ENV_TOKENS.get(
 )
 
 CONTENTSTORE = AUTH_TOKENS['CONTENTSTORE']
+COURSE_ASSETS_DISK_CACHE_DIR = ENV_TOKENS.get('COURSE_ASSETS_DISK_CACHE_DIR', COURSE_ASSETS_DISK_CACHE_DIR)
+COURSE_ASSETS_DISK_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_ASSETS_DISK_CACHE_MAX_SIZE', COURSE_ASSETS_DISK_CACHE_MAX_SIZE
+)
 DOC_STORE_CONFIG = AUTH_TOKENS['DOC_STORE_CONFIG']
 # Datadog for events!
 DATADOG = AUTH_TOKENS.get("DATADOG", {})
@@ -421,6 +425,16 @@ ADVANCED_PROBLEM_TYPES = ENV_TOKENS.get('ADVANCED_PROBLEM_TYPES', ADVANCED_PROBL
 
 VIDEO_UPLOAD_PIPELINE = ENV_TOKENS.get('VIDEO_UPLOAD_PIPELINE', VIDEO_UPLOAD_PIPELINE)
 
+################ COURSE IMPORT ###############
+
+COURSE_IMPORT_STATIC_CONTENT_THREADS = ENV_TOKENS.get(
+    'COURSE_IMPORT_STATIC_CONTENT_THREADS', COURSE_IMPORT_STATIC_CONTENT_THREADS
+)
+
+################ COURSE EXPORT ###############
+
+COURSE_EXPORT_STREAMING = ENV_TOKENS.get('COURSE_EXPORT_STREAMING', COURSE_EXPORT_STREAMING)
+
 ################ PUSH NOTIFICATIONS ###############
 
 PARSE_KEYS = AUTH_TOKENS.get("PARSE_KEYS", {})
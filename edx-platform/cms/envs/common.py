@@ -438,6 +438,15 @@ XBLOCK_FIELD_DATA_WRAPPERS = ()
 ############################ Modulestore Configuration ################################
 MODULESTORE_BRANCH = 'draft-preferred'
 
+# Directory of a local on-disk cache of the course assets served by the StaticContentServer,
+# in files named after the assets' content digests.  Set to None to disable it.
+COURSE_ASSETS_DISK_CACHE_DIR = None
+# Maximum total size, in bytes, of the files in the course assets disk cache.  Each process
+# keeps a running total of the sizes of the files it adds, and once that exceeds the maximum,
+# walks the directory to evict the least recently used files.  Set to None to leave the disk
+# cache unbounded.
+COURSE_ASSETS_DISK_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -1104,6 +1113,13 @@ MAX_ASSET_UPLOAD_FILE_SIZE_IN_MB = 10
 # a file that exceeds the above size
 MAX_ASSET_UPLOAD_FILE_SIZE_URL = ""
 
+### Number of threads from which the static files of imported courses are saved to the contentstore
+COURSE_IMPORT_STATIC_CONTENT_THREADS = 1
+
+### Whether course exports are streamed to the browser as they're compressed, rather than
+### written to a temporary tar.gz file first
+COURSE_EXPORT_STREAMING = False
+
 ### Default value for entrance exam minimum score
 ENTRANCE_EXAM_MIN_SCORE_PCT = 50
 
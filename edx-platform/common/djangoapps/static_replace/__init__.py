@@ -5,6 +5,7 @@ from django.contrib.staticfiles.storage import staticfiles_storage
 from django.contrib.staticfiles import finders
 from django.conf import settings
 
+from openedx.core.djangoapps.contentserver.caching import CONTENT_CACHE
 from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore import ModuleStoreEnum
@@ -15,6 +16,13 @@ from opaque_keys.edx.locator import AssetLocator
 log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock'
 
+# Number of seconds the rewritten static urls of a course are cached for, as a fail-safe
+# in case the signal to invalidate them doesn't come through.
+STATIC_URLS_CACHE_TIMEOUT = 60 * 60
+
+# Compiled url replacement regexes, by their prefix patterns.
+_COMPILED_URL_REPLACE_REGEXES = {}
+
 
 def _url_replace_regex(prefix):
     """
@@ -32,6 +40,26 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+def _compiled_url_replace_regex(prefix):
+    """
+    Returns the compiled _url_replace_regex for the given prefix.
+    """
+    regex = _COMPILED_URL_REPLACE_REGEXES.get(prefix)
+    if regex is None:
+        regex = _COMPILED_URL_REPLACE_REGEXES[prefix] = re.compile(_url_replace_regex(prefix))
+    return regex
+
+
+def _static_url_prefix(data_dir):
+    """
+    Returns the regex of the prefix of static urls, excluding those in the given data directory.
+    """
+    return u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -103,34 +131,34 @@ def process_static_urls(text, replacement_function, data_dir=None):
     """
     def wrap_part_extraction(match):
         """
-        Unwraps a match group for the captures specified in _url_replace_regex
-        and forward them on as function arguments
+        Forwards the match on to _replace_static_url_match
         """
-        original = match.group(0)
-        prefix = match.group('prefix')
-        quote = match.group('quote')
-        rest = match.group('rest')
+        return _replace_static_url_match(match, replacement_function)
 
-        # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
-        # works for actual static assets and for magical course asset URLs....
-        full_url = prefix + rest
+    return _compiled_url_replace_regex(_static_url_prefix(data_dir)).sub(wrap_part_extraction, text)
 
-        starts_with_static_url = full_url.startswith(unicode(settings.STATIC_URL))
-        starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
-        contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
-        if starts_with_prefix or (starts_with_static_url and contains_prefix):
-            return original
 
-        return replacement_function(original, prefix, quote, rest)
+def _replace_static_url_match(match, replacement_function):
+    """
+    Unwraps a match group for the captures specified in _url_replace_regex
+    and forward them on as function arguments
+    """
+    original = match.group(0)
+    prefix = match.group('prefix')
+    quote = match.group('quote')
+    rest = match.group('rest')
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
+    # works for actual static assets and for magical course asset URLs....
+    full_url = prefix + rest
+
+    starts_with_static_url = full_url.startswith(unicode(settings.STATIC_URL))
+    starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
+    contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
+    if starts_with_prefix or (starts_with_static_url and contains_prefix):
+        return original
+
+    return replacement_function(original, prefix, quote, rest)
 
 
 def make_static_urls_absolute(request, html):
@@ -162,8 +190,89 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
     course_id: The course identifier used to distinguish static content for this course in studio
     static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
     """
+    replace_static_url = _StaticUrlReplacer(data_directory, course_id, static_asset_path)
+    text = process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    replace_static_url.save()
+    return text
+
+
+def replace_urls(text, course_id, data_directory=None, static_asset_path='', jump_to_id_base_url=None):
+    """
+    Replace, in a single pass over the text, the urls that replace_static_urls and
+    replace_course_urls replace, as well as those that replace_jump_to_id_urls replaces
+    if given a jump_to_id_base_url.
+
+    text: The source text to do the substitution in
+    course_id: The course identifier used to distinguish static content for this course in studio
+    data_directory: The directory in which course data is stored
+    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+    jump_to_id_base_url: The base of the jump_to_id handler urls, as for replace_jump_to_id_urls
+
+    returns: text with the urls replaced
+    """
+    replace_static_url = _StaticUrlReplacer(data_directory, course_id, static_asset_path)
+    course_url_base = '/courses/' + course_id.to_deprecated_string() + '/'
+
+    prefixes = [
+        u'(?P<static_prefix>{})'.format(_static_url_prefix(static_asset_path or data_directory)),
+        u'(?P<course_prefix>/course/)',
+    ]
+    if jump_to_id_base_url is not None:
+        prefixes.append(u'(?P<jump_to_id_prefix>/jump_to_id/)')
+
+    def replace_url(match):
+        """
+        Replace a single matched url according to its prefix.
+        """
+        if match.group('static_prefix') is not None:
+            return _replace_static_url_match(match, replace_static_url)
+
+        quote = match.group('quote')
+        rest = match.group('rest')
+        if match.group('course_prefix') is not None:
+            return "".join([quote, course_url_base, rest, quote])
+        return "".join([quote, jump_to_id_base_url + rest, quote])
+
+    text = _compiled_url_replace_regex(u'|'.join(prefixes)).sub(replace_url, text)
+    replace_static_url.save()
+    return text
+
+
+def invalidate_static_urls(course_key):
+    """
+    Removes the cached static urls of the given course, e.g. once its assets changed.
+    """
+    CONTENT_CACHE.delete(_static_urls_cache_key(course_key))
+
 
-    def replace_static_url(original, prefix, quote, rest):
+def _static_urls_cache_key(course_key):
+    """
+    Returns the cache key of the static urls of the given course.
+    """
+    return u'static_replace.static_urls.{}'.format(course_key)
+
+
+class _StaticUrlReplacer(object):
+    """
+    Replaces single matched static urls for replace_static_urls.
+
+    The urls that the static urls of a course are replaced with are cached per course
+    since they require looking them up in the static files storage and in the contentstore.
+    The cache is invalidated when the course's assets change.
+    """
+    def __init__(self, data_directory, course_id, static_asset_path):
+        self.data_directory = data_directory
+        self.course_id = course_id
+        self.static_asset_path = static_asset_path
+
+        # In debug mode, urls are looked up with the staticfiles finders, so aren't cached.
+        self._cacheable = course_id is not None and not settings.DEBUG
+        self._asset_config = None
+        self._variant = None
+        self._urls = None
+        self._added_urls = False
+
+    def __call__(self, original, prefix, quote, rest):
         """
         Replace a single matched url.
         """
@@ -171,11 +280,59 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         if rest.endswith('?raw'):
             return original
 
+        if not self._cacheable:
+            url = self._lookup_url(original, prefix, quote, rest)
+        else:
+            if self._urls is None:
+                self._load()
+            url = self._urls.get((self._variant, rest))
+            if url is None:
+                url = self._urls[(self._variant, rest)] = self._lookup_url(original, prefix, quote, rest)
+                self._added_urls = True
+
+        if url is None:
+            return original
+        return "".join([quote, url, quote])
+
+    def save(self):
+        """
+        Stores the urls that were looked up into the cache.
+        """
+        if self._added_urls:
+            CONTENT_CACHE.set(_static_urls_cache_key(self.course_id), self._urls, STATIC_URLS_CACHE_TIMEOUT)
+            self._added_urls = False
+
+    def _load(self):
+        """
+        Loads the cached urls of the course.
+        """
+        if (not self.static_asset_path) and self.course_id:
+            base_url, excluded_exts = self._get_asset_config()
+            self._variant = (base_url, tuple(excluded_exts))
+        else:
+            self._variant = (self.static_asset_path or self.data_directory,)
+        self._urls = CONTENT_CACHE.get(_static_urls_cache_key(self.course_id)) or {}
+
+    def _get_asset_config(self):
+        """
+        Returns the base url and the excluded extensions for canonicalizing asset paths.
+        """
+        if self._asset_config is None:
+            self._asset_config = (
+                AssetBaseUrlConfig.get_base_url(),
+                AssetExcludedExtensionsConfig.get_excluded_extensions(),
+            )
+        return self._asset_config
+
+    def _lookup_url(self, original, prefix, quote, rest):  # pylint: disable=unused-argument
+        """
+        Looks up the url to replace a single matched url with, or None to leave it as is.
+        """
         # In debug mode, if we can find the url as is,
         if settings.DEBUG and finders.find(rest, True):
-            return original
+            return None
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) and course_id:
+        elif (not self.static_asset_path) and self.course_id:
             # first look in the static file pipeline and see if we are trying to reference
             # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
 
@@ -191,16 +348,15 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
             else:
                 # if not, then assume it's courseware specific content and then look in the
                 # Mongo-backed database
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+                base_url, excluded_exts = self._get_asset_config()
+                url = StaticContent.get_canonicalized_asset_path(self.course_id, rest, base_url, excluded_exts)
 
                 if AssetLocator.CANONICAL_NAMESPACE in url:
                     url = url.replace('block@', 'block/', 1)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
-            course_path = "/".join((static_asset_path or data_directory, rest))
+            course_path = "/".join((self.static_asset_path or self.data_directory, rest))
 
             try:
                 if staticfiles_storage.exists(rest):
@@ -213,6 +369,4 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
                     rest, str(err)))
                 url = "".join([prefix, course_path])
 
-        return "".join([quote, url, quote])
-
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+        return url
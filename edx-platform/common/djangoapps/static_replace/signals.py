@@ -0,0 +1,16 @@
+"""
+Signal handler for invalidating the cached static urls of courses
+"""
+from django.dispatch.dispatcher import receiver
+from xmodule.modulestore.django import SignalHandler
+
+from . import invalidate_static_urls
+
+
+@receiver(SignalHandler.course_published)
+def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Catches the signal that a course has been published in Studio, e.g. once it was
+    imported along with its assets, and invalidates the course's cached static urls.
+    """
+    invalidate_static_urls(course_key)
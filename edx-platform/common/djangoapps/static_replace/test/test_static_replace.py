@@ -10,9 +10,13 @@ from urlparse import urlparse, urlunparse, parse_qsl
 from PIL import Image
 from cStringIO import StringIO
 from nose.tools import assert_equals, assert_true, assert_false  # pylint: disable=no-name-in-module
+from django.core.cache.backends.locmem import LocMemCache
 from static_replace import (
+    invalidate_static_urls,
     replace_static_urls,
     replace_course_urls,
+    replace_jump_to_id_urls,
+    replace_urls,
     _url_replace_regex,
     process_static_urls,
     make_static_urls_absolute
@@ -228,6 +232,57 @@ def test_static_url_with_xblock_resource_on_cdn(mock_modulestore, mock_storage):
     assert_equals(post_text, replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY))
 
 
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('static_replace.modulestore', autospec=True)
+def test_replace_urls(mock_modulestore, mock_storage):
+    """
+    Make sure that replacing all urls in a single pass has the same result as
+    replacing each kind of url in turn.
+    """
+    mock_storage.exists.return_value = False
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+    jump_to_id_base_url = '/courses/org/course/run/jump_to_id/'
+
+    text = (
+        '<img src="/static/file.png"/><a href="/course/info">Info</a> <a href=\'/jump_to_id/abc\'>Abc</a> '
+        '<img src="/static/file.png?raw"/><a href="/not-course/info">'
+    )
+    expected = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+        COURSE_KEY,
+        jump_to_id_base_url,
+    )
+    assert_equals(expected, replace_urls(text, COURSE_KEY, DATA_DIRECTORY, jump_to_id_base_url=jump_to_id_base_url))
+    assert_equals(
+        replace_course_urls(replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+        replace_urls(text, COURSE_KEY, DATA_DIRECTORY),
+    )
+
+
+@patch('static_replace.CONTENT_CACHE', LocMemCache('static_replace_test', {}))
+@patch('static_replace.StaticContent', autospec=True)
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('static_replace.AssetBaseUrlConfig.get_base_url')
+@patch('static_replace.AssetExcludedExtensionsConfig.get_excluded_extensions')
+def test_static_urls_cached(mock_get_excluded_extensions, mock_get_base_url, mock_storage, mock_static_content):
+    """
+    Make sure that the static urls of a course are looked up once until they're invalidated.
+    """
+    mock_storage.exists.return_value = False
+    mock_static_content.get_canonicalized_asset_path.return_value = "/c4x/mock_url"
+    mock_get_base_url.return_value = u''
+    mock_get_excluded_extensions.return_value = []
+
+    text = STATIC_SOURCE + STATIC_SOURCE
+    for __ in range(2):
+        assert_equals('"/c4x/mock_url""/c4x/mock_url"', replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY))
+    assert_equals(mock_static_content.get_canonicalized_asset_path.call_count, 1)
+
+    invalidate_static_urls(COURSE_KEY)
+    assert_equals('"/c4x/mock_url""/c4x/mock_url"', replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY))
+    assert_equals(mock_static_content.get_canonicalized_asset_path.call_count, 2)
+
+
 @ddt.ddt
 class CanonicalContentTest(SharedModuleStoreTestCase):
     """
@@ -25,3 +25,14 @@ class BaseBackend(object):
     def send(self, event):
         """Send event to tracker."""
         pass
+
+    def send_batch(self, events):
+        """
+        Send a batch of events to tracker.
+
+        Backends that can store several events at once should override
+        this; by default, each event is sent on its own.
+
+        """
+        for event in events:
+            self.send(event)
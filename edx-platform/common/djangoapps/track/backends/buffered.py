@@ -0,0 +1,201 @@
+"""
+Event tracker backend that queues events in-process and sends them in
+batches to another backend from a background thread.
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import threading
+import time
+import weakref
+from Queue import Queue, Empty, Full
+
+from dogapi import dog_stats_api
+from django.db import close_old_connections
+
+from track.backends import BaseBackend
+
+
+log = logging.getLogger(__name__)
+
+
+# Number of seconds that the process waits on exit for the queued events
+# of each buffered backend to be sent.
+SHUTDOWN_TIMEOUT = 5
+
+# Queued by close() to stop the worker thread.
+_STOP = object()
+
+# Buffered backends of this process, to be closed on exit.
+_backends = weakref.WeakSet()
+
+
+class BufferedBackend(BaseBackend):
+    """
+    Event tracker backend that queues events and sends them in batches to
+    another backend from a background worker thread, so sending an event
+    doesn't wait on the other backend's storage.
+
+    The queue is bounded: when it is full, sending an event waits for up
+    to `block_timeout` seconds for the worker to catch up, after which
+    the event is dropped and counted.  The events still queued when the
+    process exits are sent before it exits.
+
+    Example configuration::
+
+      TRACKING_BACKENDS = {
+          'mongo': {
+              'ENGINE': 'track.backends.buffered.BufferedBackend',
+              'OPTIONS': {
+                  'backend': {
+                      'ENGINE': 'track.backends.mongodb.MongoBackend',
+                      'OPTIONS': {...},
+                  },
+                  'batch_size': 100,
+              }
+          }
+      }
+
+    """
+
+    def __init__(self, backend, max_queue_size=10000, batch_size=100, flush_interval=1.0, block_timeout=0, **kwargs):
+        """
+        :Parameters:
+
+          - `backend`: configuration of the backend to send the events
+            to, as a dict with the 'ENGINE' and 'OPTIONS' of the backend
+          - `max_queue_size`: maximum number of events queued at once
+          - `batch_size`: maximum number of events sent in a batch
+          - `flush_interval`: maximum number of seconds that the worker
+            waits for a batch to fill up before sending it
+          - `block_timeout`: number of seconds that sending an event waits
+            for room in a full queue before dropping the event
+
+        """
+        super(BufferedBackend, self).__init__(**kwargs)
+
+        # Imported here since the tracker instantiates its backends when
+        # it's imported.
+        from track.tracker import _instantiate_backend_from_name
+
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+
+        # Counters of the events since the backend was created.
+        self.sent_count = 0
+        self.dropped_count = 0
+
+        self._queue = None
+        self._worker = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+        _backends.add(self)
+
+    def send(self, event):
+        """Queue the event, or drop it if the queue stays full."""
+        queue = self._get_queue()
+        try:
+            if self.block_timeout:
+                queue.put(event, timeout=self.block_timeout)
+            else:
+                queue.put_nowait(event)
+        except Full:
+            self.dropped_count += 1
+            dog_stats_api.increment('track.send.buffered.dropped')
+
+    def flush(self):
+        """Wait until all queued events are sent."""
+        with self._lock:
+            queue = self._queue if self._pid == os.getpid() else None
+        if queue is not None:
+            queue.join()
+
+    def close(self, timeout=None):
+        """
+        Send the queued events and stop the worker thread, waiting for
+        up to `timeout` seconds for it to stop.
+
+        """
+        with self._lock:
+            if self._worker is None or self._pid != os.getpid():
+                return
+            queue, worker = self._queue, self._worker
+            self._queue = self._worker = self._pid = None
+        queue.put(_STOP)
+        worker.join(timeout)
+
+    def _get_queue(self):
+        """
+        Return the queue of the events, starting the worker thread to
+        send them if it isn't running in this process.
+
+        """
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                # A forked process doesn't inherit the worker thread, and
+                # leaves the events queued before the fork to the parent.
+                if self._pid != pid:
+                    self._queue = Queue(self.max_queue_size)
+                    self._worker = threading.Thread(
+                        target=self._run,
+                        args=(self._queue,),
+                        name='track-buffered-backend',
+                    )
+                    self._worker.daemon = True
+                    self._worker.start()
+                    self._pid = pid
+        return self._queue
+
+    def _run(self, queue):
+        """Send the events of the queue in batches, until it's stopped."""
+        stopped = False
+        while not stopped:
+            batch = [queue.get()]
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if batch[-1] is _STOP:
+                    break
+                remaining = deadline - time.time()
+                try:
+                    batch.append(queue.get(timeout=remaining) if remaining > 0 else queue.get_nowait())
+                except Empty:
+                    break
+
+            if batch[-1] is _STOP:
+                stopped = True
+                batch.pop()
+                queue.task_done()
+
+            if batch:
+                self._send_batch(batch)
+            for __ in batch:
+                queue.task_done()
+
+    def _send_batch(self, batch):
+        """Send a batch of events to the backend."""
+        # The worker thread keeps its own database connections, which
+        # need to be closed when they're no longer usable.
+        close_old_connections()
+        try:
+            with dog_stats_api.timer('track.send.buffered.batch'):
+                self.backend.send_batch(batch)
+        except Exception:  # pylint: disable=broad-except
+            log.exception('Error sending a batch of %d events to the event tracker backend', len(batch))
+        else:
+            self.sent_count += len(batch)
+
+
+@atexit.register
+def _close_backends():
+    """Send the queued events of all buffered backends on exit."""
+    for backend in list(_backends):
+        backend.close(SHUTDOWN_TIMEOUT)
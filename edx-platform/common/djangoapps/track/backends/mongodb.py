@@ -88,8 +88,17 @@ class MongoBackend(BaseBackend):
 
     def send(self, event):
         """Insert the event in to the Mongo collection"""
+        self._insert(event)
+
+    def send_batch(self, events):
+        """Insert the events in to the Mongo collection at once"""
+        if events:
+            self._insert(list(events))
+
+    def _insert(self, doc_or_docs):
+        """Insert the given event, or list of events, in to the Mongo collection"""
         try:
-            self.collection.insert(event, manipulate=False)
+            self.collection.insert(doc_or_docs, manipulate=False)
         except (PyMongoError, BSONError):
             # The event will be lost in case of a connection error or any error
             # that occurs when trying to insert the event into Mongo.
@@ -0,0 +1,74 @@
+"""Tests for the buffered event tracker backend."""
+from __future__ import absolute_import
+
+import threading
+
+from django.test import TestCase
+
+from track.backends import BaseBackend
+from track.backends.buffered import BufferedBackend
+
+
+class InMemoryBackend(BaseBackend):
+    """Backend that records the batches of events sent to it."""
+    def __init__(self, **kwargs):
+        super(InMemoryBackend, self).__init__(**kwargs)
+        self.batches = []
+        self.sending = threading.Event()
+        self.unblocked = threading.Event()
+        self.unblocked.set()
+
+    def send(self, event):
+        self.send_batch([event])
+
+    def send_batch(self, events):
+        self.sending.set()
+        self.unblocked.wait()
+        self.batches.append(list(events))
+
+
+class TestBufferedBackend(TestCase):
+    def create_backend(self, **options):
+        """Create a buffered backend around an InMemoryBackend."""
+        backend = BufferedBackend(
+            backend={'ENGINE': 'track.backends.tests.test_buffered.InMemoryBackend'},
+            **options
+        )
+        self.addCleanup(backend.close)
+        return backend
+
+    def test_send_in_batches(self):
+        backend = self.create_backend(batch_size=2, flush_interval=60)
+        events = [{'test': index} for index in range(5)]
+        for event in events:
+            backend.send(event)
+        backend.close()
+
+        batches = backend.backend.batches
+        self.assertEqual(sum(batches, []), events)
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+        self.assertEqual(backend.sent_count, 5)
+        self.assertEqual(backend.dropped_count, 0)
+
+    def test_flush(self):
+        backend = self.create_backend(flush_interval=0)
+        backend.send({'test': 1})
+        backend.flush()
+        self.assertEqual(backend.backend.batches, [[{'test': 1}]])
+
+    def test_drop_when_full(self):
+        backend = self.create_backend(max_queue_size=1, batch_size=1)
+        backend.backend.unblocked.clear()
+
+        # The worker holds the first event until it's unblocked, and the
+        # second one fills the queue.
+        backend.send({'test': 1})
+        backend.backend.sending.wait()
+        backend.send({'test': 2})
+        backend.send({'test': 3})
+        self.assertEqual(backend.dropped_count, 1)
+
+        backend.backend.unblocked.set()
+        backend.flush()
+        self.assertEqual(backend.backend.batches, [[{'test': 1}], [{'test': 2}]])
+        self.assertEqual(backend.sent_count, 2)
@@ -4,9 +4,11 @@ Parser and evaluator for FormulaResponse and NumericalResponse
 Uses pyparsing to parse. Main function as of now is evaluator().
 """
 
+from collections import OrderedDict
 import math
 import operator
 import numbers
+from threading import Lock
 import numpy
 import scipy.constants
 import functions
@@ -228,34 +230,332 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     if math_expr.strip() == "":
         return float('nan')
 
-    # Parse the tree.
-    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
-    math_interpreter.parse_algebra()
+    # Parse the tree, or reuse an earlier parse of the same expression.
+    compiled = compile_expression(math_expr, case_sensitive)
 
     # Get our variables together.
     all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
 
     # ...and check them
-    math_interpreter.check_variables(all_variables, all_functions)
+    compiled.check_variables(all_variables, all_functions)
 
-    # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
-
-    evaluate_actions = {
-        'number': eval_number,
-        'variable': lambda x: all_variables[casify(x[0])],
-        'function': lambda x: all_functions[casify(x[0])](x[1]),
-        'atom': eval_atom,
-        'power': eval_power,
-        'parallel': eval_parallel,
-        'product': eval_product,
-        'sum': eval_sum
-    }
-
-    return math_interpreter.reduce_tree(evaluate_actions)
+    return compiled.evaluate(all_variables, all_functions)
+
+
+def evaluate_samples(samples, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression at each of a list of points.
+
+    `samples` is a list of variable dictionaries, as passed to `evaluator()`,
+    which must all define the same variables. Return the list of results, in
+    the same order.
+
+    When possible, evaluate the expression once over NumPy arrays holding the
+    values of all the samples. Otherwise, i.e. when the expression uses
+    functions that don't accept arrays or raises a floating point error,
+    evaluate it at each sample in turn, as `evaluator()` does, so results and
+    exceptions are the same either way.
+    """
+    if not samples:
+        return []
+
+    if math_expr.strip() == "":
+        return [float('nan')] * len(samples)
+
+    compiled = compile_expression(math_expr, case_sensitive)
+    if compiled.is_vectorizable(functions, case_sensitive):
+        names = set(samples[0])
+        if all(set(sample) == names for sample in samples):
+            variables = {name: numpy.array([sample[name] for sample in samples]) for name in names}
+            all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+            compiled.check_variables(all_variables, all_functions)
+            try:
+                with numpy.errstate(divide='raise', over='raise', invalid='raise'):
+                    result = compiled.evaluate_vectorized(all_variables, all_functions)
+            except Exception:  # pylint: disable=broad-except
+                # Let the evaluation at each sample raise the right error,
+                # if any.
+                pass
+            else:
+                if numpy.ndim(result) == 0:
+                    return [numpy.asarray(result).tolist()] * len(samples)
+                return numpy.asarray(result).tolist()
+
+    return [
+        evaluator(sample, functions, math_expr, case_sensitive=case_sensitive)
+        for sample in samples
+    ]
+
+
+# The maximum number of parsed expressions to keep in memory.
+COMPILED_EXPRESSION_CACHE_SIZE = 1024
+
+# Map of (math_expr, case_sensitive) to its CompiledExpression, ordered from
+# the least to the most recently used.
+_COMPILED_EXPRESSIONS = OrderedDict()
+_COMPILED_EXPRESSIONS_LOCK = Lock()
+
+
+def compile_expression(math_expr, case_sensitive=False):
+    """
+    Return the CompiledExpression for the given math expression string.
+
+    Expressions are parsed only once and then kept in a bounded cache, since
+    the same answers are typically evaluated over and over.
+    """
+    key = (math_expr, case_sensitive)
+    with _COMPILED_EXPRESSIONS_LOCK:
+        compiled = _COMPILED_EXPRESSIONS.pop(key, None)
+        if compiled is not None:
+            _COMPILED_EXPRESSIONS[key] = compiled
+            return compiled
+
+    # Parse outside of the lock; parse errors are raised and not cached.
+    compiled = CompiledExpression(math_expr, case_sensitive)
+
+    with _COMPILED_EXPRESSIONS_LOCK:
+        _COMPILED_EXPRESSIONS[key] = compiled
+        while len(_COMPILED_EXPRESSIONS) > COMPILED_EXPRESSION_CACHE_SIZE:
+            _COMPILED_EXPRESSIONS.popitem(last=False)
+    return compiled
+
+
+# Functions which may be applied to arrays of values elementwise.
+VECTORIZED_FUNCTIONS = frozenset(
+    func for func in DEFAULT_FUNCTIONS.itervalues()
+    if func not in (math.factorial, functions.arccot)
+)
+
+
+class CompiledExpression(object):
+    """
+    A math expression parsed once into a tree of nested closures, which may
+    then be evaluated with any number of variables and functions.
+
+    Each closure takes the dictionaries of all variables and functions, as
+    returned by `add_defaults()`, and returns the value of its node.
+    """
+    def __init__(self, math_expr, case_sensitive=False):
+        parser = ParseAugmenter(math_expr, case_sensitive)
+        parser.parse_algebra()
+        self.math_expr = math_expr
+        self.case_sensitive = case_sensitive
+        self.variables_used = parser.variables_used
+        self.functions_used = parser.functions_used
+        self._check_variables = parser.check_variables
+
+        if case_sensitive:
+            casify = lambda x: x
+        else:
+            casify = lambda x: x.lower()  # Lowercase for case insens.
+
+        common_actions = {
+            'number': compile_number,
+            'variable': lambda x: compile_variable(casify(x[0])),
+            'function': lambda x: compile_function(casify(x[0]), x[1]),
+        }
+
+        # Evaluate one point with the same actions as always, so results and
+        # errors don't depend on whether the expression was cached.
+        scalar_actions = dict(common_actions)
+        scalar_actions.update({
+            name: compile_action(action) for name, action in [
+                ('atom', eval_atom),
+                ('power', eval_power),
+                ('parallel', eval_parallel),
+                ('product', eval_product),
+                ('sum', eval_sum),
+            ]
+        })
+        self._evaluate = parser.reduce_tree(scalar_actions)
+
+        vectorized_actions = dict(common_actions)
+        vectorized_actions.update({
+            'atom': compile_vectorized_atom,
+            'power': compile_vectorized_power,
+            'parallel': compile_vectorized_parallel,
+            'product': compile_vectorized_product,
+            'sum': compile_vectorized_sum,
+        })
+        self._evaluate_vectorized = parser.reduce_tree(vectorized_actions)
+
+    def check_variables(self, valid_variables, valid_functions):
+        """
+        Raise an UndefinedVariable if the expression uses any variables or
+        functions that aren't valid/defined.
+        """
+        self._check_variables(valid_variables, valid_functions)
+
+    def is_vectorizable(self, functions, case_sensitive):
+        """
+        Return whether all the functions used by the expression, with the given
+        user-defined `functions`, may be applied to arrays.
+        """
+        _, all_functions = add_defaults({}, functions, case_sensitive)
+        casify = (lambda x: x) if case_sensitive else (lambda x: x.lower())
+        return all(
+            all_functions.get(casify(name)) in VECTORIZED_FUNCTIONS
+            for name in self.functions_used
+        )
+
+    def evaluate(self, all_variables, all_functions):
+        """
+        Return the value of the expression for the given variables and
+        functions, as returned by `add_defaults()`.
+        """
+        return self._evaluate(all_variables, all_functions)
+
+    def evaluate_vectorized(self, all_variables, all_functions):
+        """
+        Like `evaluate()`, but variables may be NumPy arrays, over which the
+        expression is evaluated elementwise.
+        """
+        return self._evaluate_vectorized(all_variables, all_functions)
+
+
+# The following functions compile parse components into closures, and are run
+# on lists of previously compiled children and terminal strings.
+
+def compile_number(parse_result):
+    """
+    Compile a number into a constant.
+    """
+    value = eval_number(parse_result)
+    return lambda all_variables, all_functions: value
+
+
+def compile_variable(name):
+    """
+    Compile a variable into a lookup of its value.
+    """
+    return lambda all_variables, all_functions: all_variables[name]
+
+
+def compile_function(name, argument):
+    """
+    Compile a function call on a compiled argument.
+    """
+    return lambda all_variables, all_functions: all_functions[name](argument(all_variables, all_functions))
+
+
+def compile_action(action):
+    """
+    Return a compile action which applies the given evaluation action to the
+    values of the children, alongside the terminal strings.
+    """
+    def compile_node(parse_result):
+        """
+        Compile a node evaluated by `action`.
+        """
+        def evaluate(all_variables, all_functions):
+            """
+            Evaluate the children and apply `action` to them.
+            """
+            return action([
+                k(all_variables, all_functions) if callable(k) else k
+                for k in parse_result
+            ])
+        return evaluate
+    return compile_node
+
+
+def _compiled_children(parse_result):
+    """
+    Return the compiled children in the list, without terminal strings.
+    """
+    return [k for k in parse_result if callable(k)]
+
+
+def compile_vectorized_atom(parse_result):
+    """
+    Return the compiled value wrapped by the atom.
+    """
+    return _compiled_children(parse_result)[0]
+
+
+def compile_vectorized_power(parse_result):
+    """
+    Compile an exponentiation, like `eval_power()`.
+    """
+    children = _compiled_children(parse_result)
+    if len(children) == 1:
+        return children[0]
+
+    def evaluate(all_variables, all_functions):
+        """
+        Raise the values to the power of the next, from the right.
+        """
+        values = [child(all_variables, all_functions) for child in reversed(children)]
+        return reduce(lambda a, b: b ** a, values)
+    return evaluate
+
+
+def compile_vectorized_parallel(parse_result):
+    """
+    Compile the parallel resistors operator, like `eval_parallel()`.
+    """
+    children = _compiled_children(parse_result)
+    if len(children) == 1:
+        return children[0]
+
+    def evaluate(all_variables, all_functions):
+        """
+        Return NaN wherever there is a zero among the inputs.
+        """
+        values = [child(all_variables, all_functions) for child in children]
+        has_zero = reduce(numpy.logical_or, [value == 0 for value in values])
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            result = 1. / sum(1. / value for value in values)
+        return numpy.where(has_zero, float('nan'), result)
+    return evaluate
+
+
+def compile_vectorized_product(parse_result):
+    """
+    Compile a product, like `eval_product()`.
+    """
+    terms = _compiled_terms(parse_result, {'*': operator.mul, '/': operator.truediv}, operator.mul)
+
+    def evaluate(all_variables, all_functions):
+        """
+        Multiply the inputs.
+        """
+        prod = 1.0
+        for current_op, term in terms:
+            prod = current_op(prod, term(all_variables, all_functions))
+        return prod
+    return evaluate
+
+
+def compile_vectorized_sum(parse_result):
+    """
+    Compile a sum, like `eval_sum()`.
+    """
+    terms = _compiled_terms(parse_result, {'+': operator.add, '-': operator.sub}, operator.add)
+
+    def evaluate(all_variables, all_functions):
+        """
+        Add the inputs, keeping in mind their sign.
+        """
+        total = 0.0
+        for current_op, term in terms:
+            total = current_op(total, term(all_variables, all_functions))
+        return total
+    return evaluate
+
+
+def _compiled_terms(parse_result, operators, default_op):
+    """
+    Pair each compiled child with the operator preceding it.
+    """
+    terms = []
+    current_op = default_op
+    for token in parse_result:
+        if callable(token):
+            terms.append((current_op, token))
+        else:
+            current_op = operators[token]
+    return terms
 
 
 class ParseAugmenter(object):
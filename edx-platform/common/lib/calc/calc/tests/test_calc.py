@@ -559,3 +559,82 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class EvaluateSamplesTest(unittest.TestCase):
+    """
+    Run tests for calc.evaluate_samples and the cache of compiled expressions
+    """
+    SAMPLES = [{'x': 0.5, 'y': 2.0}, {'x': -1.5, 'y': 3.0}, {'x': 4.0, 'y': 0.25}]
+
+    def assert_same_as_evaluator(self, math_expr, samples=None, functions=None):
+        """
+        Check that `evaluate_samples` gives the results of `evaluator` at each
+        sample.
+        """
+        samples = samples or self.SAMPLES
+        functions = functions or {}
+        expected = [calc.evaluator(sample, functions, math_expr) for sample in samples]
+        results = calc.evaluate_samples(samples, functions, math_expr)
+        self.assertEqual(len(results), len(expected))
+        for result, value in zip(results, expected):
+            if numpy.isnan(value):
+                self.assertTrue(numpy.isnan(result))
+            else:
+                self.assertAlmostEqual(result, value)
+
+    def test_vectorized(self):
+        """
+        Expressions of arithmetic and array-friendly functions
+        """
+        for math_expr in [
+                "x + y", "-x*y/2", "y^2^0.5*x", "x || y", "sin(x) + cos(y)^2",
+                "sqrt(y) * exp(-x)", "sec(x) - arcsec(y + 1)", "(x + 2k) / (y - 5%)",
+                "3.0", "x*i + y", "e^(pi*i)",
+        ]:
+            self.assert_same_as_evaluator(math_expr)
+
+    def test_fallback(self):
+        """
+        Expressions which are evaluated one sample at a time
+        """
+        self.assert_same_as_evaluator("fact(3) * x")
+        self.assert_same_as_evaluator("arccot(x)")
+        self.assert_same_as_evaluator("f(x) + y", functions={'f': lambda x: x + 1})
+        self.assert_same_as_evaluator("y^x - x")
+        self.assert_same_as_evaluator("x || 0")
+
+    def test_errors(self):
+        """
+        Errors are the same as those raised by `evaluator`
+        """
+        with self.assertRaises(ZeroDivisionError):
+            calc.evaluate_samples(self.SAMPLES, {}, "x / (y - 2)")
+        with self.assertRaisesRegexp(ValueError, 'factorial'):
+            calc.evaluate_samples(self.SAMPLES, {}, "fact(x)")
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'z'):
+            calc.evaluate_samples(self.SAMPLES, {}, "x + z")
+        with self.assertRaises(ParseException):
+            calc.evaluate_samples(self.SAMPLES, {}, "x +")
+
+    def test_empty(self):
+        """
+        No samples, or no expression
+        """
+        self.assertEqual(calc.evaluate_samples([], {}, "x"), [])
+        results = calc.evaluate_samples(self.SAMPLES, {}, " ")
+        self.assertEqual(len(results), len(self.SAMPLES))
+        self.assertTrue(all(numpy.isnan(result) for result in results))
+
+    def test_compile_expression_cache(self):
+        """
+        Expressions are parsed once per expression and case sensitivity
+        """
+        compiled = calc.compile_expression("x*y + 1")
+        self.assertIs(calc.compile_expression("x*y + 1"), compiled)
+        self.assertIsNot(calc.compile_expression("x*y + 1", case_sensitive=True), compiled)
+        self.assertEqual(compiled.variables_used, {'x', 'y'})
+
+        with self.assertRaises(ParseException):
+            calc.compile_expression("x*")
+        self.assertNotIn(("x*", False), calc.calc._COMPILED_EXPRESSIONS)  # pylint: disable=protected-access
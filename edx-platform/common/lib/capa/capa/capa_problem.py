@@ -16,9 +16,11 @@ This is used by capa_module.
 from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
+import hashlib
 import logging
 import os.path
 import re
+from threading import Lock
 
 from lxml import etree
 from pytz import UTC
@@ -70,8 +72,61 @@ html_problem_semantics = [
     "openendedrubric",
 ]
 
+# Maximum number of parsed problem trees kept in the per-process cache.
+PARSED_PROBLEM_CACHE_SIZE = 256
+
 log = logging.getLogger(__name__)
 
+_parsed_problems = OrderedDict()
+_parsed_problems_lock = Lock()
+
+
+def parse_problem_text(problem_text):
+    """
+    Returns a (problem_text, tree) pair of the given problem xml with its
+    startouttext/endouttext tags converted to <text></text>, and the tree
+    parsed from it.
+
+    The parsed trees are kept in a per-process cache keyed by a hash of the
+    problem xml, so that the many instances of a problem don't each parse it
+    again.  The returned tree is a copy that the caller is free to modify.
+    """
+    if isinstance(problem_text, unicode):
+        key = hashlib.sha1(problem_text.encode('utf-8')).hexdigest()
+    else:
+        key = hashlib.sha1(problem_text).hexdigest()
+
+    with _parsed_problems_lock:
+        parsed = _parsed_problems.pop(key, None)
+        if parsed is not None:
+            _parsed_problems[key] = parsed
+
+    if parsed is None:
+        # Convert startouttext and endouttext to proper <text></text>
+        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
+        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
+
+        # parse problem XML file into an element tree
+        tree = etree.XML(problem_text)
+        LoncapaProblem.make_xml_compatible(tree)
+
+        parsed = (problem_text, tree)
+        with _parsed_problems_lock:
+            _parsed_problems[key] = parsed
+            while len(_parsed_problems) > PARSED_PROBLEM_CACHE_SIZE:
+                _parsed_problems.popitem(last=False)
+
+    problem_text, tree = parsed
+    return problem_text, deepcopy(tree)
+
+
+def clear_parsed_problems():
+    """
+    Removes all parsed problem trees from the cache.
+    """
+    with _parsed_problems_lock:
+        _parsed_problems.clear()
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -172,15 +227,10 @@ class LoncapaProblem(object):
         self.done = state.get('done', False)
         self.input_state = state.get('input_state', {})
 
-        # Convert startouttext and endouttext to proper <text></text>
-        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
-        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
-        self.problem_text = problem_text
-
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
+        # Parse the problem XML into an element tree, which is shared by all
+        # instances of the problem up to this point.  Everything below depends
+        # on the seed or on the course's files, so it's done for each instance.
+        self.problem_text, self.tree = parse_problem_text(problem_text)
 
         # handle any <include file="foo"> tags
         self._process_includes()
@@ -215,7 +265,8 @@ class LoncapaProblem(object):
 
             self.extracted_tree = self._extract_html(self.tree)
 
-    def make_xml_compatible(self, tree):
+    @staticmethod
+    def make_xml_compatible(tree):
         """
         Adjust tree xml in-place for compatibility before creating
         a problem from it.
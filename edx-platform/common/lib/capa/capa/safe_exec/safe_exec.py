@@ -6,7 +6,10 @@ from codejail.safe_exec import json_safe, SafeExecException
 from . import lazymod
 from dogapi import dog_stats_api
 
+from collections import OrderedDict
+import cPickle as pickle
 import hashlib
+from threading import Lock
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -70,6 +73,91 @@ def update_hash(hasher, obj):
         hasher.update(repr(obj))
 
 
+class LocalResultCache(object):
+    """
+    A per-process, size-bounded LRU cache of safe_exec results, in front of
+    a shared cache such as Django's.
+
+    It is duck-compatible with the `cache` argument of `safe_exec`: results
+    are looked up locally first, then in the shared cache, and are stored in
+    both.  Since results are keyed by a hash of everything that determines
+    them, local entries never need to be invalidated.
+
+    Results are stored pickled, so that callers can't modify them, and the
+    total size of the pickled results is bounded by `max_size` bytes.
+    """
+    def __init__(self, cache, max_size):
+        self.cache = cache
+        self.max_size = max_size
+
+        # Map of a key to its pickled result, from the least to the most
+        # recently used.
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+    def get(self, key):
+        """
+        Return the result cached for `key`, or None.
+        """
+        with self._lock:
+            pickled = self._entries.pop(key, None)
+            if pickled is not None:
+                self._entries[key] = pickled
+        if pickled is not None:
+            dog_stats_api.increment('capa.safe_exec.local_cache', tags=['result:hit'])
+            return pickle.loads(pickled)
+
+        dog_stats_api.increment('capa.safe_exec.local_cache', tags=['result:miss'])
+        value = self.cache.get(key)
+        if value is not None:
+            self._add(key, value)
+        return value
+
+    def set(self, key, value):
+        """
+        Cache `value` for `key`, both locally and in the shared cache.
+        """
+        self.cache.set(key, value)
+        self._add(key, value)
+
+    def _add(self, key, value):
+        """
+        Cache `value` locally, evicting the least recently used results as needed.
+        """
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(pickled) > self.max_size:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = pickled
+            self._size += len(pickled)
+            while self._size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+def _cache_key(code, globals_dict, random_seed, python_path, extra_files):
+    """
+    Return the key under which the result of running `code` is cached.
+
+    The key is a hash of everything that determines the result: the code,
+    the values of the globals, the random seed, and the files that the code
+    can import.
+    """
+    md5er = hashlib.md5()
+    md5er.update(repr(code))
+    update_hash(md5er, json_safe(globals_dict))
+    if python_path:
+        update_hash(md5er, list(python_path))
+    for filename, contents in extra_files or ():
+        md5er.update(repr(filename))
+        md5er.update(contents)
+    return "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
+
+
 @dog_stats_api.timed('capa.safe_exec.time')
 def safe_exec(
     code,
@@ -99,7 +187,8 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    the random seed, and the files on the Python path.  See `LocalResultCache` for
+    a per-process tier to put in front of a shared cache.
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
@@ -109,12 +198,9 @@ def safe_exec(
     """
     # Check the cache for a previous result.
     if cache:
-        safe_globals = json_safe(globals_dict)
-        md5er = hashlib.md5()
-        md5er.update(repr(code))
-        update_hash(md5er, safe_globals)
-        key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
+        key = _cache_key(code, globals_dict, random_seed, python_path, extra_files)
         cached = cache.get(key)
+        dog_stats_api.increment('capa.safe_exec.cache', tags=['result:{}'.format('miss' if cached is None else 'hit')])
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
             # message, if any, else None; and the resulting globals dictionary.
@@ -135,10 +221,11 @@ def safe_exec(
 
     # Run the code!  Results are side effects in globals_dict.
     try:
-        exec_fn(
-            code_prolog + LAZY_IMPORTS + code, globals_dict,
-            python_path=python_path, extra_files=extra_files, slug=slug,
-        )
+        with dog_stats_api.timer('capa.safe_exec.exec_time', tags=['unsafely:{}'.format(bool(unsafely))]):
+            exec_fn(
+                code_prolog + LAZY_IMPORTS + code, globals_dict,
+                python_path=python_path, extra_files=extra_files, slug=slug,
+            )
     except SafeExecException as e:
         emsg = e.message
     else:
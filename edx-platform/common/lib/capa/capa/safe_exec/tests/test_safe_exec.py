@@ -9,7 +9,7 @@ import unittest
 
 from nose.plugins.skip import SkipTest
 
-from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec import safe_exec, update_hash, LocalResultCache
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
 
@@ -176,6 +176,65 @@ class TestSafeExecCaching(unittest.TestCase):
             except UnicodeEncodeError:
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
+    def test_cache_extra_files(self):
+        # The files that the code can import are part of what is cached.
+        cache = {}
+        safe_exec("a = 1", {}, extra_files=[("python_lib.zip", "zip 1")], cache=DictCache(cache))
+        safe_exec("a = 1", {}, extra_files=[("python_lib.zip", "zip 2")], cache=DictCache(cache))
+        self.assertEqual(len(cache), 2)
+
+
+class TestLocalResultCache(unittest.TestCase):
+    """Test the per-process cache in front of a shared cache."""
+
+    def test_miss_then_local_hit(self):
+        shared = {}
+        local_cache = LocalResultCache(DictCache(shared), max_size=10000)
+
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=local_cache)
+        self.assertEqual(g['a'], 3)
+        self.assertEqual(shared.values()[0], (None, {'a': 3}))
+
+        # Fiddling with the shared cache has no effect on the local result.
+        shared[shared.keys()[0]] = (None, {'a': 17})
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=local_cache)
+        self.assertEqual(g['a'], 3)
+
+    def test_read_through(self):
+        shared = {'key': (None, {'a': 17})}
+        local_cache = LocalResultCache(DictCache(shared), max_size=10000)
+        self.assertEqual(local_cache.get('key'), (None, {'a': 17}))
+
+        shared.clear()
+        self.assertEqual(local_cache.get('key'), (None, {'a': 17}))
+        self.assertIsNone(local_cache.get('other key'))
+
+    def test_results_are_copies(self):
+        local_cache = LocalResultCache(DictCache({}), max_size=10000)
+        local_cache.set('key', (None, {'a': [1]}))
+        local_cache.get('key')[1]['a'].append(2)
+        self.assertEqual(local_cache.get('key'), (None, {'a': [1]}))
+
+    def test_eviction(self):
+        # pylint: disable=protected-access
+        shared = {}
+        local_cache = LocalResultCache(DictCache(shared), max_size=100)
+        for index in xrange(10):
+            local_cache.set('key {}'.format(index), (None, {'a': index}))
+        shared.clear()
+
+        # The least recently used results were evicted.
+        self.assertIsNone(local_cache.get('key 0'))
+        self.assertEqual(local_cache.get('key 9'), (None, {'a': 9}))
+        self.assertLessEqual(sum(len(pickled) for pickled in local_cache._entries.values()), 100)
+
+        # Results larger than the cache are only stored in the shared cache.
+        local_cache.set('large key', (None, {'a': 'a' * 1000}))
+        self.assertIn('large key', shared)
+        self.assertNotIn('large key', local_cache._entries)
+
 
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
@@ -6,6 +6,7 @@ import textwrap
 from lxml import etree
 import unittest
 
+from capa import capa_problem
 from capa.tests.helpers import new_loncapa_problem
 
 
@@ -590,3 +591,44 @@ class CAPAMultiInputProblemTest(unittest.TestCase):
             description_element = multi_inputs_group.xpath('//p[@id="{}"]'.format(description_id))
             self.assertEqual(len(description_element), 1)
             self.assertEqual(description_element[0].text, descriptions[index])
+
+
+class ParsedProblemCacheTest(unittest.TestCase):
+    """ Tests of the per-process cache of parsed problems """
+
+    def setUp(self):
+        super(ParsedProblemCacheTest, self).setUp()
+        capa_problem.clear_parsed_problems()
+        self.addCleanup(capa_problem.clear_parsed_problems)
+
+    def test_problems_share_parsed_tree(self):
+        """
+        Verify that the instances of a problem parse its xml once, and don't
+        share their trees.
+        """
+        xml = textwrap.dedent("""
+        <problem>
+            <startouttext/>Which is the color of the sky?<endouttext/>
+            <optionresponse>
+                <optioninput label="color">
+                    <option correct="False">yellow</option>
+                    <option correct="True">blue</option>
+                </optioninput>
+            </optionresponse>
+        </problem>
+        """)
+        first_problem = new_loncapa_problem(xml)
+        second_problem = new_loncapa_problem(xml)
+
+        self.assertEqual(len(capa_problem._parsed_problems), 1)  # pylint: disable=protected-access
+        self.assertIsNot(first_problem.tree, second_problem.tree)
+        self.assertEqual(first_problem.problem_text, second_problem.problem_text)
+        self.assertIn('<text>Which is the color of the sky?</text>', first_problem.problem_text)
+        self.assertEqual(
+            second_problem.tree.xpath('//optioninput')[0].get('options'),
+            "('yellow','blue')"
+        )
+        self.assertEqual(first_problem.get_html(), second_problem.get_html())
+
+        first_problem.tree.clear()
+        self.assertEqual(len(new_loncapa_problem(xml).responders), 1)
@@ -155,16 +155,13 @@ class MongoContentStore(ContentStore):
     def export(self, location, output_directory):
         content = self.find(location)
 
-        filename = content.name
-        if content.import_path is not None:
-            output_directory = output_directory + '/' + os.path.dirname(content.import_path)
+        export_dir, export_name = self._export_path(content)
+        if export_dir is not None:
+            output_directory = output_directory + '/' + export_dir
 
         if not os.path.exists(output_directory):
             os.makedirs(output_directory)
 
-        # Escape invalid char from filename.
-        export_name = escape_invalid_characters(name=filename, invalid_char_list=['/', '\\'])
-
         disk_fs = OSFS(output_directory)
 
         with disk_fs.open(export_name, 'wb') as asset_file:
@@ -194,13 +191,69 @@ class MongoContentStore(ContentStore):
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
             self.export(asset['asset_key'], output_directory)
-            for attr, value in asset.iteritems():
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
-                    policy.setdefault(asset['asset_key'].name, {})[attr] = value
+            self._add_to_assets_policy(policy, asset)
 
         with open(assets_policy_file, 'w') as f:
             json.dump(policy, f, sort_keys=True, indent=4)
 
+    def stream_all_for_course(self, course_key):
+        """
+        Returns the policy of all of this course's assets, as export_all_for_course writes it to the
+        policy file, along with a generator of the assets' files, so that the files can be exported
+        without being written to disk.
+
+        The generator yields a (path, content) pair for each asset, where path is the path that
+        export_all_for_course writes the asset's file to, relative to its output directory, and content
+        is a StaticContentStream of the file, which is closed once the generator moves on.
+
+        Args:
+            course_key (CourseKey): the :class:`CourseKey` identifying the course
+        """
+        policy = {}
+        assets, __ = self.get_all_content_for_course(course_key)
+        for asset in assets:
+            self._add_to_assets_policy(policy, asset)
+        return policy, self._stream_assets([asset['asset_key'] for asset in assets])
+
+    def _stream_assets(self, asset_keys):
+        """
+        Yields the (path, content) pairs of the given assets' files, as described in stream_all_for_course.
+        """
+        for asset_key in asset_keys:
+            content = self.find(asset_key, as_stream=True)
+            try:
+                export_dir, export_name = self._export_path(content)
+                if export_dir:
+                    export_name = export_dir + '/' + export_name
+                yield export_name, content
+            finally:
+                content.close()
+
+    @staticmethod
+    def _export_path(content):
+        """
+        Returns the directory that the given content's file is exported to, relative to the output
+        directory of the export, or None if it's exported to the output directory itself, along with
+        the name of the exported file.
+        """
+        export_dir = None
+        if content.import_path is not None:
+            export_dir = os.path.dirname(content.import_path)
+
+        # Escape invalid char from filename.
+        export_name = escape_invalid_characters(name=content.name, invalid_char_list=['/', '\\'])
+        return export_dir, export_name
+
+    @staticmethod
+    def _add_to_assets_policy(policy, asset):
+        """
+        Adds the attributes of the given asset, as returned by get_all_content_for_course, to the
+        given assets policy.
+        """
+        for attr, value in asset.iteritems():
+            if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
+                policy.setdefault(asset['asset_key'].name, {})[attr] = value
+
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
 
@@ -11,6 +11,8 @@ import logging
 import random
 import sys
 
+import numpy
+
 
 log = logging.getLogger("edx.courseware")
 
@@ -200,11 +202,35 @@ class CourseGrader(object):
 
     __metaclass__ = abc.ABCMeta
 
+    # Whether the grader implements grade_many.
+    supports_grade_many = False
+
     @abc.abstractmethod
     def grade(self, grade_sheet, generate_random_scores=False):
         '''Given a grade sheet, return a dict containing grading information'''
         raise NotImplementedError
 
+    def grade_many(self, num_students, format_scores):
+        """
+        Grades a number of students at once, using array operations.
+
+        format_scores is a dict, keyed by section format, of (earned, possible)
+        pairs of numpy arrays of shape (num_students, num_sections), holding the
+        graded totals of each student for the sections of that format, in course
+        order.  A section with a possible value of 0 is treated as missing from
+        the student's grade sheet, as in grade().
+
+        Returns a tuple of:
+            - an array of the students' percentages, and
+            - an OrderedDict of each category's contribution to those
+              percentages, keyed by category (the grade_breakdown percents
+              returned by grade()).
+
+        Graders that can only grade one grade sheet at a time raise
+        NotImplementedError, and have a false supports_grade_many.
+        """
+        raise NotImplementedError
+
 
 class WeightedSubsectionsGrader(CourseGrader):
     """
@@ -225,6 +251,13 @@ class WeightedSubsectionsGrader(CourseGrader):
     def __init__(self, subgraders):
         self.subgraders = subgraders
 
+    @property
+    def supports_grade_many(self):
+        """
+        Returns whether all the subgraders implement grade_many.
+        """
+        return all(subgrader.supports_grade_many for subgrader, __, __ in self.subgraders)
+
     def grade(self, grade_sheet, generate_random_scores=False):
         total_percent = 0.0
         section_breakdown = []
@@ -250,6 +283,19 @@ class WeightedSubsectionsGrader(CourseGrader):
             'grade_breakdown': grade_breakdown
         }
 
+    def grade_many(self, num_students, format_scores):
+        total_percents = numpy.zeros(num_students)
+        grade_breakdown = OrderedDict()
+
+        for subgrader, assignment_type, weight in self.subgraders:
+            subgrade_percents, __ = subgrader.grade_many(num_students, format_scores)
+
+            weighted_percents = subgrade_percents * weight
+            total_percents += weighted_percents
+            grade_breakdown[assignment_type] = weighted_percents
+
+        return total_percents, grade_breakdown
+
 
 class AssignmentFormatGrader(CourseGrader):
     """
@@ -285,6 +331,8 @@ class AssignmentFormatGrader(CourseGrader):
     min_count = 2 would produce the labels "Assignment 3", "Assignment 4"
 
     """
+    supports_grade_many = True
+
     def __init__(
             self,
             type,  # pylint: disable=redefined-builtin
@@ -407,3 +455,31 @@ class AssignmentFormatGrader(CourseGrader):
             'section_breakdown': breakdown,
             # No grade_breakdown here
         }
+
+    def grade_many(self, num_students, format_scores):
+        empty_scores = numpy.zeros((num_students, 0))
+        earned, possible = format_scores.get(self.type, (empty_scores, empty_scores))
+        num_sections = possible.shape[1]
+
+        # Sections without anything possible to earn are missing from the
+        # grade sheet, and so are counted like the placeholder scores of 0.
+        found = possible > 0
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            section_percents = numpy.where(found, earned / possible, 0.0)
+
+        percents = numpy.zeros((num_students, max(self.min_count, num_sections)))
+        percents[:, :num_sections] = section_percents
+        num_entries = numpy.maximum(found.sum(axis=1), self.min_count)
+        num_kept = numpy.maximum(num_entries - self.drop_count, 0)
+
+        # Dropping the lowest scores keeps the num_kept highest ones.  Extra
+        # zeros beyond a student's entries sort last, so they are never kept.
+        descending_percents = -numpy.sort(-percents, axis=1)
+        cumulative_percents = numpy.hstack([
+            numpy.zeros((num_students, 1)),
+            numpy.cumsum(descending_percents, axis=1),
+        ])
+        kept_percents = cumulative_percents[numpy.arange(num_students), num_kept]
+
+        total_percents = numpy.where(num_kept > 0, kept_percents / numpy.maximum(num_kept, 1), 0.0)
+        return total_percents, OrderedDict()
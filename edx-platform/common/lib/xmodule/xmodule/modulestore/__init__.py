@@ -860,6 +860,9 @@ class ModuleStoreRead(ModuleStoreAssetBase):
             xblock, fields = (block, block.fields)
         elif isinstance(block, BlockData):
             # BlockData is an object - compare its attributes in dict form.
+            # Accessing any attribute of a lazily decoded BlockData (see
+            # split_mongo.structure_codec) decodes all of them.
+            block.fields  # pylint: disable=pointless-statement
             xblock, fields = (None, block.__dict__)
         else:
             xblock, fields = (None, block)
@@ -70,6 +70,10 @@ BLOCK_TYPES_WITH_CHILDREN = list(set(
     name for name, class_ in XBlock.load_classes() if getattr(class_, 'has_children', False)
 ))
 
+# Maximum number of changed subtrees that are patched into a cached metadata inheritance tree
+# at once; beyond it, recomputing the whole tree is cheaper.
+MAX_INHERITANCE_TREE_PATCHES = 10
+
 # Allow us to call _from_deprecated_(son|string) throughout the file
 # pylint: disable=protected-access
 
@@ -474,6 +478,21 @@ class MongoBulkOpsRecord(BulkOpsRecord):
     def __init__(self):
         super(MongoBulkOpsRecord, self).__init__()
         self.dirty = False
+        # the locations of the blocks whose subtrees' inheritance changed, or None if the whole
+        # metadata inheritance tree needs to be recomputed
+        self.inheritance_locations = set()
+
+    def record_inheritance_change(self, locations):
+        """
+        Marks the course as written to, and records the locations of the blocks whose subtrees'
+        inheritance changed, or that the whole metadata inheritance tree needs to be recomputed
+        if locations is None.
+        """
+        self.dirty = True
+        if locations is None:
+            self.inheritance_locations = None
+        elif self.inheritance_locations is not None:
+            self.inheritance_locations.update(locations)
 
 
 class MongoBulkOpsMixin(BulkOperationsMixin):
@@ -488,6 +507,7 @@ class MongoBulkOpsMixin(BulkOperationsMixin):
         """
         # ensure it starts clean
         bulk_ops_record.dirty = False
+        bulk_ops_record.inheritance_locations = set()
 
     def _end_outermost_bulk_operation(self, bulk_ops_record, structure_key):
         """
@@ -496,9 +516,13 @@ class MongoBulkOpsMixin(BulkOperationsMixin):
         """
         dirty = False
         if bulk_ops_record.dirty:
-            self.refresh_cached_metadata_inheritance_tree(structure_key)
+            locations = bulk_ops_record.inheritance_locations
+            self.refresh_cached_metadata_inheritance_tree(
+                structure_key, locations=list(locations) if locations is not None else None
+            )
             dirty = True
             bulk_ops_record.dirty = False  # brand spanking clean now
+            bulk_ops_record.inheritance_locations = set()
         return dirty
 
     def _is_in_bulk_operation(self, course_id, ignore_case=False):
@@ -684,18 +708,22 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         else:
             return ParentLocationCache()
 
-    def _compute_metadata_inheritance_tree(self, course_id):
+    def _get_inheritance_records(self, course_id, urls=None):
         '''
-        Find all inheritable fields from all xblocks in the course which may define inheritable data
+        Find the location, children and inheritable metadata of the xblocks in the course which may define
+        inheritable data, restricted to the xblocks with the given location urls if any, as a dict of the records
+        by the urls of their published locations.
         '''
         # get all collections in the course, this query should not return any leaf nodes
-        course_id = self.fill_in_run(course_id)
         query = SON([
             ('_id.tag', 'i4x'),
             ('_id.org', course_id.org),
             ('_id.course', course_id.course),
             ('_id.category', {'$in': BLOCK_TYPES_WITH_CHILDREN})
         ])
+        if urls is not None:
+            urls = set(urls)
+            query['_id.name'] = {'$in': list(set(Location.from_deprecated_string(url).name for url in urls))}
         # if we're only dealing in the published branch, then only get published containers
         if self.get_branch_setting() == ModuleStoreEnum.Branch.published_only:
             query['_id.revision'] = None
@@ -713,7 +741,6 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         # it's ok to keep these as deprecated strings b/c the overall cache is indexed by course_key and this
         # is a dictionary relative to that course
         results_by_url = {}
-        root = None
 
         # now go through the results and order them by the location url
         for result in resultset:
@@ -721,6 +748,9 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             location = as_published(Location._from_deprecated_son(result['_id'], course_id.run))
 
             location_url = unicode(location)
+            if urls is not None and location_url not in urls:
+                # another xblock with the same name
+                continue
             if location_url in results_by_url:
                 # found either draft or live to complement the other revision
                 # FIXME this is wrong. If the child was moved in draft from one parent to the other, it will
@@ -732,7 +762,18 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                 results_by_url[location_url].setdefault('definition', {})['children'] = set(total_children)
             else:
                 results_by_url[location_url] = result
-            if location.category == 'course':
+
+        return results_by_url
+
+    def _compute_metadata_inheritance_tree(self, course_id):
+        '''
+        Find all inheritable fields from all xblocks in the course which may define inheritable data
+        '''
+        course_id = self.fill_in_run(course_id)
+        results_by_url = self._get_inheritance_records(course_id)
+        root = None
+        for location_url, result in results_by_url.iteritems():
+            if result['_id']['category'] == 'course':
                 root = location_url
 
         # now traverse the tree and compute down the inherited metadata
@@ -809,20 +850,135 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
         return tree
 
-    def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None):
+    def _patch_metadata_inheritance_tree(self, course_id, tree, location, patched_urls):
+        '''
+        Recompute, in place, the entries of the given metadata inheritance tree for the subtree rooted at the
+        given location, after the location's inheritable metadata or children changed. Adds the urls of the
+        recomputed entries to patched_urls.
+
+        Returns False if the tree doesn't have enough information to be patched, in which case it needs to be
+        recomputed as a whole.
+        '''
+        branch = self.get_branch_setting()
+        url = unicode(as_published(location))
+        if url in patched_urls:
+            return True
+
+        if location.category == 'course':
+            # the root has no entry of its own and inherits nothing
+            inherited_metadata, parent_url = {}, None
+        elif url not in tree:
+            # not in the course tree (yet); its subtree is computed once it's added to a parent
+            return True
+        else:
+            parent_url = tree[url].get('parent', {}).get(branch)
+            if parent_url is None:
+                # the tree was computed for another branch
+                return False
+            if parent_url in tree:
+                inherited_metadata = tree[parent_url]
+            else:
+                # the parent is the root, which has no entry of its own
+                parent_record = self._get_inheritance_records(course_id, [parent_url]).get(parent_url)
+                if parent_record is None:
+                    return False
+                inherited_metadata = parent_record.get('metadata', {})
+            inherited_metadata = {
+                field_name: value for field_name, value in inherited_metadata.iteritems() if field_name != 'parent'
+            }
+
+        # drop the entries of the location's descendants as of before the change
+        child_urls_by_parent = {}
+        for child_url, metadata in tree.iteritems():
+            child_urls_by_parent.setdefault(metadata.get('parent', {}).get(branch), []).append(child_url)
+        pending = [url]
+        while pending:
+            for child_url in child_urls_by_parent.pop(pending.pop(), []):
+                del tree[child_url]
+                pending.append(child_url)
+
+        # recompute the subtree one level at a time, as _compute_metadata_inheritance_tree does
+        # Remember the records will not contain leaf nodes
+        level = {url: (inherited_metadata, parent_url)}
+        expanded_urls = set()
+        while level:
+            records = self._get_inheritance_records(course_id, level.keys())
+            next_level = {}
+            for child_url, (metadata, parent) in level.iteritems():
+                if child_url in records and child_url not in expanded_urls:
+                    expanded_urls.add(child_url)
+                    child_metadata = copy.deepcopy(metadata)
+                    child_metadata.update(records[child_url].get('metadata', {}))
+                    for grandchild_url in records[child_url].get('definition', {}).get('children', []):
+                        next_level[grandchild_url] = (child_metadata, child_url)
+                else:
+                    # this is likely a leaf node
+                    child_metadata = metadata.copy()
+                patched_urls.add(child_url)
+                if parent is not None:
+                    child_metadata['parent'] = {branch: parent}
+                    tree[child_url] = child_metadata
+            level = next_level
+
+        return True
+
+    def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None, locations=None):
         """
         Refresh the cached metadata inheritance tree for the org/course combination
         for location
 
+        If given the locations of the blocks whose inheritable metadata or children changed, only the
+        subtrees rooted at those locations are recomputed and patched into the tree read from the caching
+        subsystem.  The whole tree is recomputed if it isn't found there.
+
         If given a runtime, it replaces the cached_metadata in that runtime. NOTE: failure to provide
         a runtime may mean that some objects report old values for inherited data.
         """
         course_id = course_id.for_branch(None)
-        if not self._is_in_bulk_operation(course_id):
-            # below is done for side effects when runtime is None
-            cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
-            if runtime:
-                runtime.cached_metadata = cached_metadata
+        if self._is_in_bulk_operation(course_id):
+            # remember what to refresh at the end of the bulk operation
+            self._get_bulk_ops_record(course_id).record_inheritance_change(locations)
+            return
+
+        if locations is not None and not locations:
+            cached_metadata = self._get_cached_metadata_inheritance_tree(course_id)
+        else:
+            cached_metadata = None
+            if locations is not None and len(locations) <= MAX_INHERITANCE_TREE_PATCHES:
+                cached_metadata = self._patch_cached_metadata_inheritance_tree(course_id, locations)
+            if cached_metadata is None:
+                # below is done for side effects when runtime is None
+                cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
+        if runtime:
+            runtime.cached_metadata = cached_metadata
+
+    def _patch_cached_metadata_inheritance_tree(self, course_id, locations):
+        """
+        Patches the subtrees rooted at the given locations into the metadata inheritance tree in the caching
+        subsystem, and returns the patched tree.  Returns None if the tree isn't in the caching subsystem or
+        can't be patched.
+
+        The tree is read from the caching subsystem rather than the request cache, whose copy of the tree
+        may predate updates made by other processes, and would overwrite them.
+        """
+        if self.metadata_inheritance_cache_subsystem is None:
+            return None
+        course_id = self.fill_in_run(course_id)
+        tree = self.metadata_inheritance_cache_subsystem.get(unicode(course_id))
+        if not tree:
+            return None
+
+        patched_urls = set()
+        if not all(
+                self._patch_metadata_inheritance_tree(course_id, tree, location, patched_urls)
+                for location in locations
+        ):
+            return None
+        self.metadata_inheritance_cache_subsystem.set(unicode(course_id), tree)
+
+        if self.request_cache is not None:
+            self.request_cache.data.setdefault('metadata_inheritance', {})[unicode(course_id)] = tree
+        return tree
 
     def _clean_item_data(self, item):
         """
@@ -1544,8 +1700,13 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             # update the edit info of the instantiated xblock
             xblock._edit_info = payload['edit_info']
 
-            # recompute (and update) the metadata inheritance tree which is cached
-            self.refresh_cached_metadata_inheritance_tree(xblock.scope_ids.usage_id.course_key, xblock.runtime)
+            # recompute (and update) the metadata inheritance tree which is cached, for the subtree of
+            # this xblock only; nothing inherits from leaves
+            self.refresh_cached_metadata_inheritance_tree(
+                xblock.scope_ids.usage_id.course_key,
+                xblock.runtime,
+                locations=[xblock.location] if xblock.has_children else [],
+            )
             # fire signal that we've written to DB
         except ItemNotFoundError:
             if not allow_not_found:
@@ -1598,7 +1759,9 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                 current_loc = ancestor_loc
                 ancestor_loc = self._get_raw_parent_location(as_published(current_loc), revision)
                 if ancestor_loc is None:
-                    bulk_record.dirty = True
+                    # the cached tree may still have the orphan as the parent of its former
+                    # children, so it's recomputed as a whole
+                    bulk_record.record_inheritance_change(None)
                     # The parent is an orphan, so remove all the children including
                     # the location whose parent we are looking for from orphan parent
                     self.collection.update(
@@ -432,7 +432,7 @@ class DraftModuleStore(MongoModuleStore):
             # ensure keys are in fixed and right order before inserting
             item['_id'] = self._id_dict_to_son(item['_id'])
             bulk_record = self._get_bulk_ops_record(location.course_key)
-            bulk_record.dirty = True
+            bulk_record.record_inheritance_change([location])
             try:
                 self.collection.insert(item)
             except pymongo.errors.DuplicateKeyError:
@@ -605,8 +605,8 @@ class DraftModuleStore(MongoModuleStore):
 
         first_tier = [as_func(location) for as_func in as_functions]
         self._breadth_first(_delete_item, first_tier)
-        # recompute (and update) the metadata inheritance tree which is cached
-        self.refresh_cached_metadata_inheritance_tree(location.course_key)
+        # recompute (and update) the metadata inheritance tree which is cached, for the deleted subtree
+        self.refresh_cached_metadata_inheritance_tree(location.course_key, locations=[location])
 
     def _breadth_first(self, function, root_usages):
         """
@@ -636,7 +636,7 @@ class DraftModuleStore(MongoModuleStore):
         _internal([root_usage.to_deprecated_son() for root_usage in root_usages])
         if len(to_be_deleted) > 0:
             bulk_record = self._get_bulk_ops_record(root_usages[0].course_key)
-            bulk_record.dirty = True
+            bulk_record.record_inheritance_change(root_usages)
             self.collection.remove({'_id': {'$in': to_be_deleted}}, safe=self.collection.safe)
 
     @memoize_in_request_cache('request_cache')
@@ -740,7 +740,7 @@ class DraftModuleStore(MongoModuleStore):
         course_key = location.course_key
         bulk_record = self._get_bulk_ops_record(course_key)
         if len(to_be_deleted) > 0:
-            bulk_record.dirty = True
+            bulk_record.record_inheritance_change([location])
             self.collection.remove({'_id': {'$in': to_be_deleted}})
 
         self._flag_publish_event(course_key)
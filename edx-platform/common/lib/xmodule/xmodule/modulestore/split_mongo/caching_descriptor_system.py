@@ -84,6 +84,20 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.local_modules = {}
         self._services['library_tools'] = LibraryToolsService(modulestore)
 
+        # Map of the id of a not yet loaded definition of a block to the ids
+        # of the definitions of the block and its siblings, which are loaded
+        # together (see get_definition).
+        # dict {definition id: list [definition id]}
+        self._definition_batches = {}
+
+        # Definitions loaded in a batch that haven't been used yet.
+        # dict {definition id: definition}
+        self._prefetched_definitions = {}
+
+        # Counts of the definitions loaded by this runtime, of those that were
+        # loaded as part of a batch, and of the queries that loaded them.
+        self.definition_load_stats = {'loaded': 0, 'batched': 0, 'queries': 0}
+
     @lazy
     @contract(returns="dict(BlockKey: BlockKey)")
     def _parent_map(self):
@@ -138,9 +152,58 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         # can use it when needed.
         block.course_version = version_guid
 
+        self._add_definition_batch(block_data)
+
         self.modulestore.cache_block(course_key, version_guid, block_key, block)
         return block
 
+    def _add_definition_batch(self, block_data):
+        """
+        Records the ids of the definitions of the children of the given
+        block which aren't loaded yet, so that they are loaded together once
+        any of them is needed.
+        """
+        blocks = self.course_entry.structure['blocks']
+        definition_ids = []
+        for child_key in block_data.fields.get('children', []):
+            child_data = blocks.get(child_key)
+            if child_data is None or child_data.definition is None or child_data.definition_loaded:
+                continue
+            if child_data.definition not in self._prefetched_definitions:
+                definition_ids.append(child_data.definition)
+        if len(definition_ids) > 1:
+            for definition_id in definition_ids:
+                self._definition_batches.setdefault(definition_id, definition_ids)
+
+    def get_definition(self, course_key, definition_id):
+        """
+        Returns the definition with the given id, as the modulestore's
+        get_definition does.  If the definition belongs to a batch recorded
+        when its block's parent was loaded, all the definitions of the batch
+        that aren't loaded yet are loaded along with it, in a single query.
+        """
+        definition = self._prefetched_definitions.pop(definition_id, None)
+        if definition is not None:
+            return definition
+
+        batch = [
+            batch_definition_id
+            for batch_definition_id in self._definition_batches.pop(definition_id, [])
+            if batch_definition_id != definition_id and batch_definition_id not in self._prefetched_definitions
+        ]
+        self.definition_load_stats['queries'] += 1
+        if not batch:
+            self.definition_load_stats['loaded'] += 1
+            return self.modulestore.get_definition(course_key, definition_id)
+
+        definitions = self.modulestore.get_definitions(course_key, [definition_id] + batch)
+        self.definition_load_stats['loaded'] += len(definitions)
+        self.definition_load_stats['batched'] += len(definitions)
+        for loaded_definition in definitions:
+            self._definition_batches.pop(loaded_definition['_id'], None)
+            self._prefetched_definitions[loaded_definition['_id']] = loaded_definition
+        return self._prefetched_definitions.pop(definition_id, None)
+
     @contract(block_key=BlockKey, course_key="CourseLocator | LibraryLocator")
     def get_module_data(self, block_key, course_key):
         """
@@ -193,7 +256,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         if definition_id is not None and not block_data.definition_loaded:
             definition_loader = DefinitionLazyLoader(
-                self.modulestore,
+                self,
                 course_key,
                 block_key.type,
                 definition_id,
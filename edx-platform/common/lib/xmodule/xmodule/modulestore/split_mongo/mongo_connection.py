@@ -2,7 +2,6 @@
 Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
 """
 import datetime
-import cPickle as pickle
 import math
 import zlib
 import pymongo
@@ -27,7 +26,7 @@ from contracts import check, new_contract
 from mongodb_proxy import autoretry_read
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
-from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo import BlockKey, structure_codec
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 
 
@@ -228,7 +227,8 @@ def structure_to_mongo(structure, course_context=None):
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
-    The course structures are pickled and compressed when cached.
+    The course structures are encoded (see the structure_codec module) and
+    compressed when cached.
 
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
@@ -242,41 +242,41 @@ class CourseStructureCache(object):
                 pass
 
     def get(self, key, course_context=None):
-        """Pull the compressed, pickled struct data from cache and deserialize."""
+        """Pull the compressed, encoded struct data from cache and decode."""
         if self.cache is None:
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
-            compressed_pickled_data = self.cache.get(key)
-            tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
+            compressed_encoded_data = self.cache.get(key)
+            tagger.tag(from_cache=str(compressed_encoded_data is not None).lower())
 
-            if compressed_pickled_data is None:
+            if compressed_encoded_data is None:
                 # Always log cache misses, because they are unexpected
                 tagger.sample_rate = 1
                 return None
 
-            tagger.measure('compressed_size', len(compressed_pickled_data))
+            tagger.measure('compressed_size', len(compressed_encoded_data))
 
-            pickled_data = zlib.decompress(compressed_pickled_data)
-            tagger.measure('uncompressed_size', len(pickled_data))
+            encoded_data = zlib.decompress(compressed_encoded_data)
+            tagger.measure('uncompressed_size', len(encoded_data))
 
-            return pickle.loads(pickled_data)
+            return structure_codec.decode_structure(encoded_data)
 
     def set(self, key, structure, course_context=None):
-        """Given a structure, will pickle, compress, and write to cache."""
+        """Given a structure, will encode, compress, and write to cache."""
         if self.cache is None:
             return None
 
         with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
-            pickled_data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
-            tagger.measure('uncompressed_size', len(pickled_data))
+            encoded_data = structure_codec.encode_structure(structure)
+            tagger.measure('uncompressed_size', len(encoded_data))
 
             # 1 = Fastest (slightly larger results)
-            compressed_pickled_data = zlib.compress(pickled_data, 1)
-            tagger.measure('compressed_size', len(compressed_pickled_data))
+            compressed_encoded_data = zlib.compress(encoded_data, 1)
+            tagger.measure('compressed_size', len(compressed_encoded_data))
 
             # Stuctures are immutable, so we set a timeout of "never"
-            self.cache.set(key, compressed_pickled_data, None)
+            self.cache.set(key, compressed_encoded_data, None)
 
 
 class MongoConnection(object):
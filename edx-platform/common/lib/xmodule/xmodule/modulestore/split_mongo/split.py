@@ -57,6 +57,7 @@ import copy
 import datetime
 import hashlib
 import logging
+import re
 import six
 from contracts import contract, new_contract
 from importlib import import_module
@@ -85,6 +86,7 @@ from ..exceptions import ItemNotFoundError
 from .caching_descriptor_system import CachingDescriptorSystem
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
+from xmodule.modulestore.split_mongo.structure_index import get_structure_index
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.error_module import ErrorDescriptor
 from collections import defaultdict
@@ -1198,11 +1200,13 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         if settings is None:
             settings = {}
+        index = self._get_structure_index(course_locator, course.structure)
         if 'name' in qualifiers:
             # odd case where we don't search just confirm
             block_name = qualifiers.pop('name')
             block_ids = []
-            for block_id, block in course.structure['blocks'].iteritems():
+            for block_id in self._find_candidate_blocks(course.structure, index, block_name=block_name):
+                block = course.structure['blocks'][block_id]
                 # Don't do an in comparison blindly; first check to make sure
                 # that the name qualifier we're looking at isn't a plain string;
                 # if it is a string, then it should match exactly. If it's other
@@ -1228,18 +1232,24 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         # No need of these caches unless include_orphans is set to False
         path_cache = None
         parents_cache = None
+        reachable_keys = None
 
         if not include_orphans:
-            path_cache = {}
-            parents_cache = self.build_block_key_to_parents_mapping(course.structure)
+            if index is None:
+                path_cache = {}
+                parents_cache = self.build_block_key_to_parents_mapping(course.structure)
+            else:
+                reachable_keys = index.reachable_keys(course.structure['blocks'])
 
-        for block_id, value in course.structure['blocks'].iteritems():
-            if _block_matches_all(value):
+        for block_id in self._find_candidate_blocks(course.structure, index, qualifiers, settings):
+            if _block_matches_all(course.structure['blocks'][block_id]):
                 if not include_orphans:
-                    if (  # pylint: disable=bad-continuation
-                        block_id.type in DETACHED_XBLOCK_TYPES or
-                        self.has_path_to_root(block_id, course, path_cache, parents_cache)
-                    ):
+                    if block_id.type in DETACHED_XBLOCK_TYPES:
+                        items.append(block_id)
+                    elif reachable_keys is not None:
+                        if block_id in reachable_keys:
+                            items.append(block_id)
+                    elif self.has_path_to_root(block_id, course, path_cache, parents_cache):
                         items.append(block_id)
                 else:
                     items.append(block_id)
@@ -1249,6 +1259,61 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         else:
             return []
 
+    def _get_structure_index(self, course_key, structure):
+        """
+        Returns the index of the given structure, or None if the structure
+        may still change, i.e., if it's being edited in a bulk operation.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if bulk_write_record.active and structure['_id'] not in bulk_write_record.structures_in_db:
+            return None
+        return get_structure_index(structure)
+
+    def _find_candidate_blocks(self, structure, index, qualifiers=None, settings=None, block_name=None):
+        """
+        Returns the keys of the blocks of the structure that may match the
+        given get_items qualifiers, settings and block name.  The blocks
+        found with the structure's index are the ones matching its most
+        selective indexable criterion; all of the structure's blocks are
+        returned if there's no index or no indexable criterion.  The
+        returned blocks still need to be matched against all the criteria.
+        """
+        blocks = structure['blocks']
+        if index is None:
+            return blocks.keys()
+
+        candidates = []
+        if block_name is not None:
+            if isinstance(block_name, six.string_types):
+                candidates.append(index.keys_with_id(blocks, block_name))
+            elif isinstance(block_name, (list, tuple, set, frozenset)):
+                candidates.append([
+                    block_key for block_id in set(block_name) for block_key in index.keys_with_id(blocks, block_id)
+                ])
+
+        block_type = (qualifiers or {}).get('block_type')
+        if isinstance(block_type, six.string_types):
+            candidates.append(index.keys_of_type(blocks, block_type))
+        elif isinstance(block_type, dict) and '$in' in block_type and all(
+                isinstance(value, six.string_types) for value in block_type['$in']
+        ):
+            candidates.append([
+                block_key for value in set(block_type['$in']) for block_key in index.keys_of_type(blocks, value)
+            ])
+
+        for field_name, criteria in (settings or {}).iteritems():
+            if isinstance(criteria, (dict, re._pattern_type)) or callable(criteria):  # pylint: disable=protected-access
+                continue
+            try:
+                hash(criteria)
+            except TypeError:
+                continue
+            candidates.append(index.keys_with_field_value(blocks, field_name, criteria))
+
+        if not candidates:
+            return blocks.keys()
+        return min(candidates, key=len)
+
     def build_block_key_to_parents_mapping(self, structure):
         """
         Given a structure, builds block_key to parents mapping for all block keys in structure
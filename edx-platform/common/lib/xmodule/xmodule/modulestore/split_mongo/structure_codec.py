@@ -0,0 +1,217 @@
+"""
+Compact, versioned encoding of split modulestore course structures for
+the CourseStructureCache.
+
+Rather than pickling the structure's {BlockKey: BlockData} map wholesale,
+the encoded payload is laid out as follows:
+
+    * String tables - Each distinct block type and block id is stored
+      exactly once.  Each block key in the structure, including the keys
+      of children and of the root, is stored as a pair of indices into
+      these tables, and everything else refers to a block by its index.
+
+    * Children as index arrays - The 'children' field of each block is
+      stored as an array of block indices.
+
+    * Per-block records - The remaining data of each block is pickled on
+      its own, so that it is only unpickled when the block's data is
+      first accessed on the decoded structure.
+
+Decoding a structure builds its block keys, sharing them between the
+blocks map and the children lists, and leaves the data of each block
+encoded until it is used.
+"""
+from array import array
+import cPickle as pickle
+
+from xmodule.modulestore import BlockData, EditInfo
+from xmodule.modulestore.split_mongo import BlockKey
+
+
+# The current version of the encoding.  Incrementally update this value
+# whenever the layout of the encoded payload changes.
+FORMAT_VERSION = 1
+
+# Marks payloads produced by this module, as opposed to legacy pickled
+# structures.
+_FORMAT_MARKER = 'split.structure'
+
+# Array typecode used for string table and block indices.
+_INDEX_TYPECODE = 'i'
+
+
+class _LazyBlockData(BlockData):
+    """
+    A BlockData whose attributes are unpickled from its encoded record the
+    first time any of them is accessed.
+    """
+    def __init__(self, block_type, record, block_keys):  # pylint: disable=super-init-not-called
+        self.definition_loaded = False
+        self.block_type = block_type
+        self._record = record
+        self._block_keys = block_keys
+
+    def __getattr__(self, name):
+        # Only called for attributes that aren't set yet.
+        state = self.__dict__
+        if name.startswith('__') or '_record' not in state:
+            raise AttributeError(name)
+        self._decode()
+        try:
+            return state[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def _decode(self):
+        """
+        Unpickles the record of this block into its attributes, without
+        overwriting the attributes that were set since it was decoded.
+        """
+        state = self.__dict__
+        record = state.pop('_record')
+        block_keys = state.pop('_block_keys')
+        fields, children, definition, defaults, asides, edit_info = pickle.loads(record)
+        if children is not None:
+            fields['children'] = [block_keys[index] for index in _decode_array(children)]
+        decoded = {
+            'fields': fields,
+            'definition': definition,
+            'defaults': defaults,
+            'asides': asides,
+            'edit_info': EditInfo(**edit_info),
+        }
+        for name, value in decoded.iteritems():
+            state.setdefault(name, value)
+
+
+def encode_structure(structure):
+    """
+    Returns the encoding of the given structure, as returned by
+    `structure_from_mongo`.
+
+    Arguments:
+        structure (dict) - The structure to encode, with a 'root'
+            BlockKey and a 'blocks' map of {BlockKey: BlockData}.
+
+    Returns:
+        str - The encoded structure.
+    """
+    blocks = structure['blocks']
+
+    # Intern the block keys.  The keys of the blocks come first, in the
+    # same order as their records.
+    block_keys = list(blocks)
+    key_index = {block_key: index for index, block_key in enumerate(block_keys)}
+
+    def intern_key(block_key):
+        """
+        Returns the index of the given block key, adding it if needed.
+        """
+        index = key_index.get(block_key)
+        if index is None:
+            index = key_index[block_key] = len(block_keys)
+            block_keys.append(block_key)
+        return index
+
+    strings = []
+    string_index = {}
+
+    def intern_string(value):
+        """
+        Returns the index of the given string, adding it if needed.
+        """
+        index = string_index.get(value)
+        if index is None:
+            index = string_index[value] = len(strings)
+            strings.append(value)
+        return index
+
+    block_types = array(_INDEX_TYPECODE)
+    records = []
+    for block_key in block_keys[:len(blocks)]:
+        block = blocks[block_key]
+        fields = dict(block.fields)
+        children = fields.pop('children', None)
+        if children is not None:
+            children = array(_INDEX_TYPECODE, (intern_key(BlockKey._make(child)) for child in children)).tostring()
+        block_types.append(intern_string(block.block_type))
+        records.append(pickle.dumps(
+            (
+                fields,
+                children,
+                block.definition,
+                block.defaults,
+                block.get_asides(),
+                block.edit_info.to_storable(),
+            ),
+            pickle.HIGHEST_PROTOCOL,
+        ))
+    root = intern_key(BlockKey._make(structure['root']))
+
+    key_strings = array(_INDEX_TYPECODE)
+    for block_key in block_keys:
+        key_strings.append(intern_string(block_key.type))
+        key_strings.append(intern_string(block_key.id))
+
+    other_fields = {name: value for name, value in structure.iteritems() if name not in ('root', 'blocks')}
+
+    return pickle.dumps(
+        (
+            _FORMAT_MARKER,
+            FORMAT_VERSION,
+            other_fields,
+            strings,
+            key_strings.tostring(),
+            root,
+            block_types.tostring(),
+            records,
+        ),
+        pickle.HIGHEST_PROTOCOL,
+    )
+
+
+def decode_structure(data):
+    """
+    Returns the structure encoded in the given data, with the data of
+    each block decoded lazily, upon first access.
+
+    Data of legacy pickled structures is unpickled as is.
+
+    Arguments:
+        data (str) - Data previously returned by encode_structure.
+
+    Returns:
+        dict - The decoded structure.
+
+        NoneType - If the data is of an unknown version of the encoding.
+    """
+    payload = pickle.loads(data)
+    if not isinstance(payload, tuple) or payload[0] != _FORMAT_MARKER:
+        return payload
+    if payload[1] != FORMAT_VERSION:
+        return None
+
+    _, _, structure, strings, key_strings, root, block_types, records = payload
+
+    # BlockKey._make bypasses the contract checks of BlockKey's
+    # constructor, which the encoded keys have already passed.
+    key_strings = _decode_array(key_strings)
+    block_keys = [
+        BlockKey._make((strings[key_strings[index]], strings[key_strings[index + 1]]))
+        for index in xrange(0, len(key_strings), 2)
+    ]
+    structure['root'] = block_keys[root]
+    structure['blocks'] = {
+        block_keys[index]: _LazyBlockData(strings[block_type], record, block_keys)
+        for index, (block_type, record) in enumerate(zip(_decode_array(block_types), records))
+    }
+    return structure
+
+
+def _decode_array(data):
+    """
+    Returns an array of indices from the given string.
+    """
+    decoded = array(_INDEX_TYPECODE)
+    decoded.fromstring(data)
+    return decoded
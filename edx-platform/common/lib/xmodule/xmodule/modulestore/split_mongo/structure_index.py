@@ -0,0 +1,161 @@
+"""
+Secondary indexes over split modulestore course structures.
+
+An index narrows down the blocks of a structure that may match the
+qualifiers of a get_items query - by block type, block id and settings
+field values - and records which blocks are reachable from the root,
+so that a query doesn't have to scan all of the structure's blocks.
+
+Since a structure is immutable once it's persisted, its index is built
+once and kept in a per-process cache keyed by the structure's version.
+Each part of an index is built upon its first use.
+"""
+from collections import OrderedDict, defaultdict
+from threading import Lock
+
+
+# Maximum number of structure indexes kept in the per-process cache.
+STRUCTURE_INDEX_CACHE_SIZE = 64
+
+# Types of the blocks that other blocks need a path to in order not to
+# be orphans.
+ROOT_BLOCK_TYPES = ('course', 'library')
+
+_cached_indexes = OrderedDict()
+_cached_indexes_lock = Lock()
+
+
+def get_structure_index(structure):
+    """
+    Returns the index of the given persisted structure, from the cache if
+    it was previously used.
+    """
+    version = structure['_id']
+    with _cached_indexes_lock:
+        index = _cached_indexes.pop(version, None)
+        if index is None:
+            index = StructureIndex()
+        _cached_indexes[version] = index
+        while len(_cached_indexes) > STRUCTURE_INDEX_CACHE_SIZE:
+            _cached_indexes.popitem(last=False)
+    return index
+
+
+def clear_structure_indexes():
+    """
+    Removes all structure indexes from the cache.
+    """
+    with _cached_indexes_lock:
+        _cached_indexes.clear()
+
+
+class StructureIndex(object):
+    """
+    Indexes the blocks of a single version of a structure.
+
+    The structure's blocks are passed to each method rather than kept by
+    the index, so that cached indexes don't keep structures alive.
+    """
+    def __init__(self):
+        # dict {block type: list [BlockKey]}
+        self._keys_by_type = None
+
+        # dict {block id: list [BlockKey]}
+        self._keys_by_id = None
+
+        # Map of a settings field name to its values index, as returned by
+        # _index_field_values.
+        # dict {string: (dict {value: list [BlockKey]}, list [BlockKey])}
+        self._field_indexes = {}
+
+        # set {BlockKey}
+        self._reachable_keys = None
+
+    def keys_of_type(self, blocks, block_type):
+        """
+        Returns the keys of the given blocks of the given type.
+        """
+        if self._keys_by_type is None:
+            keys_by_type = defaultdict(list)
+            for block_key in blocks:
+                keys_by_type[block_key.type].append(block_key)
+            self._keys_by_type = dict(keys_by_type)
+        return self._keys_by_type.get(block_type, [])
+
+    def keys_with_id(self, blocks, block_id):
+        """
+        Returns the keys of the given blocks with the given id.
+        """
+        if self._keys_by_id is None:
+            keys_by_id = defaultdict(list)
+            for block_key in blocks:
+                keys_by_id[block_key.id].append(block_key)
+            self._keys_by_id = dict(keys_by_id)
+        return self._keys_by_id.get(block_id, [])
+
+    def keys_with_field_value(self, blocks, field_name, value):
+        """
+        Returns the keys of the given blocks whose settings field of the
+        given name may equal, or be a list containing, the given hashable
+        value.  Blocks with unhashable values for the field are always
+        included, so the blocks still need to be matched against the value.
+        """
+        field_index = self._field_indexes.get(field_name)
+        if field_index is None:
+            field_index = self._field_indexes[field_name] = _index_field_values(blocks, field_name)
+        keys_by_value, unindexed_keys = field_index
+        return keys_by_value.get(value, []) + unindexed_keys
+
+    def reachable_keys(self, blocks):
+        """
+        Returns the set of the keys of the given blocks that have a path
+        from a parentless course or library block.
+        """
+        if self._reachable_keys is None:
+            children_by_key = {
+                block_key: block.fields.get('children', []) for block_key, block in blocks.iteritems()
+            }
+            child_keys = set()
+            for children in children_by_key.itervalues():
+                child_keys.update(children)
+            pending = [
+                block_key for block_key in blocks
+                if block_key.type in ROOT_BLOCK_TYPES and block_key not in child_keys
+            ]
+            reachable_keys = set(pending)
+            while pending:
+                for child_key in children_by_key.get(pending.pop(), []):
+                    if child_key not in reachable_keys:
+                        reachable_keys.add(child_key)
+                        pending.append(child_key)
+            self._reachable_keys = reachable_keys
+        return self._reachable_keys
+
+
+def _index_field_values(blocks, field_name):
+    """
+    Returns a ({value: [BlockKey]}, [BlockKey]) pair mapping each hashable
+    value of the given settings field of the given blocks, or of the
+    elements of its list values, to the keys of the blocks that have it,
+    along with the keys of the blocks with any unhashable value.
+    """
+    keys_by_value = defaultdict(list)
+    unindexed_keys = []
+    for block_key, block in blocks.iteritems():
+        if field_name not in block.fields:
+            continue
+        values = set()
+        pending = [block.fields[field_name]]
+        try:
+            while pending:
+                value = pending.pop()
+                if isinstance(value, list):
+                    pending.extend(value)
+                else:
+                    values.add(value)
+        except TypeError:
+            unindexed_keys.append(block_key)
+            continue
+        for value in values:
+            keys_by_value[value].append(block_key)
+    return dict(keys_by_value), unindexed_keys
@@ -1,6 +1,7 @@
 """
  Test contentstore.mongo functionality
 """
+import json
 import logging
 from uuid import uuid4
 import unittest
@@ -145,6 +146,27 @@ class TestContentstore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    @ddt.data(True, False)
+    def test_stream_for_course(self, deprecated):
+        """
+        Test streaming the export
+        """
+        self.set_up_assets(deprecated)
+        root_dir = path.Path(mkdtemp())
+        try:
+            policy_path = path.Path(root_dir / "policy.json")
+            self.contentstore.export_all_for_course(self.course1_key, root_dir, policy_path)
+            policy, assets = self.contentstore.stream_all_for_course(self.course1_key)
+            self.assertEqual(json.dumps(policy, sort_keys=True, indent=4), policy_path.text())
+            streamed_files = {}
+            for filename, content in assets:
+                streamed_files[filename] = ''.join(content.stream_data())
+            self.assertItemsEqual(streamed_files.keys(), self.course1_files)
+            for filename, data in streamed_files.iteritems():
+                self.assertEqual(data, path.Path(root_dir / filename).bytes())
+        finally:
+            shutil.rmtree(root_dir)
+
     @ddt.data(True, False)
     def test_get_all_content(self, deprecated):
         """
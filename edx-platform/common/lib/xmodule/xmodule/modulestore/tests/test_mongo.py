@@ -8,6 +8,7 @@ from nose.tools import assert_equals, assert_raises, \
     assert_not_equals, assert_false, assert_true, assert_greater, assert_is_instance, assert_is_none
 # pylint: enable=E0611
 from path import Path as path
+import copy
 import pymongo
 import logging
 import shutil
@@ -16,7 +17,7 @@ from uuid import uuid4
 from datetime import datetime
 from pytz import UTC
 import unittest
-from mock import patch
+from mock import Mock, patch
 from xblock.core import XBlock
 
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
@@ -707,6 +708,119 @@ class TestMongoModuleStore(TestMongoModuleStoreBase):
         # Clean up the data so we don't break other tests which apparently expect a particular state
         self.draft_store.delete_course(course.id, self.dummy_user)
 
+    def test_patch_metadata_inheritance_tree(self):
+        """
+        Tests that patching the metadata inheritance tree for a changed subtree results in the same tree
+        as recomputing it as a whole.
+        """
+        course = self.draft_store.create_course("TestX", "InheritancePatch", "2015_T1", self.dummy_user)
+        chapter = self.draft_store.create_child(self.dummy_user, course.location, "chapter", block_id="chapter")
+        sequential = self.draft_store.create_child(
+            self.dummy_user, chapter.location, "sequential", block_id="sequential"
+        )
+        vertical = self.draft_store.create_child(self.dummy_user, sequential.location, "vertical", block_id="vertical")
+        problem = self.draft_store.create_child(self.dummy_user, vertical.location, "problem", block_id="problem")
+        tree = self.draft_store._compute_metadata_inheritance_tree(course.id)
+
+        # change the inheritable metadata of the sequential
+        sequential = self.draft_store.get_item(sequential.location)
+        sequential.visible_to_staff_only = True
+        self.draft_store.update_item(sequential, self.dummy_user)
+        self.assertTrue(
+            self.draft_store._patch_metadata_inheritance_tree(course.id, tree, sequential.location, set())
+        )
+        self.assertEqual(tree, self.draft_store._compute_metadata_inheritance_tree(course.id))
+        self.assertTrue(tree[unicode(problem.location)]['visible_to_staff_only'])
+
+        # change the children of the sequential
+        self.draft_store.delete_item(vertical.location, self.dummy_user)
+        self.assertTrue(
+            self.draft_store._patch_metadata_inheritance_tree(course.id, tree, sequential.location, set())
+        )
+        self.assertEqual(tree, self.draft_store._compute_metadata_inheritance_tree(course.id))
+        self.assertNotIn(unicode(problem.location), tree)
+
+        # Clean up the data so we don't break other tests which apparently expect a particular state
+        self.draft_store.delete_course(course.id, self.dummy_user)
+
+    def test_patch_metadata_inheritance_tree_from_cache(self):
+        """
+        Tests that the metadata inheritance tree is patched as last written to the caching subsystem, rather than
+        as in a request cache that predates another process's update.
+        """
+        course = self.draft_store.create_course("TestX", "InheritanceCache", "2015_T1", self.dummy_user)
+        chapter = self.draft_store.create_child(self.dummy_user, course.location, "chapter", block_id="chapter")
+        sequential = self.draft_store.create_child(
+            self.dummy_user, chapter.location, "sequential", block_id="sequential"
+        )
+        vertical = self.draft_store.create_child(self.dummy_user, sequential.location, "vertical", block_id="vertical")
+        problem = self.draft_store.create_child(self.dummy_user, vertical.location, "problem", block_id="problem")
+
+        cache = {}
+        cache_subsystem = Mock(get=lambda key, default=None: cache.get(key, default), set=cache.__setitem__)
+        request_cache = Mock(data={})
+        with patch.object(self.draft_store, 'metadata_inheritance_cache_subsystem', cache_subsystem):
+            with patch.object(self.draft_store, 'request_cache', request_cache):
+                stale_tree = copy.deepcopy(self.draft_store._get_cached_metadata_inheritance_tree(course.id))
+
+                # another process changes the inheritable metadata of the sequential
+                sequential = self.draft_store.get_item(sequential.location)
+                sequential.visible_to_staff_only = True
+                self.draft_store.update_item(sequential, self.dummy_user)
+                request_cache.data['metadata_inheritance'][unicode(course.id)] = stale_tree
+
+                # this process changes the inheritable metadata of the vertical
+                vertical = self.draft_store.get_item(vertical.location)
+                vertical.graded = True
+                self.draft_store.update_item(vertical, self.dummy_user)
+
+        tree = cache[unicode(course.id)]
+        self.assertEqual(tree, self.draft_store._compute_metadata_inheritance_tree(course.id))
+        self.assertTrue(tree[unicode(problem.location)]['visible_to_staff_only'])
+        self.assertTrue(tree[unicode(problem.location)]['graded'])
+
+        # Clean up the data so we don't break other tests which apparently expect a particular state
+        self.draft_store.delete_course(course.id, self.dummy_user)
+
+    def test_bulk_orphan_cleanup_refreshes_inheritance_tree(self):
+        """
+        Tests that removing the children of an orphan parent in a bulk operation recomputes the whole
+        metadata inheritance tree when the bulk operation ends.
+        """
+        course = self.draft_store.create_course("TestX", "InheritanceOrphan", "2015_T1", self.dummy_user)
+        chapter = self.draft_store.create_child(self.dummy_user, course.location, "chapter", block_id="chapter")
+        sequential = self.draft_store.create_child(
+            self.dummy_user, chapter.location, "sequential", block_id="sequential"
+        )
+        vertical = self.draft_store.create_child(self.dummy_user, sequential.location, "vertical", block_id="vertical")
+        problem = self.draft_store.create_child(self.dummy_user, vertical.location, "problem", block_id="problem")
+        self.draft_store.publish(vertical.location, self.dummy_user)
+
+        # add a published orphan vertical as another parent of the problem
+        orphan = course.id.make_usage_key('vertical', 'OrphanVertical')
+        self.draft_store.create_item(self.dummy_user, course.id, orphan.block_type, block_id=orphan.block_id)
+        self.draft_store.publish(orphan, self.dummy_user)
+        self.draft_store.collection.update(
+            orphan.to_deprecated_son('_id.'),
+            {'$push': {'definition.children': unicode(problem.location)}}
+        )
+
+        with patch.object(self.draft_store, 'refresh_cached_metadata_inheritance_tree') as mock_refresh:
+            with self.draft_store.bulk_operations(course.id):
+                self.assertEqual(
+                    self.draft_store.get_parent_location(
+                        problem.location, ModuleStoreEnum.RevisionOption.published_only
+                    ),
+                    vertical.location
+                )
+                self.assertFalse(mock_refresh.called)
+        self.assertEqual(mock_refresh.call_count, 1)
+        self.assertIsNone(mock_refresh.call_args[1]['locations'])
+        self.assertEqual(self.draft_store.get_item(orphan).children, [])
+
+        # Clean up the data so we don't break other tests which apparently expect a particular state
+        self.draft_store.delete_course(course.id, self.dummy_user)
+
     def test_make_course_usage_key(self):
         """Test that we get back the appropriate usage key for the root of a course key."""
         course_key = CourseLocator(org="edX", course="101", run="2015")
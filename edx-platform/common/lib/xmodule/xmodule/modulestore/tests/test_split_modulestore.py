@@ -1261,6 +1261,21 @@ class SplitModuleItemTests(SplitModuleTest):
             expected_ids.remove(child.location.block_id)
         self.assertEqual(len(expected_ids), 0)
 
+    def test_batched_definition_loads(self):
+        """
+        Test that the definitions of siblings are loaded together
+        """
+        locator = BlockUsageLocator(
+            CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT), 'chapter', 'chapter3'
+        )
+        block = modulestore().get_item(locator)
+        children = block.get_children()
+        self.assertEqual(len(children), 3)
+        with check_mongo_calls(1):
+            for child in children:
+                self.assertIsNotNone(child.data)
+        self.assertEqual(block.runtime.definition_load_stats, {'loaded': 3, 'batched': 3, 'queries': 1})
+
 
 def version_agnostic(children):
     """
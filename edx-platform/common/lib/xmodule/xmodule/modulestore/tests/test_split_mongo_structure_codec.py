@@ -0,0 +1,109 @@
+""" Test the encoding of split modulestore structures for the CourseStructureCache """
+import copy
+import cPickle as pickle
+import datetime
+import unittest
+
+from bson.objectid import ObjectId
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey, structure_codec
+from xmodule.modulestore.split_mongo.mongo_connection import structure_from_mongo
+
+
+def make_structure():
+    """
+    Returns a structure as converted by structure_from_mongo, of a course
+    with a chapter and two problems.
+    """
+    edited_on = datetime.datetime(2016, 5, 1, 12, 0)
+
+    def block(block_type, block_id, children=None, **fields):
+        """
+        Returns the mongo document of a block.
+        """
+        if children is not None:
+            fields['children'] = children
+        return {
+            'block_type': block_type,
+            'block_id': block_id,
+            'fields': fields,
+            'definition': ObjectId(),
+            'defaults': {},
+            'asides': {},
+            'edit_info': {'edited_on': edited_on, 'edited_by': 7, 'update_version': ObjectId()},
+        }
+
+    return structure_from_mongo({
+        '_id': ObjectId(),
+        'root': ['course', 'course'],
+        'previous_version': None,
+        'edited_by': 7,
+        'edited_on': edited_on,
+        'schema_version': 1,
+        'blocks': [
+            block('course', 'course', [['chapter', 'week1']], display_name='Course'),
+            block('chapter', 'week1', [['problem', 'p1'], ['problem', 'p2']], display_name='Week 1'),
+            block('problem', 'p1', graded=True, weight=2),
+            block('problem', 'p2'),
+        ],
+    })
+
+
+class TestStructureCodec(unittest.TestCase):
+    """ Tests for encoding and decoding structures """
+    def setUp(self):
+        super(TestStructureCodec, self).setUp()
+        self.structure = make_structure()
+        self.decoded = structure_codec.decode_structure(structure_codec.encode_structure(self.structure))
+
+    def test_round_trip(self):
+        self.assertEqual(self.decoded, self.structure)
+        self.assertIsInstance(self.decoded['root'], BlockKey)
+        for block_key, block in self.decoded['blocks'].iteritems():
+            self.assertIsInstance(block_key, BlockKey)
+            self.assertIsInstance(block, BlockData)
+            for child in block.fields.get('children', []):
+                self.assertIsInstance(child, BlockKey)
+                self.assertIn(child, self.decoded['blocks'])
+
+    def test_lazy_decoding(self):
+        chapter = self.decoded['blocks'][BlockKey('chapter', 'week1')]
+        problem = self.decoded['blocks'][BlockKey('problem', 'p1')]
+        self.assertIn('_record', chapter.__dict__)
+        self.assertEqual(chapter.block_type, 'chapter')
+        self.assertFalse(chapter.definition_loaded)
+        self.assertIn('_record', chapter.__dict__)
+
+        self.assertEqual(chapter.fields['children'], [BlockKey('problem', 'p1'), BlockKey('problem', 'p2')])
+        self.assertNotIn('_record', chapter.__dict__)
+        self.assertIn('_record', problem.__dict__)
+
+    def test_set_before_decoding(self):
+        problem = self.decoded['blocks'][BlockKey('problem', 'p1')]
+        problem.fields = {'graded': False}
+        self.assertEqual(problem.edit_info.edited_by, 7)
+        self.assertEqual(problem.fields, {'graded': False})
+
+    def test_copy(self):
+        copied = copy.deepcopy(self.decoded)
+        self.assertEqual(copied, self.structure)
+        unpickled = pickle.loads(pickle.dumps(self.decoded, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(unpickled, self.structure)
+
+    def test_dangling_children(self):
+        del self.structure['blocks'][BlockKey('problem', 'p2')]
+        decoded = structure_codec.decode_structure(structure_codec.encode_structure(self.structure))
+        self.assertEqual(decoded, self.structure)
+        self.assertNotIn(BlockKey('problem', 'p2'), decoded['blocks'])
+
+    def test_legacy_pickled_structure(self):
+        self.assertEqual(
+            structure_codec.decode_structure(pickle.dumps(self.structure, pickle.HIGHEST_PROTOCOL)),
+            self.structure,
+        )
+
+    def test_unknown_format_version(self):
+        payload = list(pickle.loads(structure_codec.encode_structure(self.structure)))
+        payload[1] = structure_codec.FORMAT_VERSION + 1
+        self.assertIsNone(structure_codec.decode_structure(pickle.dumps(tuple(payload))))
@@ -0,0 +1,76 @@
+""" Test the secondary indexes over split modulestore structures """
+import unittest
+
+from bson.objectid import ObjectId
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex, get_structure_index
+
+
+COURSE = BlockKey('course', 'course')
+CHAPTER = BlockKey('chapter', 'week1')
+DISCUSSION = BlockKey('discussion', 'd1')
+ORPHAN_CHAPTER = BlockKey('chapter', 'orphan')
+ORPHAN_DISCUSSION = BlockKey('discussion', 'd2')
+
+
+def make_blocks():
+    """
+    Returns the blocks of a structure of a course with a chapter containing
+    a discussion, along with an orphan chapter containing another one.
+    """
+    def block(block_key, **fields):
+        """
+        Returns the BlockData of a block.
+        """
+        return BlockData(block_type=block_key.type, fields=fields)
+
+    return {
+        COURSE: block(COURSE, children=[CHAPTER]),
+        CHAPTER: block(CHAPTER, children=[DISCUSSION], format='Homework'),
+        DISCUSSION: block(DISCUSSION, discussion_category='General', group_access={1: [2]}),
+        ORPHAN_CHAPTER: block(ORPHAN_CHAPTER, children=[ORPHAN_DISCUSSION], format='Lab'),
+        ORPHAN_DISCUSSION: block(ORPHAN_DISCUSSION, discussion_category=['General', 'Other']),
+    }
+
+
+class TestStructureIndex(unittest.TestCase):
+    """ Tests for StructureIndex """
+    def setUp(self):
+        super(TestStructureIndex, self).setUp()
+        self.blocks = make_blocks()
+        self.index = StructureIndex()
+
+    def test_keys_of_type(self):
+        self.assertItemsEqual(self.index.keys_of_type(self.blocks, 'discussion'), [DISCUSSION, ORPHAN_DISCUSSION])
+        self.assertEqual(self.index.keys_of_type(self.blocks, 'course'), [COURSE])
+        self.assertEqual(self.index.keys_of_type(self.blocks, 'problem'), [])
+
+    def test_keys_with_id(self):
+        self.assertEqual(self.index.keys_with_id(self.blocks, 'week1'), [CHAPTER])
+        self.assertEqual(self.index.keys_with_id(self.blocks, 'missing'), [])
+
+    def test_keys_with_field_value(self):
+        self.assertItemsEqual(
+            self.index.keys_with_field_value(self.blocks, 'discussion_category', 'General'),
+            [DISCUSSION, ORPHAN_DISCUSSION],
+        )
+        self.assertEqual(
+            self.index.keys_with_field_value(self.blocks, 'discussion_category', 'Other'),
+            [ORPHAN_DISCUSSION],
+        )
+        self.assertEqual(self.index.keys_with_field_value(self.blocks, 'format', 'Lab'), [ORPHAN_CHAPTER])
+        # Children are indexed by child, i.e., this finds the parents of a block.
+        self.assertEqual(self.index.keys_with_field_value(self.blocks, 'children', DISCUSSION), [CHAPTER])
+
+    def test_unhashable_field_values(self):
+        self.assertEqual(self.index.keys_with_field_value(self.blocks, 'group_access', 'anything'), [DISCUSSION])
+
+    def test_reachable_keys(self):
+        self.assertEqual(self.index.reachable_keys(self.blocks), {COURSE, CHAPTER, DISCUSSION})
+
+    def test_cached_per_version(self):
+        structure = {'_id': ObjectId(), 'blocks': self.blocks}
+        self.assertIs(get_structure_index(structure), get_structure_index(structure))
+        self.assertIsNot(get_structure_index(structure), get_structure_index({'_id': ObjectId(), 'blocks': {}}))
@@ -3,7 +3,10 @@ Methods for exporting course data to XML
 """
 
 import logging
+import tarfile
+import time
 from abc import abstractmethod
+from cStringIO import StringIO
 import lxml.etree
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
 from xmodule.contentstore.content import StaticContent
@@ -13,9 +16,9 @@ from xmodule.modulestore import EdxJSONEncoder, ModuleStoreEnum
 from xmodule.modulestore.inheritance import own_metadata
 from xmodule.modulestore.store_utilities import draft_node_constructor, get_draft_subtree_roots
 from xmodule.modulestore import LIBRARY_ROOT
+from fs.memoryfs import MemoryFS
 from fs.osfs import OSFS
 from json import dumps
-import os
 
 from xmodule.modulestore.draft_and_published import DIRECT_ONLY_CATEGORIES
 from opaque_keys.edx.locator import CourseLocator, LibraryLocator
@@ -104,7 +107,7 @@ class ExportManager(object):
     """
     Manages XML exporting for courselike objects.
     """
-    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir):
+    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir, root_fs=None):
         """
         Export all modules from `modulestore` and content from `contentstore` as xml to `root_dir`.
 
@@ -113,12 +116,20 @@ class ExportManager(object):
         `courselike_key`: The Locator of the Descriptor to export
         `root_dir`: The directory to write the exported xml to
         `target_dir`: The name of the directory inside `root_dir` to write the content to
+        `root_fs`: A filesystem to write the exported xml to instead of `root_dir`, if any. The static
+            assets' files are then not written to it, but left in `static_assets` to be streamed
+            from the contentstore.
         """
         self.modulestore = modulestore
         self.contentstore = contentstore
         self.courselike_key = courselike_key
         self.root_dir = root_dir
         self.target_dir = target_dir
+        self.root_fs = root_fs
+
+        # The (path, content) pairs of the static assets' files to stream, when exporting to `root_fs`,
+        # as returned by `ContentStore.stream_all_for_course`.
+        self.static_assets = []
 
     @abstractmethod
     def get_key(self):
@@ -137,6 +148,22 @@ class ExportManager(object):
         Process additional content, like static assets.
         """
 
+    def export_static_assets(self, export_fs):
+        """
+        Export the static assets from the contentstore to the 'static' directory of the export,
+        and their attributes to its policies/assets.json file.
+        """
+        if self.root_fs is None:
+            root_courselike_dir = self.root_dir + '/' + self.target_dir
+            self.contentstore.export_all_for_course(
+                self.courselike_key,
+                root_courselike_dir + '/static/',
+                root_courselike_dir + '/policies/assets.json',
+            )
+        else:
+            policy, self.static_assets = self.contentstore.stream_all_for_course(self.courselike_key)
+            export_fs.makeopendir('policies').setcontents('assets.json', dumps(policy, sort_keys=True, indent=4))
+
     def post_process(self, root, export_fs):
         """
         Perform any final processing after the other export tasks are done.
@@ -154,7 +181,7 @@ class ExportManager(object):
         """
         with self.modulestore.bulk_operations(self.courselike_key):
 
-            fsm = OSFS(self.root_dir)
+            fsm = OSFS(self.root_dir) if self.root_fs is None else self.root_fs
             root = lxml.etree.Element('unknown')
 
             # export only the published content
@@ -171,7 +198,7 @@ class ExportManager(object):
             self.process_root(root, export_fs)
 
             # Process extra items-- drafts, assets, etc
-            root_courselike_dir = self.root_dir + '/' + self.target_dir
+            root_courselike_dir = None if self.root_dir is None else self.root_dir + '/' + self.target_dir
             self.process_extra(root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs)
 
             # Any last pass adjustments
@@ -201,26 +228,20 @@ class CourseExportManager(ExportManager):
 
     def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
         # Export the modulestore's asset metadata.
-        asset_dir = root_courselike_dir + '/' + AssetMetadata.EXPORTED_ASSET_DIR + '/'
-        if not os.path.isdir(asset_dir):
-            os.makedirs(asset_dir)
+        asset_dir = export_fs.makeopendir(AssetMetadata.EXPORTED_ASSET_DIR)
         asset_root = lxml.etree.Element(AssetMetadata.ALL_ASSETS_XML_TAG)
         course_assets = self.modulestore.get_all_asset_metadata(self.courselike_key, None)
         for asset_md in course_assets:
             # All asset types are exported using the "asset" tag - but their asset type is specified in each asset key.
             asset = lxml.etree.SubElement(asset_root, AssetMetadata.ASSET_XML_TAG)
             asset_md.to_xml(asset)
-        with OSFS(asset_dir).open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'w') as asset_xml_file:
+        with asset_dir.open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'w') as asset_xml_file:
             lxml.etree.ElementTree(asset_root).write(asset_xml_file)
 
         # export the static assets
         policies_dir = export_fs.makeopendir('policies')
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                root_courselike_dir + '/static/',
-                root_courselike_dir + '/policies/assets.json',
-            )
+            self.export_static_assets(export_fs)
 
             # If we are using the default course image, export it to the
             # legacy location to support backwards compatibility.
@@ -235,10 +256,8 @@ class CourseExportManager(ExportManager):
                 except NotFoundError:
                     pass
                 else:
-                    output_dir = root_courselike_dir + '/static/images/'
-                    if not os.path.isdir(output_dir):
-                        os.makedirs(output_dir)
-                    with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
+                    output_dir = export_fs.makeopendir('static/images', recursive=True)
+                    with output_dir.open('course_image.jpg', 'wb') as course_image_file:
                         course_image_file.write(course_image.data)
 
         # export the static tabs
@@ -318,11 +337,7 @@ class LibraryExportManager(ExportManager):
         export_fs.makeopendir('policies')
 
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
-                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
-            )
+            self.export_static_assets(export_fs)
 
     def post_process(self, root, export_fs):
         """
@@ -351,6 +366,99 @@ def export_library_to_xml(modulestore, contentstore, library_key, root_dir, libr
     LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir).export()
 
 
+def export_course_to_tarball(modulestore, contentstore, course_key, course_dir):
+    """
+    Export the course as xml, and return an iterator over the chunks of a tar.gz file of the export,
+    with the course in its `course_dir` directory. See _export_to_tarball for details.
+    """
+    return _export_to_tarball(CourseExportManager, modulestore, contentstore, course_key, course_dir)
+
+
+def export_library_to_tarball(modulestore, contentstore, library_key, library_dir):
+    """
+    Export the library as xml, and return an iterator over the chunks of a tar.gz file of the export,
+    with the library in its `library_dir` directory. See _export_to_tarball for details.
+    """
+    return _export_to_tarball(LibraryExportManager, modulestore, contentstore, library_key, library_dir)
+
+
+def _export_to_tarball(manager_class, modulestore, contentstore, courselike_key, target_dir):
+    """
+    Export the courselike with an export manager of the given class, and return an iterator over the
+    chunks of a tar.gz file of the export, without writing the export to disk.
+
+    The xml is exported into memory before returning, so that any error exporting it is raised here,
+    while the static assets' files, which make up the bulk of an export, are read from the contentstore
+    and compressed as the chunks are consumed.
+    """
+    root_fs = MemoryFS()
+    manager = manager_class(modulestore, contentstore, courselike_key, None, target_dir, root_fs=root_fs)
+    manager.export()
+    return (chunk for chunk in _iter_tarball(root_fs, target_dir, manager.static_assets) if chunk)
+
+
+class _ChunkBuffer(object):
+    """
+    File-like object that collects the data written to it until it's taken.
+    """
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        """
+        Collect the given data.
+        """
+        self._chunks.append(data)
+
+    def take(self):
+        """
+        Return the data written since the last call, and forget it.
+        """
+        data = ''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _iter_tarball(root_fs, target_dir, static_assets):
+    """
+    Yield the chunks of a tar.gz file of the static assets' files, in the 'static' directory of
+    `target_dir`, followed by the files of `root_fs`.
+    """
+    output = _ChunkBuffer()
+    mtime = time.time()
+
+    # The tar file is written as a stream, so that each chunk is compressed as it's added.
+    tar_file = tarfile.open(fileobj=output, mode='w|gz', encoding='utf-8')
+    for path, content in static_assets:
+        info = tarfile.TarInfo(target_dir + '/static/' + path)
+        info.size = content.length
+        info.mtime = mtime
+        # TarFile.addfile needs a file with all of the data, so the asset's data is written to the tar
+        # file's stream directly after the member's header, and padded to a whole number of blocks.
+        tar_file.addfile(info)
+        for data in content.stream_data():
+            tar_file.fileobj.write(data)
+            yield output.take()
+        blocks, remainder = divmod(info.size, tarfile.BLOCKSIZE)
+        if remainder:
+            tar_file.fileobj.write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+            blocks += 1
+        tar_file.offset += blocks * tarfile.BLOCKSIZE
+
+    # The files of `root_fs` come last, so that they replace any static asset of the same name, like
+    # the legacy course image, as they do when the export is written to disk.
+    for path in root_fs.walkfiles():
+        data = root_fs.getcontents(path)
+        info = tarfile.TarInfo(path.lstrip('/'))
+        info.size = len(data)
+        info.mtime = mtime
+        tar_file.addfile(info, StringIO(data))
+        yield output.take()
+
+    tar_file.close()
+    yield output.take()
+
+
 def adapt_references(subtree, destination_course_key, export_fs):
     """
     Map every reference in the subtree into destination_course_key and set it back into the xblock fields
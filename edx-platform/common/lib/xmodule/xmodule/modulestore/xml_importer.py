@@ -28,6 +28,10 @@ import mimetypes
 from path import Path as path
 import json
 import re
+import sys
+from Queue import Queue
+from threading import Thread
+import six
 from lxml import etree
 
 from xmodule.library_tools import LibraryToolsService
@@ -57,8 +61,13 @@ log = logging.getLogger(__name__)
 
 def import_static_content(
         course_data_path, static_content_store,
-        target_id, subpath='static', verbose=False):
-
+        target_id, subpath='static', verbose=False, num_threads=1):
+    """
+    Imports the static files found under the `subpath` directory of the
+    course into `static_content_store`, saving them from `num_threads`
+    threads, and returns a dict mapping their paths under the directory to
+    their asset keys.
+    """
     remap_dict = {}
 
     # now import all static assets
@@ -77,75 +86,145 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
-    for dirname, _, filenames in os.walk(static_dir):
-        for filename in filenames:
+    def import_static_file(content_path, filename):
+        """
+        Saves the static file at `content_path` into the content store,
+        and returns its path under the static directory along with its
+        asset key, or None if the file is skipped.
+        """
+        if verbose:
+            log.debug('importing static content %s...', content_path)
 
-            content_path = os.path.join(dirname, filename)
+        try:
+            with open(content_path, 'rb') as f:
+                data = f.read()
+        except IOError:
+            if filename.startswith('._'):
+                # OS X "companion files". See
+                # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                return None
+            # Not a 'hidden file', then re-raise exception
+            raise
+
+        # strip away leading path from the name
+        fullname_with_subpath = content_path.replace(static_dir, '')
+        if fullname_with_subpath.startswith('/'):
+            fullname_with_subpath = fullname_with_subpath[1:]
+        asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+
+        policy_ele = policy.get(asset_key.path, {})
+
+        # During export display name is used to create files, strip away slashes from name
+        displayname = escape_invalid_characters(
+            name=policy_ele.get('displayname', filename),
+            invalid_char_list=['/', '\\']
+        )
+        locked = policy_ele.get('locked', False)
+        mime_type = policy_ele.get('contentType')
+
+        # Check extracted contentType in list of all valid mimetypes
+        if not mime_type or mime_type not in mimetypes_list:
+            mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
+        content = StaticContent(
+            asset_key, displayname, mime_type, data,
+            import_path=fullname_with_subpath, locked=locked
+        )
 
-            if re.match(ASSET_IGNORE_REGEX, filename):
-                if verbose:
-                    log.debug('skipping static content %s...', content_path)
-                continue
+        # first let's save a thumbnail so we can get back a thumbnail location
+        thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
 
-            if verbose:
-                log.debug('importing static content %s...', content_path)
+        if thumbnail_content is not None:
+            content.thumbnail_location = thumbnail_location
 
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
-                    continue
-                # Not a 'hidden file', then re-raise exception
-                raise
+        # then commit the content
+        try:
+            static_content_store.save(content)
+        except Exception as err:
+            log.exception(u'Error importing {0}, error={1}'.format(
+                fullname_with_subpath, err
+            ))
 
-            # strip away leading path from the name
-            fullname_with_subpath = content_path.replace(static_dir, '')
-            if fullname_with_subpath.startswith('/'):
-                fullname_with_subpath = fullname_with_subpath[1:]
-            asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+        return fullname_with_subpath, asset_key
 
-            policy_ele = policy.get(asset_key.path, {})
+    def static_files():
+        """
+        Yields the path and name of each static file that isn't ignored.
+        """
+        for dirname, _, filenames in os.walk(static_dir):
+            for filename in filenames:
 
-            # During export display name is used to create files, strip away slashes from name
-            displayname = escape_invalid_characters(
-                name=policy_ele.get('displayname', filename),
-                invalid_char_list=['/', '\\']
-            )
-            locked = policy_ele.get('locked', False)
-            mime_type = policy_ele.get('contentType')
-
-            # Check extracted contentType in list of all valid mimetypes
-            if not mime_type or mime_type not in mimetypes_list:
-                mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
+                content_path = os.path.join(dirname, filename)
 
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+                if re.match(ASSET_IGNORE_REGEX, filename):
+                    if verbose:
+                        log.debug('skipping static content %s...', content_path)
+                    continue
 
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
+                yield content_path, filename
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
+    if num_threads > 1:
+        imported_files = _run_in_threads(import_static_file, static_files(), num_threads)
+    else:
+        imported_files = (import_static_file(content_path, filename) for content_path, filename in static_files())
 
+    for imported_file in imported_files:
+        if imported_file is not None:
             # store the remapping information which will be needed
             # to subsitute in the module data
+            fullname_with_subpath, asset_key = imported_file
             remap_dict[fullname_with_subpath] = asset_key
 
     return remap_dict
 
 
+def _run_in_threads(func, args_list, num_threads):
+    """
+    Calls `func` with each of the argument tuples of `args_list` from
+    `num_threads` threads, and returns the list of the results, in no
+    particular order.
+
+    The first exception raised by `func` stops the remaining calls, and is
+    raised again once all the threads have stopped.
+    """
+    # The queue is bounded so that the arguments are only generated as
+    # the threads are ready for them.
+    args_queue = Queue(num_threads)
+    results = []
+    errors = []
+
+    def work():
+        """
+        Calls `func` with the queued arguments until the queue is closed.
+        """
+        for args in iter(args_queue.get, None):
+            if errors:
+                continue
+            try:
+                results.append(func(*args))
+            except Exception:  # pylint: disable=broad-except
+                errors.append(sys.exc_info())
+
+    threads = [Thread(target=work) for __ in range(num_threads)]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    try:
+        for args in args_list:
+            if errors:
+                break
+            args_queue.put(args)
+    finally:
+        for __ in threads:
+            args_queue.put(None)
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        six.reraise(*errors[0])
+    return results
+
+
 class ImportManager(object):
     """
     Import xml-based courselikes from data_dir into modulestore.
@@ -177,6 +256,9 @@ class ImportManager(object):
         create_if_not_present: If True, then a new courselike is created if it doesn't already exist.
             Otherwise, it throws an InvalidLocationError if the courselike does not exist.
 
+        static_content_threads: the number of threads from which the courselike's static files
+            are saved into static_content_store.
+
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
     """
     store_class = XMLModuleStore
@@ -187,7 +269,7 @@ class ImportManager(object):
             load_error_modules=True, static_content_store=None,
             target_id=None, verbose=False,
             do_import_static=True, create_if_not_present=False,
-            raise_on_failure=False
+            raise_on_failure=False, static_content_threads=1
     ):
         self.store = store
         self.user_id = user_id
@@ -200,6 +282,7 @@ class ImportManager(object):
         self.do_import_static = do_import_static
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.static_content_threads = static_content_threads
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -228,7 +311,8 @@ class ImportManager(object):
             # first pass to find everything in /static/
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath='static', verbose=self.verbose
+                dest_id, subpath='static', verbose=self.verbose,
+                num_threads=self.static_content_threads,
             )
 
         elif self.verbose and not self.do_import_static:
@@ -251,7 +335,8 @@ class ImportManager(object):
         if os.path.exists(data_path / simport):
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath=simport, verbose=self.verbose
+                dest_id, subpath=simport, verbose=self.verbose,
+                num_threads=self.static_content_threads,
             )
 
     def import_asset_metadata(self, data_dir, course_id):
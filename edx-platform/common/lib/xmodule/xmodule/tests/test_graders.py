@@ -1,5 +1,6 @@
 """Grading tests"""
 import ddt
+import numpy
 import unittest
 
 from xmodule import graders
@@ -287,6 +288,62 @@ class GraderTest(unittest.TestCase):
         self.assertAlmostEqual(graded['percent'], 0.11)
         self.assertEqual(len(graded['section_breakdown']), 12 + 1)
 
+    def _format_scores(self, *grade_sheets):
+        """
+        Returns the format_scores for grade_many of the given grade sheets,
+        with a row for each grade sheet.
+        """
+        format_scores = {}
+        for section_format in self.test_gradesheet:
+            num_sections = max(len(grade_sheet.get(section_format, {})) for grade_sheet in grade_sheets)
+            earned = numpy.zeros((len(grade_sheets), num_sections))
+            possible = numpy.zeros((len(grade_sheets), num_sections))
+            for row, grade_sheet in enumerate(grade_sheets):
+                for column, section in enumerate(grade_sheet.get(section_format, {}).values()):
+                    earned[row, column] = section.graded_total.earned
+                    possible[row, column] = section.graded_total.possible
+            format_scores[section_format] = (earned, possible)
+        return format_scores
+
+    @ddt.data(
+        graders.AssignmentFormatGrader("Homework", 12, 2),
+        graders.AssignmentFormatGrader("Homework", 12, 0),
+        graders.AssignmentFormatGrader("Lab", 3, 2),
+        graders.AssignmentFormatGrader("Lab", 7, 3),
+        graders.AssignmentFormatGrader("Lab", 0, 10),
+        graders.AssignmentFormatGrader("Midterm", 1, 0),
+        graders.WeightedSubsectionsGrader([]),
+        graders.grader_from_conf([
+            {'type': "Homework", 'min_count': 12, 'drop_count': 2, 'weight': 0.25},
+            {'type': "Lab", 'min_count': 7, 'drop_count': 3, 'weight': 0.25},
+            {'type': "Midterm", 'min_count': 0, 'drop_count': 0, 'weight': 0.5},
+        ]),
+    )
+    def test_grade_many(self, grader):
+        self.assertTrue(grader.supports_grade_many)
+        grade_sheets = [self.test_gradesheet, self.empty_gradesheet, self.incomplete_gradesheet]
+        percents, grade_breakdown = grader.grade_many(len(grade_sheets), self._format_scores(*grade_sheets))
+
+        for row, grade_sheet in enumerate(grade_sheets):
+            graded = grader.grade(grade_sheet)
+            self.assertAlmostEqual(percents[row], graded['percent'])
+            self.assertEqual(grade_breakdown.keys(), graded.get('grade_breakdown', {}).keys())
+            for category, breakdown in graded.get('grade_breakdown', {}).iteritems():
+                self.assertAlmostEqual(grade_breakdown[category][row], breakdown['percent'])
+
+    def test_grade_many_not_implemented(self):
+        class SingleSheetGrader(graders.CourseGrader):
+            """
+            A grader that only implements grade.
+            """
+            def grade(self, grade_sheet, generate_random_scores=False):
+                return {'percent': 0.0, 'section_breakdown': [], 'grade_breakdown': {}}
+
+        weighted_grader = graders.WeightedSubsectionsGrader([(SingleSheetGrader(), 'Other', 1.0)])
+        self.assertFalse(weighted_grader.supports_grade_many)
+        with self.assertRaises(NotImplementedError):
+            weighted_grader.grade_many(1, {})
+
     @ddt.data(
         (
             # empty
@@ -39,3 +39,31 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+    def test_import_static_files_in_threads(self):
+        """
+        Test that the static files are all saved when they're saved from
+        several threads.
+        """
+        course_dir = DATA_DIR / "dot-underscore"
+        course_id = SlashSeparatedCourseKey("edX", "dot-underscore", "2014_Fall")
+        content_store = Mock()
+        content_store.generate_thumbnail.return_value = ("content", "location")
+        remap_dict = import_static_content(course_dir, content_store, course_id, num_threads=4)
+        saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
+        name_val = {sc.name: sc.data for sc in saved_static_content}
+        self.assertEqual(sorted(name_val), [".example.txt", "example.txt"])
+        self.assertEqual(sorted(remap_dict), [".example.txt", "example.txt"])
+        self.assertIn("GREEN", name_val["example.txt"])
+
+    def test_import_static_files_in_threads_error(self):
+        """
+        Test that an error raised while saving the static files from several
+        threads is raised again.
+        """
+        course_dir = DATA_DIR / "dot-underscore"
+        course_id = SlashSeparatedCourseKey("edX", "dot-underscore", "2014_Fall")
+        content_store = Mock()
+        content_store.generate_thumbnail.side_effect = ValueError
+        with self.assertRaises(ValueError):
+            import_static_content(course_dir, content_store, course_id, num_threads=4)
@@ -2,6 +2,8 @@
 Models for bulk email
 """
 import logging
+import re
+
 import markupsafe
 
 from django.contrib.auth.models import User
@@ -318,6 +320,12 @@ class Optout(models.Model):
 # the location where the email message body is to be inserted.
 COURSE_EMAIL_MESSAGE_BODY_TAG = '{{message_body}}'
 
+# Matches the template fields that are filled in with the recipient's data.
+RECIPIENT_FIELDS_RE = re.compile(r'\{(?:name|email|user_id)\W')
+
+# %%-encoded keywords that are substituted with the recipient's data.
+RECIPIENT_KEYWORDS = ('%%USER_ID%%', '%%USER_FULLNAME%%')
+
 
 class CourseEmailTemplate(models.Model):
     """
@@ -349,7 +357,7 @@ class CourseEmailTemplate(models.Model):
             raise
 
     @staticmethod
-    def _render(format_string, message_body, context):
+    def _render(format_string, message_body, context, wrap_cache=None):
         """
         Create a text message using a template, message body and context.
 
@@ -364,6 +372,10 @@ class CourseEmailTemplate(models.Model):
         Output is returned as a unicode string.  It is not encoded as utf-8.
         Such encoding is left to the email code, which will use the value
         of settings.DEFAULT_CHARSET to encode the message.
+
+        A dict may be passed as `wrap_cache` when rendering the same message
+        for many recipients, so that the lines which don't differ between
+        them are only wrapped once.
         """
 
         # Substitute all %%-encoded keywords in the message body
@@ -379,18 +391,18 @@ class CourseEmailTemplate(models.Model):
         result = result.replace(message_body_tag, message_body, 1)
 
         # finally, return the result, after wrapping long lines and without converting to an encoded byte array.
-        return wrap_message(result)
+        return wrap_message(result, cache=wrap_cache)
 
-    def render_plaintext(self, plaintext, context):
+    def render_plaintext(self, plaintext, context, wrap_cache=None):
         """
         Create plain text message.
 
         Convert plain text body (`plaintext`) into plaintext email message using the
         stored plain template and the provided `context` dict.
         """
-        return CourseEmailTemplate._render(self.plain_template, plaintext, context)
+        return CourseEmailTemplate._render(self.plain_template, plaintext, context, wrap_cache)
 
-    def render_htmltext(self, htmltext, context):
+    def render_htmltext(self, htmltext, context, wrap_cache=None):
         """
         Create HTML text message.
 
@@ -401,7 +413,18 @@ class CourseEmailTemplate(models.Model):
         for key, value in context.iteritems():
             if isinstance(value, basestring):
                 context[key] = markupsafe.escape(value)
-        return CourseEmailTemplate._render(self.html_template, htmltext, context)
+        return CourseEmailTemplate._render(self.html_template, htmltext, context, wrap_cache)
+
+    def is_personalized(self, plaintext, htmltext):
+        """
+        Returns whether the messages rendered from this template with the
+        given plain text and HTML bodies differ between recipients, i.e.
+        whether they include any of the recipient's data.
+        """
+        templates = (self.plain_template or '', self.html_template or '')
+        if any(RECIPIENT_FIELDS_RE.search(template) for template in templates):
+            return True
+        return any(keyword in (body or '') for keyword in RECIPIENT_KEYWORDS for body in (plaintext, htmltext))
 
 
 class CourseAuthorization(models.Model):
@@ -6,8 +6,10 @@ to a course.
 from collections import Counter
 import json
 import logging
+from Queue import Queue
 import random
 import re
+from threading import Event, Lock, Thread
 from time import sleep
 
 import dogstats_wrapper as dog_stats_api
@@ -92,6 +94,11 @@ BULK_EMAIL_FAILURE_ERRORS = (
     SMTPException,
 )
 
+# Maximum number of wrapped lines kept while rendering the messages of a
+# subtask.  Personalized messages add lines for each recipient, so the
+# cache is cleared once it holds this many lines.
+WRAP_CACHE_MAX_LINES = 10000
+
 
 def _get_course_email_context(course):
     """
@@ -340,13 +347,13 @@ def _filter_optouts_from_recipients(to_list, course_id):
     optouts = Optout.objects.filter(
         course_id=course_id,
         user__in=[i['pk'] for i in to_list]
-    ).values_list('user__email', flat=True)
+    ).values_list('user_id', flat=True)
     optouts = set(optouts)
     # Only count the num_optout for the first time the optouts are calculated.
     # We assume that the number will not change on retries, and so we don't need
     # to calculate it each time.
     num_optout = len(optouts)
-    to_list = [recipient for recipient in to_list if recipient['email'] not in optouts]
+    to_list = [recipient for recipient in to_list if recipient['pk'] not in optouts]
     return to_list, num_optout
 
 
@@ -408,6 +415,297 @@ def _get_source_address(course_id, course_title, truncate=True):
     return from_addr
 
 
+class _CourseEmailSender(object):
+    """
+    Sends a course email to a list of recipients, tracking the progress in
+    a SubtaskStatus.
+
+    Messages are rendered in the calling thread, and sent either from the
+    calling thread or from a pool of threads that each hold their own
+    connection to the email backend.  The parts of the messages that don't
+    differ between recipients are only rendered once.
+    """
+    def __init__(self, course_email, course_email_template, from_addr, global_email_context, subtask_status,
+                 parent_task_id, total_recipients):
+        self.course_email = course_email
+        self.course_email_template = course_email_template
+        self.from_addr = from_addr
+        self.subtask_status = subtask_status
+        self.parent_task_id = parent_task_id
+        self.total_recipients = total_recipients
+        self.course_title = global_email_context['course_title']
+
+        # Define context values to use in all course emails:
+        self.email_context = {'name': '', 'email': ''}
+        self.email_context.update(global_email_context)
+
+        # The rendered (plaintext, html) messages, if they're the same for
+        # all recipients, and the lines wrapped so far otherwise.
+        self._rendered_messages = None
+        self._personalized = course_email_template.is_personalized(
+            course_email.text_message, course_email.html_message,
+        )
+        self._wrap_cache = {}
+
+        self.total_recipients_successful = 0
+        self.total_recipients_failed = 0
+        self.recipients_info = Counter()
+
+        # Guards the counters and the subtask status, which are updated
+        # from all the sending threads.
+        self._lock = Lock()
+
+        # Set once an error requires the task to be retried or failed, after
+        # which the remaining recipients are left on the to_list.
+        self._stop = Event()
+        self._exception = None
+
+    def send(self, to_list, num_threads=1):
+        """
+        Sends the email to the recipients in the to_list, from the end of
+        the list, using the given number of threads.  A single thread is
+        used if the task has been retried for rate-limiting reasons, so
+        that the delay between sends applies to the whole task.
+
+        Recipients are removed from the to_list once they have been
+        processed, so that if an error that requires the task to be retried
+        or failed is encountered, the to_list holds the recipients remaining
+        to be emailed.  That error is then raised.
+        """
+        recipients = list(reversed(to_list))
+        processed = set()
+        try:
+            messages = self._create_messages(recipients)
+            num_threads = min(num_threads, len(recipients))
+            if self.subtask_status.retried_nomax > 0:
+                num_threads = 1
+            if num_threads > 1:
+                self._send_in_threads(messages, processed, num_threads)
+            else:
+                self._send_with_new_connection(messages, processed)
+        finally:
+            remaining = [recipient for index, recipient in enumerate(recipients) if index not in processed]
+            to_list[:] = reversed(remaining)
+        if self._exception is not None:
+            raise self._exception  # pylint: disable=raising-bad-type
+
+    def _create_messages(self, recipients):
+        """
+        Yields a (recipient number, recipient, EmailMultiAlternatives) tuple
+        for each of the given recipients, stopping if an error was raised.
+        """
+        for recipient_num, current_recipient in enumerate(recipients, 1):
+            if self._stop.is_set():
+                return
+            plaintext_msg, html_msg = self._render(current_recipient)
+            email_msg = EmailMultiAlternatives(
+                self.course_email.subject,
+                plaintext_msg,
+                self.from_addr,
+                [current_recipient['email']],
+            )
+            email_msg.attach_alternative(html_msg, 'text/html')
+            yield recipient_num, current_recipient, email_msg
+
+    def _render(self, current_recipient):
+        """
+        Returns the plaintext and HTML messages for the given recipient.
+        """
+        if self._rendered_messages is not None:
+            return self._rendered_messages
+
+        # Update context with user-specific values from the recipient.
+        email_context = self.email_context
+        email_context['email'] = current_recipient['email']
+        email_context['name'] = current_recipient['profile__name']
+        email_context['user_id'] = current_recipient['pk']
+        email_context['course_id'] = self.course_email.course_id
+
+        # Construct message content using templates and context:
+        if len(self._wrap_cache) > WRAP_CACHE_MAX_LINES:
+            self._wrap_cache.clear()
+        plaintext_msg = self.course_email_template.render_plaintext(
+            self.course_email.text_message, email_context, self._wrap_cache,
+        )
+        html_msg = self.course_email_template.render_htmltext(
+            self.course_email.html_message, email_context, self._wrap_cache,
+        )
+        if not self._personalized:
+            self._rendered_messages = (plaintext_msg, html_msg)
+        return plaintext_msg, html_msg
+
+    def _send_in_threads(self, messages, processed, num_threads):
+        """
+        Sends the given messages from a pool of threads, each sending over
+        its own connection, while the messages are rendered in this thread.
+        """
+        message_queue = Queue(maxsize=2 * num_threads)
+        threads = [
+            Thread(target=self._send_with_new_connection, args=(iter(message_queue.get, None), processed))
+            for __ in range(num_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for message in messages:
+                message_queue.put(message)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._fail(exc)
+        finally:
+            for __ in threads:
+                message_queue.put(None)
+            for thread in threads:
+                thread.join()
+
+    def _send_with_new_connection(self, messages, processed):
+        """
+        Opens a connection to the email backend and sends the given
+        messages over it.  Errors that require the task to be retried or
+        failed stop the sending of all messages.
+
+        The messages are always consumed entirely, so that the threads
+        feeding them never block.
+        """
+        connection = None
+        try:
+            connection = get_connection()
+            connection.open()
+            for recipient_num, current_recipient, email_msg in messages:
+                if self._stop.is_set():
+                    continue
+                email_msg.connection = connection
+                self._send_message(connection, recipient_num, current_recipient, email_msg)
+                with self._lock:
+                    # Only mark the user as processed once they have been emailed.
+                    # (That way, if there were a failure that needed to be retried,
+                    # the user is still on the list.)
+                    self.recipients_info[current_recipient['email']] += 1
+                    processed.add(recipient_num - 1)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._fail(exc)
+            for __ in messages:
+                pass
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def _fail(self, exc):
+        """
+        Records the first error that requires the task to be retried or
+        failed, and stops the sending of all messages.
+        """
+        with self._lock:
+            if self._exception is None:
+                self._exception = exc
+        self._stop.set()
+
+    def _send_message(self, connection, recipient_num, current_recipient, email_msg):
+        """
+        Sends the given message to the given recipient.
+
+        Errors that are specific to the recipient are counted as failures.
+        Other errors are raised.
+        """
+        email = current_recipient['email']
+        email_id = self.course_email.id
+        task_id = self.subtask_status.task_id
+
+        # Throttle if we have gotten the rate limiter.  This is not very high-tech,
+        # but if a task has been retried for rate-limiting reasons, then we sleep
+        # for a period of time between all emails within this task.  Choice of
+        # the value depends on the number of workers that might be sending email in
+        # parallel, and what the SES throttle rate is.
+        if self.subtask_status.retried_nomax > 0:
+            sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+
+        try:
+            log.info(
+                "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
+                Recipient name: %s, Email address: %s",
+                self.parent_task_id,
+                task_id,
+                email_id,
+                recipient_num,
+                self.total_recipients,
+                current_recipient['profile__name'],
+                email
+            )
+            with dog_stats_api.timer('course_email.single_send.time.overall', tags=[_statsd_tag(self.course_title)]):
+                connection.send_messages([email_msg])
+
+        except SMTPDataError as exc:
+            # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
+            with self._lock:
+                self.total_recipients_failed += 1
+            log.error(
+                "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
+                Recipient num: %s/%s, Email address: %s",
+                self.parent_task_id,
+                task_id,
+                email_id,
+                recipient_num,
+                self.total_recipients,
+                email
+            )
+            if exc.smtp_code >= 400 and exc.smtp_code < 500:
+                # This will cause the outer handler to catch the exception and retry the entire task.
+                raise exc
+            else:
+                # This will fall through and not retry the message.
+                log.warning(
+                    'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
+                    Email not delivered to %s due to error %s',
+                    self.parent_task_id,
+                    task_id,
+                    email_id,
+                    recipient_num,
+                    self.total_recipients,
+                    email,
+                    exc.smtp_error
+                )
+                dog_stats_api.increment('course_email.error', tags=[_statsd_tag(self.course_title)])
+                with self._lock:
+                    self.subtask_status.increment(failed=1)
+
+        except SINGLE_EMAIL_FAILURE_ERRORS as exc:
+            # This will fall through and not retry the message.
+            log.error(
+                "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
+                EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
+                self.parent_task_id,
+                task_id,
+                email_id,
+                recipient_num,
+                self.total_recipients,
+                email,
+                exc
+            )
+            dog_stats_api.increment('course_email.error', tags=[_statsd_tag(self.course_title)])
+            with self._lock:
+                self.total_recipients_failed += 1
+                self.subtask_status.increment(failed=1)
+
+        else:
+            log.info(
+                "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
+                Recipient num: %s/%s, Email address: %s,",
+                self.parent_task_id,
+                task_id,
+                email_id,
+                recipient_num,
+                self.total_recipients,
+                email
+            )
+            dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(self.course_title)])
+            if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+                log.info('Email with id %s sent to %s', email_id, email)
+            else:
+                log.debug('Email with id %s sent to %s', email_id, email)
+            with self._lock:
+                self.total_recipients_successful += 1
+                self.subtask_status.increment(succeeded=1)
+
+
 def _send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status):
     """
     Performs the email sending task.
@@ -440,10 +738,6 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
     parent_task_id = InstructorTask.objects.get(pk=entry_id).task_id
     task_id = subtask_status.task_id
     total_recipients = len(to_list)
-    recipient_num = 0
-    total_recipients_successful = 0
-    total_recipients_failed = 0
-    recipients_info = Counter()
 
     log.info(
         "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, TotalRecipients: %s",
@@ -482,138 +776,12 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+    sender = _CourseEmailSender(
+        course_email, course_email_template, from_addr, global_email_context, subtask_status,
+        parent_task_id, total_recipients,
+    )
     try:
-        connection = get_connection()
-        connection.open()
-
-        # Define context values to use in all course emails:
-        email_context = {'name': '', 'email': ''}
-        email_context.update(global_email_context)
-
-        while to_list:
-            # Update context with user-specific values from the user at the end of the list.
-            # At the end of processing this user, they will be popped off of the to_list.
-            # That way, the to_list will always contain the recipients remaining to be emailed.
-            # This is convenient for retries, which will need to send to those who haven't
-            # yet been emailed, but not send to those who have already been sent to.
-            recipient_num += 1
-            current_recipient = to_list[-1]
-            email = current_recipient['email']
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
-
-            # Create email:
-            email_msg = EmailMultiAlternatives(
-                course_email.subject,
-                plaintext_msg,
-                from_addr,
-                [email],
-                connection=connection
-            )
-            email_msg.attach_alternative(html_msg, 'text/html')
-
-            # Throttle if we have gotten the rate limiter.  This is not very high-tech,
-            # but if a task has been retried for rate-limiting reasons, then we sleep
-            # for a period of time between all emails within this task.  Choice of
-            # the value depends on the number of workers that might be sending email in
-            # parallel, and what the SES throttle rate is.
-            if subtask_status.retried_nomax > 0:
-                sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
-
-            try:
-                log.info(
-                    "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
-                    Recipient name: %s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    current_recipient['profile__name'],
-                    email
-                )
-                with dog_stats_api.timer('course_email.single_send.time.overall', tags=[_statsd_tag(course_title)]):
-                    connection.send_messages([email_msg])
-
-            except SMTPDataError as exc:
-                # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                if exc.smtp_code >= 400 and exc.smtp_code < 500:
-                    # This will cause the outer handler to catch the exception and retry the entire task.
-                    raise exc
-                else:
-                    # This will fall through and not retry the message.
-                    log.warning(
-                        'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
-                        Email not delivered to %s due to error %s',
-                        parent_task_id,
-                        task_id,
-                        email_id,
-                        recipient_num,
-                        total_recipients,
-                        email,
-                        exc.smtp_error
-                    )
-                    dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
-                    subtask_status.increment(failed=1)
-
-            except SINGLE_EMAIL_FAILURE_ERRORS as exc:
-                # This will fall through and not retry the message.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
-                    EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email,
-                    exc
-                )
-                dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
-                subtask_status.increment(failed=1)
-
-            else:
-                total_recipients_successful += 1
-                log.info(
-                    "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s,",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
-                if settings.BULK_EMAIL_LOG_SENT_EMAILS:
-                    log.info('Email with id %s sent to %s', email_id, email)
-                else:
-                    log.debug('Email with id %s sent to %s', email_id, email)
-                subtask_status.increment(succeeded=1)
-
-            # Pop the user that was emailed off the end of the list only once they have
-            # successfully been processed.  (That way, if there were a failure that
-            # needed to be retried, the user is still on the list.)
-            recipients_info[email] += 1
-            to_list.pop()
+        sender.send(to_list, settings.BULK_EMAIL_SEND_THREADS)
 
         log.info(
             "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Total Successful Recipients: %s/%s, \
@@ -621,13 +789,13 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             parent_task_id,
             task_id,
             email_id,
-            total_recipients_successful,
+            sender.total_recipients_successful,
             total_recipients,
-            total_recipients_failed,
+            sender.total_recipients_failed,
             total_recipients
         )
         duplicate_recipients = ["{0} ({1})".format(email, repetition)
-                                for email, repetition in recipients_info.most_common() if repetition > 1]
+                                for email, repetition in sender.recipients_info.most_common() if repetition > 1]
         if duplicate_recipients:
             log.info(
                 "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Total Duplicate Recipients [%s]: [%s]",
@@ -692,9 +860,6 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         subtask_status.increment(state=SUCCESS)
         # Successful completion is marked by an exception value of None.
         return subtask_status, None
-    finally:
-        # Clean up at the end.
-        connection.close()
 
 
 def _get_current_task():
@@ -207,6 +207,29 @@ class CourseEmailTemplateTest(TestCase):
         self.assertIn(context['course_title'], message)
         self.assertIn(context['name'], message)
 
+    def test_render_with_wrap_cache(self):
+        template = CourseEmailTemplate.get_template()
+        wrap_cache = {}
+        context = self._get_sample_plain_context()
+        message = template.render_plaintext("My new plain text.", context, wrap_cache)
+        self.assertTrue(wrap_cache)
+        self.assertEqual(template.render_plaintext("My new plain text.", context, wrap_cache), message)
+        self.assertEqual(template.render_plaintext("My new plain text.", context), message)
+
+    def test_is_personalized(self):
+        template = CourseEmailTemplate(
+            plain_template=u"{course_title}\n{{message_body}}",
+            html_template=u"{{message_body}}",
+        )
+        self.assertFalse(template.is_personalized("Plain text.", "<p>HTML text in %%COURSE_DISPLAY_NAME%%.</p>"))
+        self.assertTrue(template.is_personalized("Plain text.", "<p>Dear %%USER_FULLNAME%%,</p>"))
+        self.assertTrue(template.is_personalized("Your id is %%USER_ID%%.", "<p>HTML text.</p>"))
+
+        template.html_template = u"<p>Sent to {email}</p>{{message_body}}"
+        self.assertTrue(template.is_personalized("Plain text.", "<p>HTML text.</p>"))
+        # The default template includes the recipient's email address.
+        self.assertTrue(CourseEmailTemplate.get_template().is_personalized("Plain text.", "<p>HTML text.</p>"))
+
 
 @attr(shard=1)
 class CourseAuthorizationTest(TestCase):
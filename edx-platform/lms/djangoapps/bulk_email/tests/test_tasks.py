@@ -29,11 +29,12 @@ from celery.states import SUCCESS, FAILURE  # pylint: disable=no-name-in-module,
 
 from django.conf import settings
 from django.core.management import call_command
+from django.test.utils import override_settings
 
 from xmodule.modulestore.tests.factories import CourseFactory
 
 from bulk_email.models import CourseEmail, Optout, SEND_TO_MYSELF, SEND_TO_STAFF, SEND_TO_LEARNERS
-from bulk_email.tasks import _get_course_email_context
+from bulk_email.tasks import _get_course_email_context, _CourseEmailSender
 
 from lms.djangoapps.instructor_task.tasks import send_bulk_course_email
 from lms.djangoapps.instructor_task.subtasks import update_subtask_status, SubtaskStatus
@@ -423,6 +424,53 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
     def test_failure_on_ses_domain_not_confirmed(self):
         self._test_immediate_failure(SESDomainNotConfirmedError(403, "You're out of bounds!"))
 
+    @override_settings(BULK_EMAIL_SEND_THREADS=4)
+    def test_successful_in_threads(self):
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([None])
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+            # Each thread sends over its own connection.
+            self.assertEquals(get_conn.call_count, 4)
+            self.assertEquals(get_conn.return_value.send_messages.call_count, num_emails)
+
+    @override_settings(BULK_EMAIL_SEND_THREADS=4)
+    def test_email_address_failures_in_threads(self):
+        self._test_email_address_failures(SMTPDataError(554, "Email address is blacklisted"))
+
+    @override_settings(BULK_EMAIL_SEND_THREADS=4)
+    def test_immediate_failure_in_threads(self):
+        self._test_immediate_failure(SESDailyQuotaExceededError(403, "You're done for the day!"))
+
+    def test_single_thread_after_throttling_retry(self):
+        # Once throttled, the delay between sends must apply to the whole task,
+        # so all the emails are sent from a single thread over a single connection.
+        template = Mock()
+        template.is_personalized.return_value = False
+        template.render_plaintext.return_value = u'text'
+        template.render_htmltext.return_value = u'<p>text</p>'
+        subtask_status = SubtaskStatus.create('subtask-id', retried_nomax=1)
+        sender = _CourseEmailSender(
+            Mock(subject=u'subject'), template, 'from@example.com', {'course_title': u'title'},
+            subtask_status, 'task-id', 3,
+        )
+        to_list = [
+            {'pk': index, 'email': u'student{}@example.com'.format(index), 'profile__name': u'Student'}
+            for index in range(3)
+        ]
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            with patch('bulk_email.tasks.sleep') as mock_sleep:
+                with patch.object(sender, '_send_in_threads') as mock_send_in_threads:
+                    sender.send(to_list, num_threads=4)
+        self.assertFalse(mock_send_in_threads.called)
+        self.assertEquals(get_conn.call_count, 1)
+        self.assertEquals(get_conn.return_value.send_messages.call_count, 3)
+        self.assertEquals(mock_sleep.call_count, 3)
+        self.assertEquals(subtask_status.succeeded, 3)
+        self.assertEquals(to_list, [])
+
     def test_bulk_emails_with_unicode_course_image_name(self):
         # Test bulk email with unicode characters in course image name
         course_image = u'在淡水測試.jpg'
@@ -52,6 +52,7 @@ import uuid
 import os
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
 from django.db.models import Count
@@ -72,6 +73,9 @@ from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, NoneTo
 
 LOGGER = logging.getLogger(__name__)
 
+# Cache key of the list of a student's generated certificates, formatted with the student's id.
+STUDENT_CERTIFICATES_CACHE_KEY = 'certificates.generated_certificates.{}'
+
 
 class CertificateStatuses(object):
     """
@@ -500,37 +504,113 @@ def certificate_status_for_student(student, course_id):
     If the student has been graded, the dictionary also contains their
     grade for the course with the key "grade".
     '''
+    try:
+        generated_certificate = GeneratedCertificate.objects.get(  # pylint: disable=no-member
+            user=student, course_id=course_id)
+    except GeneratedCertificate.DoesNotExist:
+        generated_certificate = None
+    return certificate_status(generated_certificate)
+
+
+def certificate_statuses_for_student(student, course_ids):
+    """
+    Returns a dictionary mapping each of the given course ids to the student's
+    certificate status in the course, as returned by certificate_status_for_student,
+    using a fixed number of queries for all of the courses.
+
+    The student's generated certificates are cached for
+    settings.STUDENT_CERTIFICATES_CACHE_TIMEOUT seconds, until one of them changes.
+    """
     # Import here instead of top of file since this module gets imported before
     # the course_modes app is loaded, resulting in a Django deprecation warning.
     from course_modes.models import CourseMode
 
-    try:
-        generated_certificate = GeneratedCertificate.objects.get(  # pylint: disable=no-member
-            user=student, course_id=course_id)
-        cert_status = {
-            'status': generated_certificate.status,
-            'mode': generated_certificate.mode,
-            'uuid': generated_certificate.verify_uuid,
-        }
-        if generated_certificate.grade:
-            cert_status['grade'] = generated_certificate.grade
+    generated_certificates = {
+        generated_certificate.course_id: generated_certificate
+        for generated_certificate in _generated_certificates_for_student(student)
+    }
 
-        if generated_certificate.mode == 'audit':
-            course_mode_slugs = [mode.slug for mode in CourseMode.modes_for_course(course_id)]
-            # Short term fix to make sure old audit users with certs still see their certs
-            # only do this if there if no honor mode
-            if 'honor' not in course_mode_slugs:
-                cert_status['status'] = CertificateStatuses.auditing
-                return cert_status
+    audit_course_ids = [
+        course_id for course_id in course_ids
+        if course_id in generated_certificates and generated_certificates[course_id].mode == 'audit'
+    ]
+    unexpired_modes = {}
+    if audit_course_ids:
+        __, unexpired_modes = CourseMode.all_and_unexpired_modes_for_courses(audit_course_ids)
+
+    return {
+        course_id: certificate_status(
+            generated_certificates.get(course_id),
+            course_mode_slugs=[mode.slug for mode in unexpired_modes.get(course_id, [])],
+        )
+        for course_id in course_ids
+    }
 
-        if generated_certificate.status == CertificateStatuses.downloadable:
-            cert_status['download_url'] = generated_certificate.download_url
 
-        return cert_status
+def certificate_status(generated_certificate, course_mode_slugs=None):
+    """
+    Returns the status of the given generated certificate, or of a student
+    without a certificate if it's None, as described in certificate_status_for_student.
 
-    except GeneratedCertificate.DoesNotExist:
-        pass
-    return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor, 'uuid': None}
+    The slugs of the course's unexpired modes are only needed for audit
+    certificates, and are loaded if they're not given.
+    """
+    # Import here instead of top of file since this module gets imported before
+    # the course_modes app is loaded, resulting in a Django deprecation warning.
+    from course_modes.models import CourseMode
+
+    if generated_certificate is None:
+        return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor, 'uuid': None}
+
+    cert_status = {
+        'status': generated_certificate.status,
+        'mode': generated_certificate.mode,
+        'uuid': generated_certificate.verify_uuid,
+    }
+    if generated_certificate.grade:
+        cert_status['grade'] = generated_certificate.grade
+
+    if generated_certificate.mode == 'audit':
+        if course_mode_slugs is None:
+            course_mode_slugs = [
+                mode.slug for mode in CourseMode.modes_for_course(generated_certificate.course_id)
+            ]
+        # Short term fix to make sure old audit users with certs still see their certs
+        # only do this if there if no honor mode
+        if 'honor' not in course_mode_slugs:
+            cert_status['status'] = CertificateStatuses.auditing
+            return cert_status
+
+    if generated_certificate.status == CertificateStatuses.downloadable:
+        cert_status['download_url'] = generated_certificate.download_url
+
+    return cert_status
+
+
+def _generated_certificates_for_student(student):
+    """
+    Returns the list of all of the student's generated certificates, from the
+    cache if settings.STUDENT_CERTIFICATES_CACHE_TIMEOUT enables it.
+    """
+    timeout = settings.STUDENT_CERTIFICATES_CACHE_TIMEOUT
+    if not timeout:
+        return list(GeneratedCertificate.objects.filter(user=student))  # pylint: disable=no-member
+
+    cache_key = STUDENT_CERTIFICATES_CACHE_KEY.format(student.id)
+    generated_certificates = cache.get(cache_key)
+    if generated_certificates is None:
+        generated_certificates = list(GeneratedCertificate.objects.filter(user=student))  # pylint: disable=no-member
+        cache.set(cache_key, generated_certificates, timeout)
+    return generated_certificates
+
+
+@receiver(models.signals.post_save, sender=GeneratedCertificate)
+@receiver(models.signals.post_delete, sender=GeneratedCertificate)
+def invalidate_student_certificates_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the cached certificates of the student of a certificate that changed.
+    """
+    cache.delete(STUDENT_CERTIFICATES_CACHE_KEY.format(instance.user_id))
 
 
 def certificate_info_for_user(user, course_id, grade, user_is_whitelisted=None):
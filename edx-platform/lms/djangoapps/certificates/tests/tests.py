@@ -4,6 +4,8 @@ Tests for the certificates models.
 from ddt import ddt, data, unpack
 from mock import patch
 from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.test.utils import override_settings
 from nose.plugins.attrib import attr
 
 from badges.tests.factories import CourseCompleteImageConfigurationFactory
@@ -15,6 +17,7 @@ from certificates.models import (
     CertificateStatuses,
     GeneratedCertificate,
     certificate_status_for_student,
+    certificate_statuses_for_student,
     certificate_info_for_user
 )
 from certificates.tests.factories import GeneratedCertificateFactory
@@ -41,6 +44,46 @@ class CertificatesModelTest(ModuleStoreTestCase, MilestonesTestCaseMixin):
         self.assertEqual(certificate_status['status'], CertificateStatuses.unavailable)
         self.assertEqual(certificate_status['mode'], GeneratedCertificate.MODES.honor)
 
+    def test_certificate_statuses_for_student(self):
+        student = UserFactory()
+        courses = [CourseFactory.create(org='edx', number=number) for number in ('101', '102', '103')]
+        GeneratedCertificateFactory.create(
+            user=student, course_id=courses[0].id, status=CertificateStatuses.downloadable, mode='honor'
+        )
+        GeneratedCertificateFactory.create(
+            user=student, course_id=courses[1].id, status=CertificateStatuses.notpassing, mode='audit'
+        )
+        course_ids = [course.id for course in courses]
+
+        with self.assertNumQueries(2):
+            certificate_statuses = certificate_statuses_for_student(student, course_ids)
+        self.assertEqual(
+            certificate_statuses,
+            {course_id: certificate_status_for_student(student, course_id) for course_id in course_ids}
+        )
+        self.assertEqual(certificate_statuses[courses[1].id]['status'], CertificateStatuses.auditing)
+        self.assertEqual(certificate_statuses[courses[2].id]['status'], CertificateStatuses.unavailable)
+
+    @override_settings(STUDENT_CERTIFICATES_CACHE_TIMEOUT=60)
+    @patch('certificates.models.cache', LocMemCache('certificates_test', {}))
+    def test_certificate_statuses_for_student_cached(self):
+        student = UserFactory()
+        course = CourseFactory.create(org='edx', number='101')
+        certificate = GeneratedCertificateFactory.create(
+            user=student, course_id=course.id, status=CertificateStatuses.generating, mode='honor'
+        )
+        certificate_statuses_for_student(student, [course.id])
+
+        with self.assertNumQueries(0):
+            certificate_statuses = certificate_statuses_for_student(student, [course.id])
+        self.assertEqual(certificate_statuses[course.id]['status'], CertificateStatuses.generating)
+
+        # Changing the certificate invalidates the cached certificates
+        certificate.status = CertificateStatuses.downloadable
+        certificate.save()
+        certificate_statuses = certificate_statuses_for_student(student, [course.id])
+        self.assertEqual(certificate_statuses[course.id]['status'], CertificateStatuses.downloadable)
+
     @unpack
     @data(
         {'allow_certificate': False, 'whitelisted': False, 'grade': None, 'output': ['N', 'N', 'N/A']},
@@ -14,12 +14,14 @@ from datetime import datetime
 import logging
 import pytz
 
+import crum
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.utils.timezone import UTC
 
 from opaque_keys.edx.keys import CourseKey, UsageKey
 
+import request_cache
 from util import milestones_helpers as milestones_helpers
 from xblock.core import XBlock
 
@@ -46,7 +48,7 @@ from courseware.access_utils import (
     debug,
     in_preview_mode
 )
-from courseware.masquerade import get_masquerade_role, is_masquerading_as_student
+from courseware.masquerade import get_course_masquerade, get_masquerade_role, is_masquerading_as_student
 from lms.djangoapps.ccx.custom_exception import CCXLocatorValidationException
 from lms.djangoapps.ccx.models import CustomCourseForEdX
 from mobile_api.models import IgnoreMobileAvailableFlagConfig
@@ -73,6 +75,9 @@ from ccx_keys.locator import CCXLocator
 
 log = logging.getLogger(__name__)
 
+# Name of the request cache of the access decisions on descriptors.
+ACCESS_CACHE_NAME = 'courseware.access'
+
 
 def has_ccx_coach_role(user, course_key):
     """
@@ -132,11 +137,117 @@ def has_access(user, action, obj, course_key=None):
 
     Returns an AccessResponse object.  It is up to the caller to actually
     deny access in a way that makes sense in context.
+
+    During a request, the access decisions on descriptors are cached for
+    the rest of the request.
     """
     # Just in case user is passed in as None, make them anonymous
     if not user:
         user = AnonymousUser()
 
+    return _cached_has_access(user, action, obj, course_key)
+
+
+def has_access_many(user, action, descriptors, course_key=None):
+    """
+    Check whether a user has the access to do action on each of the given
+    descriptors, as has_access does for a single descriptor.
+
+    The user's course roles and partition groups are looked up once for
+    the whole batch rather than once per descriptor, as are the user's
+    content milestones for the request.
+
+    Returns a list of AccessResponse objects, in the same order as the
+    given descriptors.
+    """
+    if not user:
+        user = AnonymousUser()
+
+    access_batch = _AccessBatch(user)
+    return [
+        _cached_has_access(user, action, descriptor, course_key, access_batch)
+        for descriptor in descriptors
+    ]
+
+
+class BlockAccessData(object):
+    """
+    The fields of a block that are read to check access to it, for callers
+    that keep these fields rather than the block itself.  has_access and
+    has_access_many check access to a BlockAccessData as to a descriptor.
+    """
+    def __init__(
+            self, location, user_partitions, merged_group_access, visible_to_staff_only, start,
+            days_early_for_beta, class_tags=frozenset(),
+    ):
+        self.location = location
+        self.user_partitions = user_partitions
+        self.merged_group_access = merged_group_access
+        self.visible_to_staff_only = visible_to_staff_only
+        self.start = start
+        self.days_early_for_beta = days_early_for_beta
+        self._class_tags = class_tags
+
+    def __str__(self):
+        return self.location.to_deprecated_string()
+
+    def _get_user_partition(self, user_partition_id):
+        """
+        Returns the user partition with the specified id.  Raises
+        `NoSuchUserPartitionError` if the lookup fails.
+        """
+        for user_partition in self.user_partitions:
+            if user_partition.id == user_partition_id:
+                return user_partition
+
+        raise NoSuchUserPartitionError("could not find a UserPartition with ID [{}]".format(user_partition_id))
+
+
+def _cached_has_access(user, action, obj, course_key=None, access_batch=None):
+    """
+    Returns the response of _has_access from the request's access cache,
+    if it's cacheable.
+    """
+    cache_key = _access_cache_key(user, action, obj, course_key)
+    if cache_key is None:
+        return _has_access(user, action, obj, course_key, access_batch)
+
+    access_cache = request_cache.get_cache(ACCESS_CACHE_NAME)
+    if cache_key not in access_cache:
+        access_cache[cache_key] = _has_access(user, action, obj, course_key, access_batch)
+    return access_cache[cache_key]
+
+
+def _access_cache_key(user, action, obj, course_key):
+    """
+    Returns the key of the access decision in the request's access cache,
+    or None if the decision isn't cached.
+
+    Only the decisions on descriptors, other than courses, are cached, and
+    only during a request, since the request cache is cleared when the
+    request ends.
+    """
+    if not isinstance(obj, XBlock) or isinstance(obj, CourseDescriptor):
+        return None
+    if crum.get_current_request() is None:
+        return None
+
+    location = obj.location
+    masquerade = get_course_masquerade(user, course_key or location.course_key)
+    masquerade_state = masquerade and (
+        masquerade.role,
+        masquerade.user_partition_id,
+        masquerade.group_id,
+        masquerade.user_name,
+    )
+    return (user.id, action, location, course_key, masquerade_state)
+
+
+def _has_access(user, action, obj, course_key=None, access_batch=None):
+    """
+    Check whether a user has the access to do action on obj, as has_access
+    does, sharing the lookups of the given _AccessBatch, if any.
+    """
     if in_preview_mode():
         if not bool(has_staff_access_to_preview_mode(user=user, obj=obj, course_key=course_key)):
             return ACCESS_DENIED
@@ -153,11 +264,11 @@ def has_access(user, action, obj, course_key=None):
         return _has_access_error_desc(user, action, obj, course_key)
 
     if isinstance(obj, XModule):
-        return _has_access_xmodule(user, action, obj, course_key)
+        return _has_access_xmodule(user, action, obj, course_key, access_batch)
 
     # NOTE: any descriptor access checkers need to go above this
-    if isinstance(obj, XBlock):
-        return _has_access_descriptor(user, action, obj, course_key)
+    if isinstance(obj, (XBlock, BlockAccessData)):
+        return _has_access_descriptor(user, action, obj, course_key, access_batch)
 
     if isinstance(obj, CourseKey):
         return _has_access_course_key(user, action, obj)
@@ -200,7 +311,7 @@ def has_staff_access_to_preview_mode(user, obj, course_key=None):
         elif isinstance(obj, XModule):
             course_key = obj.descriptor.course_key
 
-        elif isinstance(obj, XBlock):
+        elif isinstance(obj, (XBlock, BlockAccessData)):
             course_key = obj.location.course_key
 
         elif isinstance(obj, CCXLocator):
@@ -461,7 +572,39 @@ def _has_access_error_desc(user, action, descriptor, course_key):
     return _dispatch(checkers, action, user, descriptor)
 
 
-def _has_group_access(descriptor, user, course_key):
+class _AccessBatch(object):
+    """
+    Memoizes the lookups about a user that are shared by the access checks
+    of a batch of descriptors.
+    """
+    def __init__(self, user):
+        self.user = user
+
+        # dict {CourseKey: string}
+        self._user_roles = {}
+
+        # dict {(CourseKey, partition id): Group}
+        self._user_groups = {}
+
+    def get_user_role(self, course_key):
+        """
+        Returns the user's role in the given course, as get_user_role does.
+        """
+        if course_key not in self._user_roles:
+            self._user_roles[course_key] = get_user_role(self.user, course_key)
+        return self._user_roles[course_key]
+
+    def get_group_for_user(self, course_key, partition):
+        """
+        Returns the user's group in the given partition of the given course.
+        """
+        key = (course_key, partition.id)
+        if key not in self._user_groups:
+            self._user_groups[key] = partition.scheme.get_group_for_user(course_key, self.user, partition)
+        return self._user_groups[key]
+
+
+def _has_group_access(descriptor, user, course_key, access_batch=None):
     """
     This function returns a boolean indicating whether or not `user` has
     sufficient group memberships to "load" a block (the `descriptor`)
@@ -472,8 +615,11 @@ def _has_group_access(descriptor, user, course_key):
         # via updating the children of the split_test module.
         return ACCESS_GRANTED
 
+    if access_batch is None:
+        access_batch = _AccessBatch(user)
+
     # Allow staff and instructors roles group access, as they are not masquerading as a student.
-    if get_user_role(user, course_key) in ['staff', 'instructor']:
+    if access_batch.get_user_role(course_key) in ['staff', 'instructor']:
         return ACCESS_GRANTED
 
     # use merged_group_access which takes group access on the block's
@@ -523,11 +669,7 @@ def _has_group_access(descriptor, user, course_key):
     # look up the user's group for each partition
     user_groups = {}
     for partition, groups in partition_groups:
-        user_groups[partition.id] = partition.scheme.get_group_for_user(
-            course_key,
-            user,
-            partition,
-        )
+        user_groups[partition.id] = access_batch.get_group_for_user(course_key, partition)
 
     # finally: check that the user has a satisfactory group assignment
     # for each partition.
@@ -538,7 +680,7 @@ def _has_group_access(descriptor, user, course_key):
     return ACCESS_GRANTED
 
 
-def _has_access_descriptor(user, action, descriptor, course_key=None):
+def _has_access_descriptor(user, action, descriptor, course_key=None, access_batch=None):
     """
     Check if user has access to this descriptor.
 
@@ -561,7 +703,7 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
         # access to this content, then deny access. The problem with calling _has_staff_access_to_descriptor
         # before this method is that _has_staff_access_to_descriptor short-circuits and returns True
         # for staff users in preview mode.
-        if not _has_group_access(descriptor, user, course_key):
+        if not _has_group_access(descriptor, user, course_key, access_batch):
             return ACCESS_DENIED
 
         # If the user has staff access, they can load the module and checks below are not needed.
@@ -586,7 +728,7 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
     return _dispatch(checkers, action, user, descriptor)
 
 
-def _has_access_xmodule(user, action, xmodule, course_key):
+def _has_access_xmodule(user, action, xmodule, course_key, access_batch=None):
     """
     Check if user has access to this xmodule.
 
@@ -594,7 +736,7 @@ def _has_access_xmodule(user, action, xmodule, course_key):
       - same as the valid actions for xmodule.descriptor
     """
     # Delegate to the descriptor
-    return has_access(user, action, xmodule.descriptor, course_key)
+    return _cached_has_access(user, action, xmodule.descriptor, course_key, access_batch)
 
 
 def _has_access_location(user, action, location, course_key):
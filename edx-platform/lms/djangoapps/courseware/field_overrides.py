@@ -49,17 +49,6 @@ def resolve_dotted(name):
     return target
 
 
-def _lineage(block):
-    """
-    Returns an iterator over all ancestors of the given block, starting with
-    its immediate parent and ending at the root of the block tree.
-    """
-    parent = block.get_parent()
-    while parent:
-        yield parent
-        parent = parent.get_parent()
-
-
 class _OverridesDisabled(threading.local):
     """
     A thread local used to manage state of overrides being disabled or not.
@@ -90,6 +79,25 @@ def overrides_disabled():
     return bool(_OVERRIDES_DISABLED.disabled)
 
 
+class _OverridesGeneration(object):
+    """
+    A counter of the writes of overrides in this process, used to discard
+    override lookups memoized before the latest write.
+    """
+    value = 0
+    lock = threading.Lock()
+
+
+def overrides_changed():
+    """
+    Notes that field overrides have been written, so that the inherited
+    overrides memoized by `OverrideFieldData` are no longer used.  Override
+    providers are expected to call this whenever their overrides change.
+    """
+    with _OverridesGeneration.lock:
+        _OverridesGeneration.value += 1
+
+
 class FieldOverrideProvider(object):
     """
     Abstract class which defines the interface that a `FieldOverrideProvider`
@@ -199,6 +207,11 @@ class OverrideFieldData(FieldData):
         self.fallback = fallback
         self.providers = tuple(provider(user) for provider in providers)
 
+        # Identifies the overrides of this user and these providers in the
+        # inherited overrides memoized on blocks, since the same block may
+        # be bound to several users.
+        self._memo_key = (getattr(user, 'id', user), tuple(providers))
+
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
@@ -232,11 +245,9 @@ class OverrideFieldData(FieldData):
             # If this is an inheritable field and an override is set above,
             # then we want to return False here, so the field_data uses the
             # override and not the original value for this block.
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    if self.get_override(ancestor, name) is not NOTSET:
-                        return False
+            if name in InheritanceMixin.fields:
+                if self.get_inherited_override(block, name) is not NOTSET:
+                    return False
 
         return has is not NOTSET or self.fallback.has(block, name)
 
@@ -247,14 +258,67 @@ class OverrideFieldData(FieldData):
         # The `default` method is overloaded by the field storage system to
         # also handle inheritance.
         if self.providers and not overrides_disabled():
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    value = self.get_override(ancestor, name)
-                    if value is not NOTSET:
-                        return value
+            if name in InheritanceMixin.fields:
+                value = self.get_inherited_override(block, name)
+                if value is not NOTSET:
+                    return value
         return self.fallback.default(block, name)
 
+    def get_inherited_override(self, block, name):
+        """
+        Returns the override for the field identified by `name` on the
+        closest ancestor of `block` that has one, or `NOTSET` if no ancestor
+        has an override.
+
+        The result is memoized on each block of the lineage, so that the
+        blocks sharing ancestors, e.g. all the blocks of a sequence, only
+        walk their common lineage once.  Memoized results are discarded
+        once overrides are written (see `overrides_changed`).
+        """
+        if overrides_disabled():
+            return NOTSET
+
+        generation = _OverridesGeneration.value
+
+        # Walk up the lineage until an ancestor with an override, or a block
+        # whose inherited override is memoized, is found.  All the blocks
+        # walked inherit that same override.
+        walked_memos = []
+        current = block
+        value = NOTSET
+        while True:
+            memo = self._get_memo(current, generation)
+            if name in memo:
+                value = memo[name]
+                break
+            walked_memos.append(memo)
+            parent = current.get_parent()
+            if not parent:
+                break
+            value = self.get_override(parent, name)
+            if value is not NOTSET:
+                break
+            current = parent
+
+        for memo in walked_memos:
+            memo[name] = value
+        return value
+
+    def _get_memo(self, block, generation):
+        """
+        Returns the dict of inherited overrides memoized on `block` for
+        this user and these providers, as of the given generation of
+        overrides.
+        """
+        if not hasattr(block, '_inherited_field_overrides'):
+            block._inherited_field_overrides = {}  # pylint: disable=protected-access
+        memos = block._inherited_field_overrides  # pylint: disable=protected-access
+        memo_generation, memo = memos.get(self._memo_key, (None, None))
+        if memo_generation != generation:
+            memo = {}
+            memos[self._memo_key] = (generation, memo)
+        return memo
+
 
 class OverrideModulestoreFieldData(OverrideFieldData):
     """Apply field data overrides at the modulestore level. No student context required."""
@@ -25,6 +25,7 @@ import json
 from abc import abstractmethod, ABCMeta
 from collections import defaultdict, namedtuple
 from .models import (
+    chunks,
     StudentModule,
     XModuleUserStateSummaryField,
     XModuleStudentPrefsField,
@@ -961,15 +962,18 @@ class ScoresClient(object):
             course_id=self.course_key,
             module_state_key__in=set(locations),
         )
+        for location, correct, total in scores_qset.values_list('module_state_key', 'grade', 'max_grade'):
+            self._add_score(location, correct, total)
+        self._has_fetched = True
+
+    def _add_score(self, location, correct, total):
+        """Add the score stored in StudentModule for the given location."""
         # Locations in StudentModule don't necessarily have course key info
         # attached to them (since old mongo identifiers don't include runs).
         # So we have to add that info back in before we put it into our lookup.
-        self._locations_to_scores.update({
-            UsageKey.from_string(location).map_into_course(self.course_key): self.Score(correct, total)
-            for location, correct, total
-            in scores_qset.values_list('module_state_key', 'grade', 'max_grade')
-        })
-        self._has_fetched = True
+        self._locations_to_scores[UsageKey.from_string(location).map_into_course(self.course_key)] = self.Score(
+            correct, total
+        )
 
     def get(self, location):
         """
@@ -986,6 +990,14 @@ class ScoresClient(object):
             )
         return self._locations_to_scores.get(location.replace(version=None, branch=None))
 
+    def iteritems(self):
+        """
+        Iterate over the (location, Score) pairs of all the fetched scores.
+        Locations have full course run information, but no version or
+        branch information.
+        """
+        return self._locations_to_scores.iteritems()
+
     @classmethod
     def create_for_locations(cls, course_id, user_id, scorable_locations):
         """Create a ScoresClient with pre-fetched data for the given locations."""
@@ -993,6 +1005,31 @@ class ScoresClient(object):
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def create_for_users(cls, course_id, user_ids, scorable_locations, chunk_size=500):
+        """
+        Create a ScoresClient with pre-fetched data for the given locations
+        for each of the given users, with a single query for each chunk of
+        chunk_size users.
+
+        Returns a dict of the ScoresClients keyed by user id.
+        """
+        clients = {user_id: cls(course_id, user_id) for user_id in user_ids}
+        locations = set(scorable_locations)
+        for user_ids_chunk in chunks(clients.keys(), chunk_size):
+            scores_qset = StudentModule.objects.filter(
+                student_id__in=user_ids_chunk,
+                course_id=course_id,
+                module_state_key__in=locations,
+            )
+            for user_id, location, correct, total in scores_qset.values_list(
+                    'student_id', 'module_state_key', 'grade', 'max_grade',
+            ).iterator():
+                clients[user_id]._add_score(location, correct, total)  # pylint: disable=protected-access
+        for client in clients.itervalues():
+            client._has_fetched = True  # pylint: disable=protected-access
+        return clients
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
@@ -4,10 +4,24 @@ by the individual due dates feature.
 """
 import json
 
-from .field_overrides import FieldOverrideProvider
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from request_cache.middleware import RequestCache
+
+from .field_overrides import FieldOverrideProvider, overrides_changed
 from .models import StudentFieldOverride
 
 
+# Cache key of the snapshot of all of a user's overrides in a course.
+OVERRIDES_SNAPSHOT_KEY = u'courseware.student_field_overrides.snapshot.{course_id}.{user_id}'
+
+# Time, in seconds, for which snapshots are kept in the cache, in case an
+# invalidation doesn't come through.
+OVERRIDES_SNAPSHOT_TIMEOUT = 60 * 60
+
+
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
     """
     A concrete implementation of
@@ -43,19 +57,69 @@ def _get_overrides_for_user(user, block):
     Gets all of the individual student overrides for given user and block.
     Returns a dictionary of field override values keyed by field name.
     """
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=block.location,
-        student_id=user.id,
-    )
+    snapshot = _get_overrides_snapshot(user.id, block.runtime.course_id)
+    block_overrides = snapshot.get(_location_key(block.location), {})
     overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for field_name, value in block_overrides.iteritems():
+        field = block.fields[field_name]
+        overrides[field_name] = field.from_json(json.loads(value))
     return overrides
 
 
+def _get_overrides_snapshot(user_id, course_id):
+    """
+    Returns a snapshot of all of the individual student overrides for the
+    given user in the given course, loaded in a single query and cached for
+    the request and across requests.  The snapshot is a dictionary of the
+    serialized field override values keyed by location and field name.
+    """
+    cache_key = _snapshot_cache_key(user_id, course_id)
+    request_cache = RequestCache.get_request_cache()
+    snapshot = request_cache.data.get(cache_key)
+    if snapshot is None:
+        snapshot = cache.get(cache_key)
+        if snapshot is None:
+            snapshot = {}
+            query = StudentFieldOverride.objects.filter(
+                course_id=course_id,
+                student_id=user_id,
+            ).only('location', 'field', 'value')
+            for override in query:
+                snapshot.setdefault(_location_key(override.location), {})[override.field] = override.value
+            cache.set(cache_key, snapshot, OVERRIDES_SNAPSHOT_TIMEOUT)
+        request_cache.data[cache_key] = snapshot
+    return snapshot
+
+
+def _snapshot_cache_key(user_id, course_id):
+    """
+    Returns the cache key of the snapshot of the given user's overrides in
+    the given course.
+    """
+    return OVERRIDES_SNAPSHOT_KEY.format(course_id=unicode(course_id), user_id=user_id)
+
+
+def _location_key(location):
+    """
+    Returns the given location as it is stored in the database, without
+    branch and version information.
+    """
+    return StudentFieldOverride._meta.get_field('location').get_prep_value(location)  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=StudentFieldOverride)
+@receiver(post_delete, sender=StudentFieldOverride)
+def _invalidate_overrides_snapshot(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Discards the snapshot of the overrides of the student whose override
+    was written.
+    """
+    cache_key = _snapshot_cache_key(instance.student_id, instance.course_id)
+    cache.delete(cache_key)
+    RequestCache.get_request_cache().data.pop(cache_key, None)
+    overrides_changed()
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -70,6 +134,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _clear_block_overrides(user, block)
 
 
 def clear_override_for_user(user, block, name):
@@ -87,3 +152,12 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    _clear_block_overrides(user, block)
+
+
+def _clear_block_overrides(user, block):
+    """
+    Discards the overrides for the `user` memoized on `block`.
+    """
+    if hasattr(block, '_student_overrides'):
+        block._student_overrides.pop(user.id, None)  # pylint: disable=protected-access
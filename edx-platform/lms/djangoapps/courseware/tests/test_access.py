@@ -29,6 +29,7 @@ from courseware.tests.factories import (
 )
 from courseware.tests.helpers import LoginEnrollmentTestCase, masquerade_as_group_member
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from request_cache.middleware import RequestCache
 from student.models import CourseEnrollment
 from student.roles import CourseCcxCoachRole, CourseStaffRole
 from student.tests.factories import (
@@ -459,6 +460,51 @@ class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase, MilestonesTes
         mock_unit.start = start
         self.verify_access(mock_unit, expected_access, expected_error_type)
 
+    def test_has_access_many(self):
+        """
+        Tests that the access checks of a batch of descriptors share the
+        lookups of the user's role and partition groups.
+        """
+        partition_id = 0
+        groups = [Group(0, 'Group 1'), Group(1, 'Group 2')]
+        user_partition = UserPartition(partition_id, 'Test User Partition', '', groups, scheme_id='cohort')
+        self.course.user_partitions.append(user_partition)
+        chapters = []
+        for group in groups + groups:
+            chapter = ItemFactory.create(category="chapter", parent_location=self.course.location)
+            chapter.group_access = {partition_id: [group.id]}
+            chapter.user_partitions = self.course.user_partitions
+            chapters.append(chapter)
+
+        with patch('courseware.access.get_user_role', return_value='student') as mock_user_role:
+            with patch.object(user_partition.scheme, 'get_group_for_user', return_value=groups[0]) as mock_group:
+                responses = access.has_access_many(self.student, 'load', chapters, course_key=self.course.id)
+
+        self.assertEqual([bool(response) for response in responses], [True, False, True, False])
+        self.assertEqual(mock_user_role.call_count, 1)
+        self.assertEqual(mock_group.call_count, 1)
+
+    @patch('courseware.access.crum.get_current_request', Mock(return_value=Mock()))
+    def test_has_access_cached_for_request(self):
+        """
+        Tests that access decisions on descriptors are cached for the
+        request, per masquerade.
+        """
+        self.addCleanup(RequestCache.clear_request_cache)
+        chapter = ItemFactory.create(category="chapter", parent_location=self.course.location)
+
+        with patch('courseware.access._has_access_descriptor', wraps=access._has_access_descriptor) as mock_check:
+            for __ in range(2):
+                self.assertTrue(access.has_access(self.course_staff, 'staff', chapter, course_key=self.course.id))
+            self.assertEqual(mock_check.call_count, 1)
+
+            self.course_staff.masquerade_settings = {
+                self.course.id: CourseMasquerade(self.course.id, role='student'),
+            }
+            for __ in range(2):
+                self.assertFalse(access.has_access(self.course_staff, 'staff', chapter, course_key=self.course.id))
+            self.assertEqual(mock_check.call_count, 2)
+
     def test__has_access_descriptor_beta_user(self):
         mock_unit = Mock(user_partitions=[])
         mock_unit._class_tags = {}
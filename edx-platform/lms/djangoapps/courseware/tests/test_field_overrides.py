@@ -12,7 +12,9 @@ from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 
 from ..field_overrides import (
     resolve_dotted,
+    NOTSET,
     disable_overrides,
+    overrides_changed,
     FieldOverrideProvider,
     OverrideFieldData,
     OverrideModulestoreFieldData,
@@ -142,6 +144,81 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         self.assertIsInstance(data, DictFieldData)
 
 
+class FakeBlock(object):
+    """
+    A minimal block with a parent, for testing inherited overrides.
+    """
+    def __init__(self, parent=None):
+        self.parent = parent
+
+    def get_parent(self):
+        return self.parent
+
+
+class InheritedOverrideProvider(FieldOverrideProvider):
+    """
+    A `FieldOverrideProvider` serving the overrides in `OVERRIDES` and
+    counting its lookups.
+    """
+    OVERRIDES = {}
+    lookups = 0
+
+    def get(self, block, name, default):
+        InheritedOverrideProvider.lookups += 1
+        return self.OVERRIDES.get((block, name), default)
+
+    @classmethod
+    def enabled_for(cls, course):
+        return True
+
+
+@attr(shard=1)
+class InheritedOverrideTests(unittest.TestCase):
+    """
+    Tests for `OverrideFieldData.get_inherited_override`.
+    """
+    def setUp(self):
+        super(InheritedOverrideTests, self).setUp()
+        self.course = FakeBlock()
+        self.chapter = FakeBlock(self.course)
+        self.sequences = [FakeBlock(self.chapter) for __ in range(3)]
+        InheritedOverrideProvider.OVERRIDES = {(self.course, 'due'): 'course due'}
+        InheritedOverrideProvider.lookups = 0
+        self.data = OverrideFieldData(TESTUSER, DictFieldData({}), [InheritedOverrideProvider])
+
+    def test_inherited_from_ancestor(self):
+        for sequence in self.sequences:
+            self.assertEqual(self.data.default(sequence, 'due'), 'course due')
+            self.assertFalse(self.data.has(sequence, 'due'))
+
+    def test_lineage_walked_once(self):
+        self.data.get_inherited_override(self.sequences[0], 'due')
+        lookups = InheritedOverrideProvider.lookups
+        for sequence in self.sequences[1:]:
+            self.data.get_inherited_override(sequence, 'due')
+        # Only the sequences' parent is looked up again, then the
+        # chapter's memoized override is used.
+        self.assertEqual(InheritedOverrideProvider.lookups, lookups + 2)
+
+    def test_overrides_changed(self):
+        self.assertEqual(self.data.get_inherited_override(self.sequences[0], 'due'), 'course due')
+        InheritedOverrideProvider.OVERRIDES[(self.chapter, 'due')] = 'chapter due'
+        self.assertEqual(self.data.get_inherited_override(self.sequences[0], 'due'), 'course due')
+        overrides_changed()
+        self.assertEqual(self.data.get_inherited_override(self.sequences[0], 'due'), 'chapter due')
+
+    def test_memoized_per_user(self):
+        self.data.get_inherited_override(self.sequences[0], 'due')
+        other_data = OverrideFieldData('otheruser', DictFieldData({}), [InheritedOverrideProvider])
+        InheritedOverrideProvider.OVERRIDES = {}
+        self.assertEqual(self.data.get_inherited_override(self.sequences[0], 'due'), 'course due')
+        self.assertIs(other_data.get_inherited_override(self.sequences[0], 'due'), NOTSET)
+
+    def test_disabled(self):
+        with disable_overrides():
+            self.assertIs(self.data.get_inherited_override(self.sequences[0], 'due'), NOTSET)
+
+
 @attr(shard=1)
 class ResolveDottedTests(unittest.TestCase):
     """
@@ -0,0 +1,16 @@
+"""
+Signal handler for invalidating the cached discussion xblocks of courses
+"""
+from django.dispatch.dispatcher import receiver
+from xmodule.modulestore.django import SignalHandler
+
+from .utils import invalidate_discussion_xblocks
+
+
+@receiver(SignalHandler.course_published)
+def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Catches the signal that a course has been published in Studio and
+    invalidates the cached data of the course's discussion xblocks.
+    """
+    invalidate_discussion_xblocks(course_key)
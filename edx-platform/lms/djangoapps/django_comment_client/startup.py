@@ -0,0 +1,4 @@
+"""
+Setup the signals on startup.
+"""
+import django_comment_client.signals  # pylint: disable=unused-import
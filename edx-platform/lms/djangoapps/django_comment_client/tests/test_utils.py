@@ -437,6 +437,29 @@ class CategoryMapTestCase(CategoryMapTestMixin, ModuleStoreTestCase):
         )
         check_cohorted_topics([])
 
+    def test_cached_per_course_version(self):
+        self.create_discussion("Chapter", "Discussion 1")
+        course = modulestore().get_course(self.course.id)
+
+        with patch.object(modulestore(), 'get_items', wraps=modulestore().get_items) as mock_get_items:
+            with patch(
+                'django_comment_client.utils._build_discussion_category_map',
+                wraps=utils._build_discussion_category_map,  # pylint: disable=protected-access
+            ) as mock_build:
+                for __ in range(2):
+                    category_map = utils.get_discussion_category_map(course, self.instructor)
+                self.assertEqual(mock_get_items.call_count, 1)
+                self.assertEqual(mock_build.call_count, 1)
+        self.assertEqual(category_map["subcategories"]["Chapter"]["entries"].keys(), ["Discussion 1"])
+
+        # Publishing the course invalidates its cached discussion xblocks.
+        self.create_discussion("Chapter", "Discussion 2")
+        category_map = utils.get_discussion_category_map(course, self.instructor)
+        self.assertEqual(
+            sorted(category_map["subcategories"]["Chapter"]["entries"]),
+            ["Discussion 1", "Discussion 2"]
+        )
+
     def test_single_inline(self):
         self.create_discussion("Chapter", "Discussion")
         self.assert_category_map_equals(
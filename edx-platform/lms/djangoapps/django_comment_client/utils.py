@@ -1,11 +1,14 @@
 from collections import defaultdict
 from datetime import datetime
+from hashlib import md5
 import json
 import logging
+from uuid import uuid4
 from django.conf import settings
 
 import pytz
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.db import connection
 from django.http import HttpResponse
@@ -22,7 +25,7 @@ from django_comment_client.constants import TYPE_ENTRY, TYPE_SUBCATEGORY
 from edxmako import lookup_template
 
 from courseware import courses
-from courseware.access import has_access
+from courseware.access import BlockAccessData, has_access, has_access_many
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.course_groups.cohorts import (
     get_course_cohort_settings, get_cohort_by_id, get_cohort_id, is_course_cohorted
@@ -33,6 +36,10 @@ from request_cache.middleware import request_cached
 
 log = logging.getLogger(__name__)
 
+# Number of seconds that the data of a course's discussion xblocks, and
+# the category maps built from it, are cached for.
+DISCUSSION_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 def extract(dic, keys):
     """
@@ -131,10 +138,13 @@ def get_accessible_discussion_xblocks(course, user, include_all=False):  # pylin
     are accessible to the given user.
     """
     all_xblocks = modulestore().get_items(course.id, qualifiers={'category': 'discussion'}, include_orphans=False)
+    xblocks = [xblock for xblock in all_xblocks if has_required_keys(xblock)]
+    if include_all:
+        return xblocks
 
     return [
-        xblock for xblock in all_xblocks
-        if has_required_keys(xblock) and (include_all or has_access(user, 'load', xblock, course.id))
+        xblock for xblock, access in zip(xblocks, has_access_many(user, 'load', xblocks, course.id))
+        if access
     ]
 
 
@@ -198,7 +208,100 @@ def get_discussion_id_map(course, user):
     Transform the list of this course's discussion xblocks (visible to a given user) into a dictionary of metadata keyed
     by discussion_id.
     """
-    return dict(map(get_discussion_id_map_entry, get_accessible_discussion_xblocks(course, user)))
+    __, xblocks_data = _get_discussion_xblocks_data(course)
+    return {
+        xblock_data["id"]: {
+            "location": xblock_data["location"],
+            "title": xblock_data["category"].split("/")[-1].strip() + " / " + xblock_data["title"]
+        }
+        for xblock_data in _get_accessible_discussion_xblocks_data(course, user, xblocks_data)
+    }
+
+
+def _get_course_version(course):
+    """
+    Returns the version of the given course's published content, or None if
+    it's unknown.  Split modulestore courses are versioned, while the
+    version of Old Mongo courses is when their content was last edited.
+    """
+    return getattr(course, 'course_version', None) or getattr(course, 'subtree_edited_on', None)
+
+
+def _discussion_xblocks_cache_key(course_key):
+    """
+    Returns the cache key of the data of the given course's discussion xblocks.
+    """
+    return u"django_comment_client.discussion_xblocks.{}".format(course_key)
+
+
+def invalidate_discussion_xblocks(course_key):
+    """
+    Removes the cached data of the given course's discussion xblocks, along
+    with the category maps built from it.
+    """
+    cache.delete(_discussion_xblocks_cache_key(course_key))
+
+
+def _get_discussion_xblocks_data(course):
+    """
+    Returns the data of this course's discussion xblocks that have the
+    required keys, which is cached for the course's version.
+
+    Returns a (token, list of dicts) pair, where the token identifies the
+    cached data, or is None if the data wasn't cached.
+    """
+    version = _get_course_version(course)
+    cache_key = _discussion_xblocks_cache_key(course.id)
+    if version is not None:
+        cached = cache.get(cache_key)
+        if cached is not None and cached[0] == version:
+            return cached[1:]
+
+    all_xblocks = modulestore().get_items(course.id, qualifiers={'category': 'discussion'}, include_orphans=False)
+    xblocks_data = [
+        {
+            "location": xblock.location,
+            "id": xblock.discussion_id,
+            "title": xblock.discussion_target,
+            "sort_key": xblock.sort_key,
+            "category": " / ".join([x.strip() for x in xblock.discussion_category.split("/")]),
+            "start": xblock.start,
+            "days_early_for_beta": xblock.days_early_for_beta,
+            "visible_to_staff_only": xblock.visible_to_staff_only,
+            "merged_group_access": xblock.merged_group_access,
+            "class_tags": frozenset(xblock._class_tags),  # pylint: disable=protected-access
+        }
+        for xblock in all_xblocks if has_required_keys(xblock)
+    ]
+    if version is None:
+        return None, xblocks_data
+
+    token = uuid4().hex
+    cache.set(cache_key, (version, token, xblocks_data), DISCUSSION_CACHE_TIMEOUT)
+    return token, xblocks_data
+
+
+def _get_accessible_discussion_xblocks_data(course, user, xblocks_data):  # pylint: disable=invalid-name
+    """
+    Returns the data of the given discussion xblocks of this course that
+    are accessible to the given user.
+    """
+    blocks = [
+        BlockAccessData(
+            location=xblock_data["location"],
+            user_partitions=course.user_partitions,
+            merged_group_access=xblock_data["merged_group_access"],
+            visible_to_staff_only=xblock_data["visible_to_staff_only"],
+            start=xblock_data["start"],
+            days_early_for_beta=xblock_data["days_early_for_beta"],
+            class_tags=xblock_data["class_tags"],
+        )
+        for xblock_data in xblocks_data
+    ]
+    return [
+        xblock_data for xblock_data, access in zip(xblocks_data, has_access_many(user, 'load', blocks, course.id))
+        if access
+    ]
 
 
 def _filter_unstarted_categories(category_map, course):
@@ -305,23 +408,52 @@ def get_discussion_category_map(course, user, cohorted_if_in_list=False, exclude
         >>>          }
 
     """
-    unexpanded_category_map = defaultdict(list)
+    token, xblocks_data = _get_discussion_xblocks_data(course)
+    xblocks_data = _get_accessible_discussion_xblocks_data(course, user, xblocks_data)
+    course_cohort_settings = get_course_cohort_settings(course.id)
+
+    # The category map only depends on the discussion xblocks that the user
+    # can access, so it's shared by the users with the same cohorts and
+    # partition groups.
+    cache_key = None
+    category_map = None
+    if token is not None:
+        signature = repr((
+            [unicode(xblock_data["location"]) for xblock_data in xblocks_data],
+            course_cohort_settings.is_cohorted,
+            course_cohort_settings.always_cohort_inline_discussions,
+            sorted(course_cohort_settings.cohorted_discussions),
+            course.discussion_topics,
+            course.discussion_sort_alpha,
+            cohorted_if_in_list,
+        ))
+        cache_key = u"django_comment_client.discussion_category_map.{}.{}.{}".format(
+            course.id, token, md5(signature).hexdigest()
+        )
+        category_map = cache.get(cache_key)
 
-    xblocks = get_accessible_discussion_xblocks(course, user)
+    if category_map is None:
+        category_map = _build_discussion_category_map(course, xblocks_data, course_cohort_settings, cohorted_if_in_list)
+        if cache_key is not None:
+            cache.set(cache_key, category_map, DISCUSSION_CACHE_TIMEOUT)
 
-    course_cohort_settings = get_course_cohort_settings(course.id)
+    return _filter_unstarted_categories(category_map, course) if exclude_unstarted else category_map
 
-    for xblock in xblocks:
-        discussion_id = xblock.discussion_id
-        title = xblock.discussion_target
-        sort_key = xblock.sort_key
-        category = " / ".join([x.strip() for x in xblock.discussion_category.split("/")])
+
+def _build_discussion_category_map(course, xblocks_data, course_cohort_settings, cohorted_if_in_list):
+    """
+    Builds the sorted category map of get_discussion_category_map from the
+    data of the given discussion xblocks.
+    """
+    unexpanded_category_map = defaultdict(list)
+
+    for xblock_data in xblocks_data:
         # Handle case where xblock.start is None
-        entry_start_date = xblock.start if xblock.start else datetime.max.replace(tzinfo=pytz.UTC)
-        unexpanded_category_map[category].append({"title": title,
-                                                  "id": discussion_id,
-                                                  "sort_key": sort_key,
-                                                  "start_date": entry_start_date})
+        entry_start_date = xblock_data["start"] if xblock_data["start"] else datetime.max.replace(tzinfo=pytz.UTC)
+        unexpanded_category_map[xblock_data["category"]].append({"title": xblock_data["title"],
+                                                                 "id": xblock_data["id"],
+                                                                 "sort_key": xblock_data["sort_key"],
+                                                                 "start_date": entry_start_date})
 
     category_map = {"entries": defaultdict(dict), "subcategories": defaultdict(dict)}
     for category_path, entries in unexpanded_category_map.items():
@@ -391,7 +523,7 @@ def get_discussion_category_map(course, user, cohorted_if_in_list=False, exclude
 
     _sort_map_entries(category_map, course.discussion_sort_alpha)
 
-    return _filter_unstarted_categories(category_map, course) if exclude_unstarted else category_map
+    return category_map
 
 
 def discussion_category_id_access(course, user, discussion_id, xblock=None):
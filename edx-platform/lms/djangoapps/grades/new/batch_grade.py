@@ -0,0 +1,331 @@
+"""
+CourseGradeBatch Class
+"""
+from collections import OrderedDict
+
+import numpy
+
+from xmodule.graders import AggregatedScore, ProblemScore
+
+from ..scores import possibly_scored, prefetch_scores
+from ..transformer import GradesTransformer
+from .subsection_grade import SubsectionGrade
+
+
+class CourseGradeBatch(object):
+    """
+    Computes the grades of a batch of students in a course at once.
+
+    The scores of all the students for all the scorable blocks in the
+    course are loaded in bulk into (students x blocks) arrays.  These
+    are then aggregated into subsection totals and, by the course's
+    grader, into course percentages using array operations rather than
+    one student at a time.
+
+    SubsectionGrades are only created for a student when they are asked
+    for, from the precomputed arrays.
+    """
+    def __init__(self, course, collected_block_structure, students, course_structures):
+        """
+        Arguments:
+            course - The course being graded.
+            collected_block_structure (BlockStructureBlockData) - The
+                collected block structure of the course.
+            students (list of User) - The students to grade.
+            course_structures (list of BlockStructureBlockData) - The
+                course's block structure as transformed for each of the
+                given students, in the same order.
+        """
+        self.course = course
+        self.students = students
+        self.course_structures = course_structures
+
+        self._init_blocks(collected_block_structure)
+        self._load_scores()
+        self._aggregate_subsection_scores()
+
+        self.percents, self.grade_breakdowns = self.course.grader.grade_many(
+            len(self.students),
+            self._format_scores(),
+        )
+
+    @staticmethod
+    def is_supported(course):
+        """
+        Returns whether the given course's grader can grade a batch of
+        students at once.
+        """
+        return course.grader.supports_grade_many
+
+    def grade_breakdown(self, index):
+        """
+        Returns the contribution of each category of the course's
+        grader to the grade of the student at the given index in the
+        batch, keyed by category, as in the grader's grade_breakdown.
+        """
+        return OrderedDict(
+            (category, {'percent': float(percents[index]), 'category': category})
+            for category, percents in self.grade_breakdowns.iteritems()
+        )
+
+    def subsection_grade_factory(self, index):
+        """
+        Returns a factory of the SubsectionGrades of the student at the
+        given index in the batch.
+        """
+        return _BatchSubsectionGradeFactory(self, index)
+
+    def create_subsection_grade(self, index, subsection):
+        """
+        Returns the SubsectionGrade of the student at the given index in
+        the batch for the given subsection.
+        """
+        subsection_index = self._subsection_indices[subsection.location]
+        subsection_grade = SubsectionGrade(subsection)
+        for block_index in self._subsection_block_indices[subsection_index]:
+            if self._scored[index, block_index]:
+                subsection_grade.locations_to_scores[self._block_keys[block_index]] = self._problem_score(
+                    index, block_index,
+                )
+
+        subsection_grade.all_total = AggregatedScore(
+            tw_earned=self._all_earned[index, subsection_index],
+            tw_possible=self._all_possible[index, subsection_index],
+            graded=False,
+            attempted=bool(self._all_attempted[index, subsection_index]),
+        )
+        subsection_grade.graded_total = AggregatedScore(
+            tw_earned=self._graded_earned[index, subsection_index],
+            tw_possible=self._graded_possible[index, subsection_index],
+            graded=True,
+            attempted=bool(self._graded_attempted[index, subsection_index]),
+        )
+        return subsection_grade
+
+    def _init_blocks(self, collected_block_structure):
+        """
+        Indexes the scorable blocks and the subsections of the course,
+        and reads the scoring metadata of the scorable blocks.
+        """
+        # Subsections, in course order.
+        self._subsection_keys = []
+        self._subsection_indices = {}
+        for chapter_key in collected_block_structure.get_children(collected_block_structure.root_block_usage_key):
+            for subsection_key in collected_block_structure.get_children(chapter_key):
+                if subsection_key not in self._subsection_indices:
+                    self._subsection_indices[subsection_key] = len(self._subsection_keys)
+                    self._subsection_keys.append(subsection_key)
+
+        # Scorable blocks of each subsection, in the same order as
+        # SubsectionGrade.init_from_structure computes them.
+        self._block_keys = []
+        self._block_indices = {}
+        self._subsection_block_indices = []
+        for subsection_key in self._subsection_keys:
+            block_indices = []
+            for block_key in collected_block_structure.post_order_traversal(
+                    filter_func=possibly_scored,
+                    start_node=subsection_key,
+            ):
+                if not getattr(collected_block_structure[block_key], 'has_score', False):
+                    continue
+                if block_key not in self._block_indices:
+                    self._block_indices[block_key] = len(self._block_keys)
+                    self._block_keys.append(block_key)
+                block_indices.append(self._block_indices[block_key])
+            self._subsection_block_indices.append(block_indices)
+
+        # Map of each scorable block to the subsections that contain it.
+        self._incidence = numpy.zeros((len(self._block_keys), len(self._subsection_keys)))
+        for subsection_index, block_indices in enumerate(self._subsection_block_indices):
+            self._incidence[block_indices, subsection_index] = 1.0
+
+        blocks = [collected_block_structure[block_key] for block_key in self._block_keys]
+        self._weights = _float_array([getattr(block, 'weight', None) for block in blocks])
+        self._max_scores = _float_array([
+            block.transformer_data[GradesTransformer].max_score for block in blocks
+        ])
+        self._explicit_graded = numpy.array([
+            getattr(block.transformer_data[GradesTransformer], GradesTransformer.EXPLICIT_GRADED_FIELD_NAME, None)
+            is not False
+            for block in blocks
+        ], dtype=bool)
+
+        subsections = [collected_block_structure[subsection_key] for subsection_key in self._subsection_keys]
+        self._graded_subsection_indices_by_format = OrderedDict()
+        for subsection_index, subsection in enumerate(subsections):
+            if getattr(subsection, 'graded', False):
+                self._graded_subsection_indices_by_format.setdefault(
+                    getattr(subsection, 'format', ''), [],
+                ).append(subsection_index)
+
+    def _load_scores(self):
+        """
+        Loads the scores of all students in the batch for all scorable
+        blocks, in the same order of precedence as scores.get_score:
+        submissions API -> CSM -> latest block content.
+        """
+        shape = (len(self.students), len(self._block_keys))
+        raw_earned = numpy.zeros(shape)
+        raw_possible = numpy.tile(self._max_scores, (len(self.students), 1))
+        self._attempted = numpy.zeros(shape, dtype=bool)
+        self._from_submissions = numpy.zeros(shape, dtype=bool)
+
+        prefetched_scores = prefetch_scores(self.course.id, self.students, self._block_keys)
+
+        for index, block_index, correct, total in self._iter_csm_scores(prefetched_scores):
+            if total is not None:
+                raw_earned[index, block_index] = correct if correct is not None else 0.0
+                raw_possible[index, block_index] = total
+                self._attempted[index, block_index] = correct is not None
+
+        weighted = ~numpy.isnan(self._weights) & (raw_possible != 0)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            self._earned = numpy.where(weighted, raw_earned * self._weights / raw_possible, raw_earned)
+        self._possible = numpy.where(weighted, self._weights, raw_possible)
+        self._raw_earned = raw_earned
+        self._raw_possible = raw_possible
+
+        for index, block_index, weighted_earned, weighted_possible in self._iter_submissions_scores(prefetched_scores):
+            self._earned[index, block_index] = weighted_earned
+            self._possible[index, block_index] = weighted_possible
+            self._attempted[index, block_index] = True
+            self._from_submissions[index, block_index] = True
+
+        visible = numpy.array(
+            [
+                [block_key in course_structure for block_key in self._block_keys]
+                for course_structure in self.course_structures
+            ],
+            dtype=bool,
+        ).reshape(shape)
+        self._scored = visible & ~numpy.isnan(self._possible) & ~numpy.isnan(self._earned)
+        with numpy.errstate(invalid='ignore'):
+            self._graded = self._scored & (self._possible > 0) & self._explicit_graded
+
+    def _iter_csm_scores(self, prefetched_scores):
+        """
+        Yields (student index, block index, correct, total) for each of
+        the given prefetched scores stored in CSM.
+        """
+        block_indices = {
+            block_key.replace(version=None, branch=None): block_index
+            for block_key, block_index in self._block_indices.iteritems()
+        }
+        for index, student in enumerate(self.students):
+            for location, score in prefetched_scores[student.id].csm_scores.iteritems():
+                block_index = block_indices.get(location)
+                if block_index is not None:
+                    yield index, block_index, score.correct, score.total
+
+    def _iter_submissions_scores(self, prefetched_scores):
+        """
+        Yields (student index, block index, weighted earned, weighted
+        possible) for each of the given prefetched scores stored by the
+        Submissions API.
+        """
+        block_indices = {unicode(block_key): block_index for block_key, block_index in self._block_indices.iteritems()}
+        for index, student in enumerate(self.students):
+            submissions_scores = prefetched_scores[student.id].submissions_scores
+            for location, (weighted_earned, weighted_possible) in submissions_scores.iteritems():
+                block_index = block_indices.get(location)
+                if block_index is not None:
+                    yield index, block_index, weighted_earned, weighted_possible
+
+    def _aggregate_subsection_scores(self):
+        """
+        Sums the scores of the scorable blocks into (students x
+        subsections) totals, as graders.aggregate_scores does.
+        """
+        self._all_earned, self._all_possible, self._all_attempted = self._subsection_totals(self._scored)
+        self._graded_earned, self._graded_possible, self._graded_attempted = self._subsection_totals(self._graded)
+
+        self._subsection_visible = numpy.array(
+            [
+                [subsection_key in course_structure for subsection_key in self._subsection_keys]
+                for course_structure in self.course_structures
+            ],
+            dtype=bool,
+        ).reshape((len(self.students), len(self._subsection_keys)))
+
+    def _subsection_totals(self, included):
+        """
+        Returns the earned, possible and attempted totals of each
+        subsection for each student, summed over the included scores.
+        """
+        earned = numpy.where(included, self._earned, 0.0).dot(self._incidence)
+        possible = numpy.where(included, self._possible, 0.0).dot(self._incidence)
+        attempted = (included & self._attempted).astype(float).dot(self._incidence) > 0
+        return earned, possible, attempted
+
+    def _format_scores(self):
+        """
+        Returns the graded totals of the students for the subsections
+        of each format, for the course grader's grade_many.  Subsections
+        that a student can't access are left out of the student's grade
+        sheet.
+        """
+        return {
+            section_format: (
+                self._graded_earned[:, subsection_indices],
+                numpy.where(
+                    self._subsection_visible[:, subsection_indices],
+                    self._graded_possible[:, subsection_indices],
+                    0.0,
+                ),
+            )
+            for section_format, subsection_indices in self._graded_subsection_indices_by_format.iteritems()
+        }
+
+    def _problem_score(self, index, block_index):
+        """
+        Returns the ProblemScore of the student at the given index for
+        the block at the given index.
+        """
+        from_submissions = self._from_submissions[index, block_index]
+        return ProblemScore(
+            None if from_submissions else self._raw_earned[index, block_index],
+            None if from_submissions else self._raw_possible[index, block_index],
+            self._earned[index, block_index],
+            self._possible[index, block_index],
+            _float_or_none(self._weights[block_index]),
+            bool(self._graded[index, block_index]),
+            attempted=bool(self._attempted[index, block_index]),
+        )
+
+
+class _BatchSubsectionGradeFactory(object):
+    """
+    Factory of a single student's SubsectionGrades, as computed in a
+    CourseGradeBatch.
+    """
+    def __init__(self, batch, index):
+        self._batch = batch
+        self._index = index
+        self._unsaved_subsection_grades = []
+
+    def create(self, subsection, read_only=False):  # pylint: disable=unused-argument
+        """
+        Returns the SubsectionGrade object for the student and subsection.
+        """
+        return self._batch.create_subsection_grade(self._index, subsection)
+
+    def bulk_create_unsaved(self):
+        """
+        Batch grades are not persisted.
+        """
+        pass
+
+
+def _float_array(values):
+    """
+    Returns an array of floats of the given values, with NaN for None.
+    """
+    return numpy.array([numpy.nan if value is None else value for value in values], dtype=float)
+
+
+def _float_or_none(value):
+    """
+    Returns the given float, or None if it's NaN.
+    """
+    return None if numpy.isnan(value) else float(value)
@@ -3,12 +3,14 @@ CourseGrade Class
 """
 
 from collections import defaultdict, namedtuple, OrderedDict
+from itertools import islice
 from logging import getLogger
 
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
 import dogstats_wrapper as dog_stats_api
 from lazy import lazy
+from waffle import switch_is_active
 
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
@@ -17,6 +19,8 @@ from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED
 from xmodule import block_metadata_utils
 
 from ..models import PersistentCourseGrade
+from ..scores import possibly_scored, prefetch_scores
+from .batch_grade import CourseGradeBatch
 from .subsection_grade import SubsectionGradeFactory
 from ..transformer import GradesTransformer
 
@@ -24,15 +28,23 @@ from ..transformer import GradesTransformer
 log = getLogger(__name__)
 
 
+# Waffle switch for grading students in batches in CourseGradeFactory.iter.
+BATCH_GRADING_SWITCH = 'grades_batch_grading'
+
+# Number of students graded together by CourseGradeFactory.iter.
+GRADING_BATCH_SIZE = 100
+
+
 class CourseGrade(object):
     """
     Course Grade class
     """
-    def __init__(self, student, course, course_structure):
+    def __init__(self, student, course, course_structure, subsection_grade_factory=None, grade_breakdown=None):
         self.student = student
         self.course = course
         self._percent = None
         self._letter_grade = None
+        self._grade_breakdown = grade_breakdown
 
         self.course_structure = course_structure
         if self.course_structure:
@@ -40,7 +52,10 @@ class CourseGrade(object):
             self.course_version = getattr(course_block, 'course_version', None)
             self.course_edited_timestamp = getattr(course_block, 'subtree_edited_on', None)
 
-        self._subsection_grade_factory = SubsectionGradeFactory(self.student, self.course, self.course_structure)
+        self._subsection_grade_factory = (
+            subsection_grade_factory or
+            SubsectionGradeFactory(self.student, self.course, self.course_structure)
+        )
 
     @lazy
     def graded_subsections_by_format(self):
@@ -85,6 +100,17 @@ class CourseGrade(object):
         self._log_event(log.warning, u"grade_value, percent: {0}, grade: {1}".format(percent, letter_grade))
         return grade_value
 
+    @property
+    def grade_breakdown(self):
+        """
+        Returns the contribution of each category of the course's grader
+        to the grade, keyed by category, as in grade_value.  When the
+        grade was computed in a batch, the course isn't graded again.
+        """
+        if self._grade_breakdown is None:
+            self._grade_breakdown = self.grade_value['grade_breakdown']
+        return self._grade_breakdown
+
     @lazy
     def chapter_grades(self):
         """
@@ -220,7 +246,7 @@ class CourseGrade(object):
         )
 
     @classmethod
-    def load_persisted_grade(cls, user, course, course_structure):
+    def load_persisted_grade(cls, user, course, course_structure, subsection_grade_factory=None):
         """
         Initializes a CourseGrade object, filling its members with persisted values from the database.
 
@@ -232,7 +258,7 @@ class CourseGrade(object):
             persistent_grade = PersistentCourseGrade.read_course_grade(user.id, course.id)
         except PersistentCourseGrade.DoesNotExist:
             return None
-        course_grade = CourseGrade(user, course, course_structure)
+        course_grade = CourseGrade(user, course, course_structure, subsection_grade_factory)
 
         current_grading_policy_hash = course_grade.get_grading_policy_hash(course.location, course_structure)
         if current_grading_policy_hash != persistent_grade.grading_policy_hash:
@@ -271,7 +297,14 @@ class CourseGrade(object):
         """
         Helper for percent calculation.
         """
-        return round(grade_value['percent'] * 100 + 0.05) / 100
+        return CourseGrade._round_percent(grade_value['percent'])
+
+    @staticmethod
+    def _round_percent(percent):
+        """
+        Helper for rounding a percent calculated by the course's grader.
+        """
+        return round(percent * 100 + 0.05) / 100
 
     def _compute_letter_grade(self, percentage):
         """
@@ -328,11 +361,13 @@ class CourseGradeFactory(object):
     """
     Factory class to create Course Grade objects
     """
-    def create(self, student, course, collected_block_structure=None, read_only=True):
+    def create(self, student, course, collected_block_structure=None, read_only=True, prefetched_scores=None):
         """
         Returns the CourseGrade object for the given student and course.
 
         If read_only is True, doesn't save any updates to the grades.
+        If prefetched_scores (scores.PrefetchedScores) are given, the
+        student's scores are not queried.
         Raises a PermissionDenied if the user does not have course access.
         """
         course_structure = get_course_blocks(
@@ -345,9 +380,10 @@ class CourseGradeFactory(object):
         if not self._user_has_access_to_course(course_structure):
             raise PermissionDenied("User does not have access to this course")
 
+        subsection_grade_factory = SubsectionGradeFactory(student, course, course_structure, prefetched_scores)
         return (
-            self._get_saved_grade(student, course, course_structure) or
-            self._compute_and_update_grade(student, course, course_structure, read_only)
+            self._get_saved_grade(student, course, course_structure, subsection_grade_factory) or
+            self._compute_and_update_grade(student, course, course_structure, read_only, subsection_grade_factory)
         )
 
     GradeResult = namedtuple('GradeResult', ['student', 'course_grade', 'err_msg'])
@@ -361,6 +397,9 @@ class CourseGradeFactory(object):
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        When the BATCH_GRADING_SWITCH is active, students are graded in
+        batches, each computed at once by a CourseGradeBatch.
         """
         # Pre-fetch the collected course_structure so:
         # 1. Correctness: the same version of the course is used to
@@ -369,23 +408,12 @@ class CourseGradeFactory(object):
         #    retrieved from the data store multiple times.
 
         collected_block_structure = get_block_structure_manager(course.id).get_collected()
-        for student in students:
-            with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=[u'action:{}'.format(course.id)]):
-                try:
-                    course_grade = CourseGradeFactory().create(student, course, collected_block_structure)
-                    yield self.GradeResult(student, course_grade, "")
-
-                except Exception as exc:  # pylint: disable=broad-except
-                    # Keep marching on even if this student couldn't be graded for
-                    # some reason, but log it for future reference.
-                    log.exception(
-                        'Cannot grade student %s (%s) in course %s because of exception: %s',
-                        student.username,
-                        student.id,
-                        course.id,
-                        exc.message
-                    )
-                    yield self.GradeResult(student, None, exc.message)
+        if self._can_grade_in_batches(course):
+            grade_results = self._iter_batches(course, students, collected_block_structure)
+        else:
+            grade_results = self._iter_students(course, students, collected_block_structure)
+        for grade_result in grade_results:
+            yield grade_result
 
     def update(self, student, course, course_structure):
         """
@@ -403,7 +431,152 @@ class CourseGradeFactory(object):
 
         return CourseGrade.get_persisted_grade(student, course)
 
-    def _get_saved_grade(self, student, course, course_structure):
+    def _can_grade_in_batches(self, course):
+        """
+        Returns whether the grades of the students in the given course
+        can be computed in batches by CourseGradeBatch.
+
+        Batches compute grades freshly, so they are not used for courses
+        with persisted grades.
+        """
+        return (
+            switch_is_active(BATCH_GRADING_SWITCH) and
+            not settings.GENERATE_PROFILE_SCORES and
+            not PersistentGradesEnabledFlag.feature_enabled(course.id) and
+            CourseGradeBatch.is_supported(course)
+        )
+
+    def _iter_students(self, course, students, collected_block_structure):
+        """
+        Yields a GradeResult for each of the given students, grading
+        one student at a time, with the scores of GRADING_BATCH_SIZE
+        students prefetched at a time.
+
+        Scores are not prefetched for courses with persisted grades,
+        which are read rather than computed from the scores.  If the
+        scores of a batch can't be prefetched, its students' scores
+        are queried for each student instead.
+        """
+        prefetch = not PersistentGradesEnabledFlag.feature_enabled(course.id)
+        if prefetch:
+            scorable_locations = [block_key for block_key in collected_block_structure if possibly_scored(block_key)]
+        for batch_students in self._iter_student_batches(students):
+            prefetched_scores = {}
+            if prefetch:
+                try:
+                    prefetched_scores = prefetch_scores(course.id, batch_students, scorable_locations)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception(u'Cannot prefetch the scores of a batch of students in course %s', course.id)
+            for student in batch_students:
+                with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=[u'action:{}'.format(course.id)]):
+                    try:
+                        course_grade = CourseGradeFactory().create(
+                            student,
+                            course,
+                            collected_block_structure,
+                            prefetched_scores=prefetched_scores.get(student.id),
+                        )
+                        yield self.GradeResult(student, course_grade, "")
+
+                    except Exception as exc:  # pylint: disable=broad-except
+                        # Keep marching on even if this student couldn't be graded for
+                        # some reason, but log it for future reference.
+                        yield self._grade_failure(course, student, exc)
+
+    def _iter_batches(self, course, students, collected_block_structure):
+        """
+        Yields a GradeResult for each of the given students, grading
+        GRADING_BATCH_SIZE students at a time.
+        """
+        # Grading policy might be overriden by a CCX, need to reset it
+        course.set_grading_policy(course.grading_policy)
+
+        for batch_students in self._iter_student_batches(students):
+            with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter_batch', tags=[u'action:{}'.format(course.id)]):
+                grade_results = self._grade_batch(course, batch_students, collected_block_structure)
+            for grade_result in grade_results:
+                yield grade_result
+
+    @staticmethod
+    def _iter_student_batches(students):
+        """
+        Yields lists of GRADING_BATCH_SIZE students from the given
+        iterable of students.
+        """
+        students = iter(students)
+        while True:
+            batch_students = list(islice(students, GRADING_BATCH_SIZE))
+            if not batch_students:
+                break
+            yield batch_students
+
+    def _grade_batch(self, course, students, collected_block_structure):
+        """
+        Returns a list of GradeResults for the given students, computed
+        together in a CourseGradeBatch.
+        """
+        grade_results = OrderedDict()
+        batch_students = []
+        course_structures = []
+        for student in students:
+            try:
+                course_structure = get_course_blocks(
+                    student,
+                    course.location,
+                    collected_block_structure=collected_block_structure,
+                )
+                if not self._user_has_access_to_course(course_structure):
+                    raise PermissionDenied("User does not have access to this course")
+            except Exception as exc:  # pylint: disable=broad-except
+                grade_results[student.id] = self._grade_failure(course, student, exc)
+            else:
+                grade_results[student.id] = None
+                batch_students.append(student)
+                course_structures.append(course_structure)
+
+        try:
+            batch = CourseGradeBatch(course, collected_block_structure, batch_students, course_structures)
+        except Exception as exc:  # pylint: disable=broad-except
+            for student in batch_students:
+                grade_results[student.id] = self._grade_failure(course, student, exc)
+            return grade_results.values()
+
+        for index, (student, course_structure) in enumerate(zip(batch_students, course_structures)):
+            course_grade = CourseGrade(
+                student,
+                course,
+                course_structure,
+                subsection_grade_factory=batch.subsection_grade_factory(index),
+                grade_breakdown=batch.grade_breakdown(index),
+            )
+            # pylint: disable=protected-access
+            course_grade._percent = CourseGrade._round_percent(float(batch.percents[index]))
+            course_grade._letter_grade = course_grade._compute_letter_grade(course_grade._percent)
+            course_grade._signal_listeners_when_grade_computed()
+            grade_results[student.id] = self.GradeResult(student, course_grade, "")
+
+        log.info(
+            u"Persistent Grades: CourseGradeFactory.iter, course: %s, students graded in batch: %s",
+            course.id,
+            len(batch_students),
+        )
+        return grade_results.values()
+
+    def _grade_failure(self, course, student, exc):
+        """
+        Logs the exception that occurred while grading the given student
+        and returns the student's GradeResult.
+        """
+        log.exception(
+            'Cannot grade student %s (%s) in course %s because of exception: %s',
+            student.username,
+            student.id,
+            course.id,
+            exc.message
+        )
+        return self.GradeResult(student, None, exc.message)
+
+    def _get_saved_grade(self, student, course, course_structure, subsection_grade_factory=None):
         """
         Returns the saved grade for the given course and student.
         """
@@ -413,16 +586,19 @@ class CourseGradeFactory(object):
         return CourseGrade.load_persisted_grade(
             student,
             course,
-            course_structure
+            course_structure,
+            subsection_grade_factory,
         )
 
-    def _compute_and_update_grade(self, student, course, course_structure, read_only=False):
+    def _compute_and_update_grade(
+            self, student, course, course_structure, read_only=False, subsection_grade_factory=None,
+    ):
         """
         Freshly computes and updates the grade for the student and course.
 
         If read_only is True, doesn't save any updates to the grades.
         """
-        course_grade = CourseGrade(student, course, course_structure)
+        course_grade = CourseGrade(student, course, course_structure, subsection_grade_factory)
         course_grade.compute_and_update(read_only)
         return course_grade
 
@@ -203,7 +203,11 @@ class SubsectionGradeFactory(object):
     """
     Factory for Subsection Grades.
     """
-    def __init__(self, student, course, course_structure):
+    def __init__(self, student, course, course_structure, prefetched_scores=None):
+        """
+        If prefetched_scores (scores.PrefetchedScores) are given, they are
+        used instead of querying for the student's scores.
+        """
         self.student = student
         self.course = course
         self.course_structure = course_structure
@@ -211,6 +215,10 @@ class SubsectionGradeFactory(object):
         self._cached_subsection_grades = None
         self._unsaved_subsection_grades = []
 
+        if prefetched_scores is not None:
+            self._csm_scores = prefetched_scores.csm_scores
+            self._submissions_scores = prefetched_scores.submissions_scores
+
     def create(self, subsection, read_only=False):
         """
         Returns the SubsectionGrade object for the student and subsection.
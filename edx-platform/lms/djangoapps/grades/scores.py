@@ -1,9 +1,14 @@
 """
 Functionality for problem scores.
 """
+from collections import namedtuple
 from logging import getLogger
 
+from courseware.model_data import ScoresClient
+from courseware.models import chunks
 from openedx.core.lib.cache_utils import memoized
+from student.models import anonymous_id_for_user
+from submissions.models import ScoreSummary
 from xblock.core import XBlock
 from xmodule.block_metadata_utils import display_name_with_default_escaped
 from xmodule.graders import ProblemScore
@@ -13,6 +18,13 @@ from .transformer import GradesTransformer
 log = getLogger(__name__)
 
 
+# Number of users whose scores are fetched by a single query.
+PREFETCH_CHUNK_SIZE = 500
+
+# The scores of a user, in the storages accepted by get_score.
+PrefetchedScores = namedtuple('PrefetchedScores', 'csm_scores submissions_scores')
+
+
 def possibly_scored(usage_key):
     """
     Returns whether the given block could impact grading (i.e.
@@ -21,6 +33,53 @@ def possibly_scored(usage_key):
     return usage_key.block_type in _block_types_possibly_scored()
 
 
+def prefetch_scores(course_key, users, scorable_locations):
+    """
+    Returns the scores of each of the given users in the given course, as
+    a dict of PrefetchedScores keyed by user id.  Scores are fetched with
+    a query per storage for each chunk of PREFETCH_CHUNK_SIZE users,
+    rather than for each user, so that the grades of many users can be
+    computed without any further queries for their scores.
+    """
+    csm_scores = ScoresClient.create_for_users(
+        course_key,
+        [user.id for user in users],
+        scorable_locations,
+        chunk_size=PREFETCH_CHUNK_SIZE,
+    )
+    submissions_scores = get_submissions_scores(course_key, users)
+    return {
+        user.id: PrefetchedScores(csm_scores[user.id], submissions_scores[user.id])
+        for user in users
+    }
+
+
+def get_submissions_scores(course_key, users):
+    """
+    Returns the scores stored by the Submissions API for each of the given
+    users in the given course, as a dict keyed by user id of dicts of
+    {unicode(usage_key): (earned, possible)}, same as submissions_api.get_scores
+    returns for a single user.
+    """
+    # The anonymous ids are computed, and need not be saved, to look up
+    # the users' existing submissions.
+    anonymous_user_ids = {anonymous_id_for_user(user, course_key, save=False): user.id for user in users}
+    submissions_scores = {user.id: {} for user in users}
+    for anonymous_user_ids_chunk in chunks(anonymous_user_ids.keys(), PREFETCH_CHUNK_SIZE):
+        score_summaries = ScoreSummary.objects.filter(
+            student_item__course_id=unicode(course_key),
+            student_item__student_id__in=anonymous_user_ids_chunk,
+        ).select_related('latest', 'student_item')
+        for score_summary in score_summaries.iterator():
+            if not score_summary.latest.is_hidden():
+                user_id = anonymous_user_ids[score_summary.student_item.student_id]
+                submissions_scores[user_id][score_summary.student_item.item_id] = (
+                    score_summary.latest.points_earned,
+                    score_summary.latest.points_possible,
+                )
+    return submissions_scores
+
+
 def get_score(submissions_scores, csm_scores, persisted_block, block):
     """
     Returns the score for a problem, as a ProblemScore object.  It is
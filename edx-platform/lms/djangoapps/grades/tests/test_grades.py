@@ -3,9 +3,11 @@ Test grade calculation.
 """
 
 import ddt
+from django.conf import settings
 import itertools
 from mock import patch
 from nose.plugins.attrib import attr
+from waffle.testutils import override_switch
 
 from capa.tests.response_xml_factory import MultipleChoiceResponseXMLFactory
 from courseware.model_data import set_score
@@ -23,7 +25,8 @@ from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 
 from .utils import answer_problem
 from ..module_grades import get_module_score
-from ..new.course_grade import CourseGradeFactory
+from ..new.batch_grade import CourseGradeBatch
+from ..new.course_grade import BATCH_GRADING_SWITCH, CourseGradeFactory
 from ..new.subsection_grade import SubsectionGradeFactory
 
 
@@ -121,6 +124,31 @@ class TestGradeIteration(SharedModuleStoreTestCase):
         self.assertIsNotNone(all_course_grades[student2])
         self.assertIsNotNone(all_course_grades[student5])
 
+    @patch.dict(settings.FEATURES, {'PERSISTENT_GRADES_ENABLED_FOR_ALL_TESTS': False})
+    @patch('lms.djangoapps.grades.new.course_grade.prefetch_scores')
+    def test_prefetch_scores_exception(self, mock_prefetch_scores):
+        """
+        Test that students are still graded, with their scores queried one
+        student at a time, if their scores can't be prefetched.
+        """
+        mock_prefetch_scores.side_effect = Exception("Error prefetching scores.")
+        all_course_grades, all_errors = self._course_grades_and_errors_for(self.course, self.students)
+        self.assertTrue(mock_prefetch_scores.called)
+        self.assertEqual(all_errors, {})
+        self.assertEqual(len(all_course_grades), 5)
+        for course_grade in all_course_grades.values():
+            self.assertEqual(course_grade.percent, 0.0)
+
+    @patch.dict(settings.FEATURES, {'PERSISTENT_GRADES_ENABLED_FOR_ALL_TESTS': True})
+    @patch('lms.djangoapps.grades.new.course_grade.prefetch_scores')
+    def test_no_prefetch_with_persistent_grades(self, mock_prefetch_scores):
+        """
+        Test that scores aren't prefetched for courses with persisted grades.
+        """
+        __, all_errors = self._course_grades_and_errors_for(self.course, self.students)
+        self.assertEqual(all_errors, {})
+        self.assertFalse(mock_prefetch_scores.called)
+
     def _course_grades_and_errors_for(self, course, students):
         """
         Simple helper method to iterate through student grades and give us
@@ -139,6 +167,112 @@ class TestGradeIteration(SharedModuleStoreTestCase):
         return students_to_course_grades, students_to_errors
 
 
+@attr(shard=1)
+@patch.dict(settings.FEATURES, {'PERSISTENT_GRADES_ENABLED_FOR_ALL_TESTS': False})
+class TestGradeIterationInBatches(SharedModuleStoreTestCase):
+    """
+    Test that grading students in batches computes the same grades as
+    grading them one at a time.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(TestGradeIterationInBatches, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent=cls.course, category="chapter", display_name="chapter")
+        problem_xml = MultipleChoiceResponseXMLFactory().build_xml(
+            question_text='The correct answer is Choice 3',
+            choices=[False, False, True, False],
+            choice_names=['choice_0', 'choice_1', 'choice_2', 'choice_3']
+        )
+        cls.problems = []
+        for index in range(3):
+            sequential = ItemFactory.create(
+                parent=chapter,
+                category="sequential",
+                display_name="sequential_{}".format(index),
+                graded=True,
+                format="Homework",
+            )
+            vertical = ItemFactory.create(parent=sequential, category="vertical", display_name="vertical")
+            cls.problems.append(
+                ItemFactory.create(
+                    parent=vertical,
+                    category="problem",
+                    display_name="problem_{}".format(index),
+                    data=problem_xml,
+                    weight=index or None,
+                )
+            )
+
+    def setUp(self):
+        super(TestGradeIterationInBatches, self).setUp()
+        self.course.set_grading_policy({
+            "GRADER": [
+                {
+                    "type": "Homework",
+                    "min_count": 4,
+                    "drop_count": 1,
+                    "short_label": "HW",
+                    "weight": 1.0,
+                },
+            ],
+            "GRADE_CUTOFFS": {
+                "Pass": 0.5,
+            },
+        })
+        self.students = [UserFactory.create() for __ in range(5)]
+        for index, student in enumerate(self.students):
+            for problem in self.problems[:index]:
+                set_score(student.id, problem.location, index % 2, 1)
+
+    def test_empty_student_list(self):
+        with override_switch(BATCH_GRADING_SWITCH, active=True):
+            self.assertEqual(list(CourseGradeFactory().iter(self.course, [])), [])
+
+    @patch('lms.djangoapps.grades.new.course_grade.GRADING_BATCH_SIZE', 2)
+    def test_batch_grades(self):
+        expected_course_grades = self._course_grades(batch_grading=False)
+        with patch(
+            'lms.djangoapps.grades.new.course_grade.CourseGradeBatch',
+            wraps=CourseGradeBatch,
+        ) as mock_course_grade_batch:
+            course_grades = self._course_grades(batch_grading=True)
+            self.assertEqual(mock_course_grade_batch.call_count, 3)
+
+        # The grade breakdowns of batch grades come from the batch, without grading each student again.
+        with patch('xmodule.graders.WeightedSubsectionsGrader.grade') as mock_grade:
+            grade_breakdowns = [course_grade.grade_breakdown for course_grade in course_grades]
+            self.assertFalse(mock_grade.called)
+        for expected_course_grade, grade_breakdown in zip(expected_course_grades, grade_breakdowns):
+            expected_grade_breakdown = expected_course_grade.grade_value['grade_breakdown']
+            self.assertEqual(grade_breakdown.keys(), expected_grade_breakdown.keys())
+            for category, breakdown in expected_grade_breakdown.iteritems():
+                self.assertAlmostEqual(grade_breakdown[category]['percent'], breakdown['percent'])
+
+        for expected_course_grade, course_grade in zip(expected_course_grades, course_grades):
+            self.assertEqual(course_grade.percent, expected_course_grade.percent)
+            self.assertEqual(course_grade.letter_grade, expected_course_grade.letter_grade)
+            self.assertEqual(course_grade.locations_to_scores, expected_course_grade.locations_to_scores)
+            self.assertEqual(course_grade.summary, expected_course_grade.summary)
+            for chapter, expected_chapter in zip(course_grade.chapter_grades, expected_course_grade.chapter_grades):
+                for subsection_grade, expected_subsection_grade in zip(
+                        chapter['sections'], expected_chapter['sections'],
+                ):
+                    self.assertEqual(subsection_grade.all_total, expected_subsection_grade.all_total)
+                    self.assertEqual(subsection_grade.graded_total, expected_subsection_grade.graded_total)
+
+    def _course_grades(self, batch_grading):
+        """
+        Returns the course grades of the students, as computed by
+        CourseGradeFactory.iter.
+        """
+        with override_switch(BATCH_GRADING_SWITCH, active=batch_grading):
+            grade_results = list(CourseGradeFactory().iter(self.course, self.students))
+        self.assertEqual([student for student, __, __ in grade_results], self.students)
+        self.assertEqual([err_msg for __, __, err_msg in grade_results], [""] * len(self.students))
+        return [course_grade for __, course_grade, __ in grade_results]
+
+
 @ddt.ddt
 class TestWeightedProblems(SharedModuleStoreTestCase):
     """
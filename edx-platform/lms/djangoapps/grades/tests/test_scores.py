@@ -7,11 +7,16 @@ import ddt
 from django.test import TestCase
 import itertools
 
+from courseware.model_data import ScoresClient, set_score
 from lms.djangoapps.grades.models import BlockRecord
 import lms.djangoapps.grades.scores as scores
 from lms.djangoapps.grades.transformer import GradesTransformer
+from mock import patch
 from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
 from openedx.core.lib.block_structure.block_structure import BlockData
+from student.models import anonymous_id_for_user
+from student.tests.factories import UserFactory
+from submissions import api as submissions_api
 from xmodule.graders import ProblemScore
 
 
@@ -306,3 +311,53 @@ class TestInternalGetScoreFromBlock(TestCase):
         block = self._create_block(block_r_possible)
         block_record = BlockRecord(block.location, 0, persisted_block_r_possible, False)
         self._verify_score_result(block_record, block, weight, persisted_block_r_possible)
+
+
+class TestPrefetchScores(TestCase):
+    """
+    Tests for prefetch_scores.
+    """
+    def setUp(self):
+        super(TestPrefetchScores, self).setUp()
+        self.course_key = CourseLocator(u'org', u'course', u'run')
+        self.locations = [BlockUsageLocator(self.course_key, 'problem', 'problem_{}'.format(i)) for i in range(3)]
+        self.users = [UserFactory.create() for __ in range(4)]
+        for index, user in enumerate(self.users):
+            for location in self.locations[:index]:
+                set_score(user.id, location, index, 5)
+            if index % 2:
+                student_item = {
+                    'student_id': anonymous_id_for_user(user, self.course_key),
+                    'course_id': unicode(self.course_key),
+                    'item_id': unicode(self.locations[0]),
+                    'item_type': 'openassessment',
+                }
+                submission = submissions_api.create_submission(student_item, 'any answer')
+                submissions_api.set_score(submission['uuid'], index, 3)
+
+    def test_prefetch_scores(self):
+        with self.assertNumQueries(2):
+            prefetched_scores = scores.prefetch_scores(self.course_key, self.users, self.locations)
+
+        self.assertItemsEqual(prefetched_scores.keys(), [user.id for user in self.users])
+        for user in self.users:
+            expected_csm_scores = ScoresClient.create_for_locations(self.course_key, user.id, self.locations)
+            for location in self.locations:
+                self.assertEqual(prefetched_scores[user.id].csm_scores.get(location), expected_csm_scores.get(location))
+            self.assertEqual(
+                prefetched_scores[user.id].submissions_scores,
+                submissions_api.get_scores(unicode(self.course_key), anonymous_id_for_user(user, self.course_key)),
+            )
+
+    @patch('lms.djangoapps.grades.scores.PREFETCH_CHUNK_SIZE', 3)
+    def test_prefetch_scores_in_chunks(self):
+        with self.assertNumQueries(4):
+            prefetched_scores = scores.prefetch_scores(self.course_key, self.users, self.locations)
+        self.assertEqual(
+            [len(list(prefetched_scores[user.id].csm_scores.iteritems())) for user in self.users],
+            [0, 1, 2, 3],
+        )
+        self.assertEqual(
+            [len(prefetched_scores[user.id].submissions_scores) for user in self.users],
+            [0, 1, 0, 1],
+        )
@@ -246,6 +246,17 @@ class TestSetDueDateExtension(ModuleStoreTestCase):
             tools.set_due_date_extension(self.course, self.week1, self.user, extended)
             self._clear_field_data_cache()
 
+    def test_get_due_date_extension_num_queries(self):
+        extended = datetime.datetime(2013, 12, 25, 0, 0, tzinfo=utc)
+        tools.set_due_date_extension(self.course, self.week1, self.user, extended)
+        self._clear_field_data_cache()
+        # All of the user's overrides in the course are loaded at once.
+        with self.assertNumQueries(1):
+            self.assertEqual(self.week1.due, extended)
+            self.assertEqual(self.homework.due, extended)
+            self.assertEqual(self.assignment.due, extended)
+            self.assertEqual(self.week2.due, self.due)
+
     def test_set_due_date_extension_invalid_date(self):
         extended = datetime.datetime(2009, 1, 1, 0, 0, tzinfo=utc)
         with self.assertRaises(tools.DashboardError):
@@ -221,6 +221,16 @@ class ReportStore(object):
         for row in rows:
             yield [unicode(item).encode('utf-8') for item in row]
 
+    def write_rows(self, output_buffer, rows):
+        """
+        Given a file-like `output_buffer` and rows (each row is an iterable
+        of strings), write the rows to the buffer in the csv format used by
+        `store_rows`.  This allows large reports to be written to a file
+        incrementally and later passed to `store`.
+        """
+        csvwriter = csv.writer(output_buffer)
+        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+
 
 class DjangoStorageReportStore(ReportStore):
     """
@@ -266,11 +276,29 @@ class DjangoStorageReportStore(ReportStore):
         strings), write the rows to the storage backend in csv format.
         """
         output_buffer = ContentFile('')
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+        self.write_rows(output_buffer, rows)
         output_buffer.seek(0)
         self.store(course_id, filename, output_buffer)
 
+    def open(self, course_id, filename):
+        """
+        Return a file-like object for reading the file `filename` stored for
+        `course_id`.
+        """
+        return self.storage.open(self.path_to(course_id, filename))
+
+    def exists(self, course_id, filename):
+        """
+        Return whether the file `filename` is stored for `course_id`.
+        """
+        return self.storage.exists(self.path_to(course_id, filename))
+
+    def delete(self, course_id, filename):
+        """
+        Delete the file `filename` stored for `course_id`, if any.
+        """
+        self.storage.delete(self.path_to(course_id, filename))
+
     def links_for(self, course_id):
         """
         For a given `course_id`, return a list of `(filename, url)` tuples.
@@ -31,11 +31,13 @@ from lms.djangoapps.instructor_task.tasks_helper import (
     run_main_task,
     BaseInstructorTask,
     perform_module_state_update,
-    rescore_problem_module_state,
+    rescore_problem_module_states,
+    rescore_problem_module_state_chunk,
     reset_attempts_module_state,
     delete_problem_module_state,
     upload_problem_responses_csv,
     upload_grades_csv,
+    upload_grade_report_chunk,
     upload_problem_grade_report,
     upload_students_csv,
     cohort_students_and_upload,
@@ -73,16 +75,26 @@ def rescore_problem(entry_id, xmodule_instance_args):
     """
     # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
     action_name = ugettext_noop('rescored')
-    update_fcn = partial(rescore_problem_module_state, xmodule_instance_args)
 
     def filter_fcn(modules_to_update):
         """Filter that matches problems which are marked as being done"""
         return modules_to_update.filter(state__contains='"done": true')
 
-    visit_fcn = partial(perform_module_state_update, update_fcn, filter_fcn)
+    visit_fcn = partial(rescore_problem_module_states, xmodule_instance_args, filter_fcn)
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
+@task(base=BaseInstructorTask, routing_key=settings.RESCORE_STUDENT_MODULES_ROUTING_KEY)  # pylint: disable=not-callable
+def rescore_problem_chunk(entry_id, xmodule_instance_args, module_items, action_name, subtask_status_dict):
+    """
+    Rescores a problem for a chunk of the students of a rescore task that is
+    done by several subtasks.
+    """
+    return rescore_problem_module_state_chunk(
+        entry_id, xmodule_instance_args, module_items, action_name, subtask_status_dict
+    )
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def reset_problem_attempts(entry_id, xmodule_instance_args):
     """Resets problem attempts to zero for a particular problem for all students in a course.
@@ -193,6 +205,18 @@ def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def generate_grade_report_chunk(entry_id, report_name, chunk_index, student_items, timestamp_str, subtask_status_dict):
+    """
+    Grade a chunk of the students of a grade report that is generated by
+    several subtasks, and store their rows as a partial report.  The last
+    subtask to complete merges the partial reports into the final report.
+    """
+    return upload_grade_report_chunk(
+        entry_id, report_name, chunk_index, student_items, timestamp_str, subtask_status_dict
+    )
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def calculate_students_features_csv(entry_id, xmodule_instance_args):
     """
@@ -5,10 +5,14 @@ running state of a course.
 """
 import json
 import logging
+import shutil
+import traceback
 from StringIO import StringIO
 from collections import OrderedDict
 from datetime import datetime
-from itertools import chain
+from functools import partial
+from itertools import chain, count
+from tempfile import TemporaryFile
 from time import time
 
 import dogstats_wrapper as dog_stats_api
@@ -18,6 +22,7 @@ from celery import Task, current_task
 from celery.states import SUCCESS, FAILURE
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.files import File
 from django.core.files.storage import DefaultStorage
 from django.db import reset_queries
 from django.db.models import Q
@@ -59,11 +64,21 @@ from shoppingcart.models import (
 )
 from openassessment.data import OraAggregateData
 from lms.djangoapps.instructor_task.models import ReportStore, InstructorTask, PROGRESS
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    complete_subtasks_task,
+    queue_subtasks_for_query,
+    update_subtask_status,
+)
 from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
-from opaque_keys.edx.keys import UsageKey
-from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, is_course_cohorted
+from openedx.core.djangoapps.course_groups.cohorts import (
+    BULK_COHORT_BATCH_SIZE,
+    add_users_to_cohort,
+    is_course_cohorted,
+)
 from student.models import CourseEnrollment, CourseAccessRole
 from survey.models import SurveyAnswer
 from track.event_transaction_utils import set_event_transaction_type, create_new_event_transaction_id
@@ -89,6 +104,9 @@ GRADES_RESCORE_EVENT_TYPE = 'edx.grades.problem.rescored'
 # The setting name used for events when "settings" (account settings, preferences, profile information) change.
 REPORT_REQUESTED_EVENT_NAME = u'edx.instructor.report.requested'
 
+# The format of the timestamps in the names of report files.
+REPORT_TIMESTAMP_FORMAT = "%Y-%m-%d-%H%M"
+
 
 class BaseInstructorTask(Task):
     """
@@ -159,6 +177,9 @@ class BaseInstructorTask(Task):
 
         Note that there is no way to record progress made within the task (e.g. attempted,
         succeeded, etc.) when such failures occur.
+
+        Failures of subtasks are left for the subtasks to record in their own status,
+        as the InstructorTask is only done once all of its subtasks are.
         """
         TASK_LOG.debug(u'Task %s: failure returned', task_id)
         entry_id = args[0]
@@ -169,6 +190,9 @@ class BaseInstructorTask(Task):
             # trying to update it.
             TASK_LOG.error(u"Task (%s) has no InstructorTask object for id %s", task_id, entry_id)
         else:
+            if task_id != entry.task_id and len(entry.subtasks) > 0:
+                TASK_LOG.warning(u"Subtask (%s) of InstructorTask %s failed", task_id, entry_id, exc_info=True)
+                return
             TASK_LOG.warning(u"Task (%s) failed", task_id, exc_info=True)
             entry.task_output = InstructorTask.create_output_for_failure(einfo.exception, einfo.traceback)
             entry.task_state = FAILURE
@@ -182,6 +206,13 @@ class UpdateProblemModuleStateError(Exception):
     Used when the current module cannot be processed and no more
     modules should be attempted.
     """
+
+
+class GradeReportSubtasksError(Exception):
+    """
+    Error signaling that a grade report generated by subtasks can't be
+    uploaded because some of its subtasks failed.
+    """
     pass
 
 
@@ -339,16 +370,29 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
 
     """
     start_time = time()
-    usage_keys = []
+    problems, modules_to_update = _get_modules_to_update(course_id, task_input, filter_fcn)
+
+    task_progress = TaskProgress(action_name, modules_to_update.count(), start_time)
+    task_progress.update_task_state()
+
+    _update_module_states(update_fcn, problems, modules_to_update, task_input, task_progress, action_name)
+
+    return task_progress.update_task_state()
+
+
+def _get_problems_to_update(course_id, task_input):
+    """
+    Returns a dict mapping the usage keys of the problems specified by the
+    'problem_url' or 'entrance_exam_url' of `task_input`, as strings, to
+    their descriptors.
+    """
+    problems = {}
     problem_url = task_input.get('problem_url')
     entrance_exam_url = task_input.get('entrance_exam_url')
-    student_identifier = task_input.get('student')
-    problems = {}
 
     # if problem_url is present make a usage key from it
     if problem_url:
         usage_key = course_id.make_usage_key_from_deprecated_string(problem_url)
-        usage_keys.append(usage_key)
 
         # find the problem descriptor:
         problem_descriptor = modulestore().get_item(usage_key)
@@ -357,7 +401,19 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     # if entrance_exam is present grab all problems in it
     if entrance_exam_url:
         problems = get_problems_in_section(entrance_exam_url)
-        usage_keys = [UsageKey.from_string(location) for location in problems.keys()]
+
+    return problems
+
+
+def _get_modules_to_update(course_id, task_input, filter_fcn):
+    """
+    Returns the problems specified by `task_input`, as returned by
+    `_get_problems_to_update`, and a query of the StudentModules to update
+    for them, filtered by `filter_fcn` if it's not None.
+    """
+    problems = _get_problems_to_update(course_id, task_input)
+    usage_keys = [problem.location for problem in problems.itervalues()]
+    student_identifier = task_input.get('student')
 
     # find the modules in question
     modules_to_update = StudentModule.objects.filter(course_id=course_id, module_state_key__in=usage_keys)
@@ -379,10 +435,18 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     if filter_fcn is not None:
         modules_to_update = filter_fcn(modules_to_update)
 
-    task_progress = TaskProgress(action_name, modules_to_update.count(), start_time)
-    task_progress.update_task_state()
+    return problems, modules_to_update
+
 
-    for module_to_update in modules_to_update:
+def _update_module_states(update_fcn, problems, modules_to_update, task_input, task_progress, action_name):
+    """
+    Calls `update_fcn` on each of the StudentModules of the query
+    `modules_to_update`, and counts the results in `task_progress`.
+    See `perform_module_state_update`.
+    """
+    # The students are fetched along with their modules, since all the
+    # update functions use them.
+    for module_to_update in modules_to_update.select_related('student'):
         task_progress.attempted += 1
         module_descriptor = problems[unicode(module_to_update.module_state_key)]
         # There is no try here:  if there's an error, we let it throw, and the task will
@@ -400,9 +464,165 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
             else:
                 raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(update_status))
 
+
+def rescore_problem_module_states(xmodule_instance_args, filter_fcn, entry_id, course_id, task_input, action_name):
+    """
+    Rescores the StudentModules of the problems specified by `task_input`,
+    as `perform_module_state_update` does with `rescore_problem_module_state`
+    as its update function, loading the course only once for all of them.
+
+    When there are more StudentModules to rescore than
+    settings.RESCORE_STUDENT_MODULES_PER_TASK, they are instead chopped up
+    into chunks of at most that many StudentModules, each of which is
+    rescored by its own subtask in parallel.  See `_queue_rescore_subtasks`.
+    """
+    start_time = time()
+    problems, modules_to_update = _get_modules_to_update(course_id, task_input, filter_fcn)
+    total_modules = modules_to_update.count()
+
+    modules_per_task = settings.RESCORE_STUDENT_MODULES_PER_TASK
+    if entry_id is not None and modules_per_task and total_modules > modules_per_task:
+        TASK_LOG.info(
+            u'InstructorTask ID: %s, Course: %s, Task type: %s, Queueing subtasks to rescore %s modules, '
+            u'%s modules per subtask',
+            entry_id,
+            course_id,
+            action_name,
+            total_modules,
+            modules_per_task,
+        )
+        return _queue_rescore_subtasks(
+            xmodule_instance_args, entry_id, modules_to_update, total_modules, modules_per_task, action_name,
+        )
+
+    task_progress = TaskProgress(action_name, total_modules, start_time)
+    task_progress.update_task_state()
+
+    _rescore_module_states(
+        xmodule_instance_args, course_id, problems, modules_to_update, task_input, task_progress, action_name,
+    )
+
     return task_progress.update_task_state()
 
 
+def _rescore_module_states(xmodule_instance_args, course_id, problems, modules_to_update, task_input, task_progress,
+                           action_name):
+    """
+    Rescores the StudentModules of the query `modules_to_update`, within a
+    single bulk operation on the course, and counts the results in
+    `task_progress`.
+    """
+    with modulestore().bulk_operations(course_id):
+        course = get_course_by_id(course_id)
+        update_fcn = partial(rescore_problem_module_state, xmodule_instance_args, course=course)
+        _update_module_states(update_fcn, problems, modules_to_update, task_input, task_progress, action_name)
+
+
+def _queue_rescore_subtasks(xmodule_instance_args, entry_id, modules_to_update, total_modules, modules_per_task,
+                            action_name):
+    """
+    Queue subtasks that each rescore a chunk of at most `modules_per_task`
+    of the StudentModules of the query `modules_to_update`.  See
+    `rescore_problem_module_state_chunk`.
+
+    Returns the task progress as stored in the InstructorTask object.
+    """
+    # Imported here to avoid a circular import, as the tasks module imports this one.
+    from lms.djangoapps.instructor_task.tasks import rescore_problem_chunk
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # As with grade reports, the same task may be called again when there is a
+    # loss of connection while it is being queued.  If subtasks have already
+    # been defined, there is no need to redefine them.
+    if len(entry.subtasks) > 0 and entry.task_output:
+        TASK_LOG.warning(u"Task %s has already been processed!  InstructorTask = %s", entry.task_id, entry)
+        return json.loads(entry.task_output)
+
+    def _create_rescore_subtask(module_items, initial_subtask_status):
+        """Creates a subtask to rescore a given chunk of StudentModules."""
+        return rescore_problem_chunk.subtask(
+            (
+                entry_id,
+                xmodule_instance_args,
+                module_items,
+                action_name,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+        )
+
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_rescore_subtask,
+        [modules_to_update],
+        [],
+        modules_per_task,
+        total_modules,
+    )
+
+
+def rescore_problem_module_state_chunk(entry_id, xmodule_instance_args, module_items, action_name,
+                                       subtask_status_dict):
+    """
+    Rescore a chunk of the StudentModules of a rescore task that is done by
+    several subtasks.
+
+    Unlike grade reports, rescoring has nothing left to do once its last
+    subtask completes, so the InstructorTask succeeds along with it, with
+    the modules of any failed subtask counted as failed in its progress.
+
+    Arguments:
+        `entry_id` : the id of the InstructorTask that queued the subtask.
+        `xmodule_instance_args` : the arguments used to instantiate the xmodules.
+        `module_items` : a list of dicts with the 'pk' of each StudentModule of the chunk.
+        `action_name` : past-tense verb to use for constructing status messages.
+        `subtask_status_dict` : the subtask's initial status, as a dict.
+
+    Returns the subtask's status, as a dict.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    TASK_LOG.info(
+        u"Preparing to rescore chunk of %s modules as subtask %s for instructor task %d",
+        len(module_items), current_task_id, entry_id,
+    )
+
+    # Check that the requested subtask is actually known to the current InstructorTask entry.
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    task_input = json.loads(entry.task_input)
+    task_progress = TaskProgress(action_name, len(module_items), time())
+    try:
+        problems = _get_problems_to_update(entry.course_id, task_input)
+        modules_to_update = StudentModule.objects.filter(pk__in=[item['pk'] for item in module_items])
+        _rescore_module_states(
+            xmodule_instance_args, entry.course_id, problems, modules_to_update, task_input, task_progress,
+            action_name,
+        )
+    except Exception:
+        TASK_LOG.exception(u"Subtask %s of instructor task %d failed to rescore its modules", current_task_id, entry_id)
+        subtask_status.increment(
+            succeeded=task_progress.succeeded,
+            failed=len(module_items) - task_progress.succeeded - task_progress.skipped,
+            skipped=task_progress.skipped,
+            state=FAILURE,
+        )
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    subtask_status.increment(
+        succeeded=task_progress.succeeded,
+        failed=task_progress.failed,
+        skipped=task_progress.skipped,
+        state=SUCCESS,
+    )
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
 def _get_task_id_from_xmodule_args(xmodule_instance_args):
     """Gets task_id from `xmodule_instance_args` dict, or returns default value if missing."""
     return xmodule_instance_args.get('task_id', UNKNOWN_TASK_ID) if xmodule_instance_args is not None else UNKNOWN_TASK_ID
@@ -476,10 +696,11 @@ def _get_module_instance_for_task(course_id, student, module_descriptor, xmodule
 
 
 @outer_atomic
-def rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module, task_input):
+def rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module, task_input, course=None):
     '''
     Takes an XModule descriptor and a corresponding StudentModule object, and
-    performs rescoring on the student's problem submission.
+    performs rescoring on the student's problem submission.  The `course` of
+    the StudentModule is loaded unless it's given.
 
     Throws exceptions if the rescoring is fatal and should be aborted if in a loop.
     In particular, raises UpdateProblemModuleStateError if module fails to instantiate,
@@ -494,7 +715,8 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
     usage_key = student_module.module_state_key
 
     with modulestore().bulk_operations(course_id):
-        course = get_course_by_id(course_id)
+        if course is None:
+            course = get_course_by_id(course_id)
         # TODO: Here is a call site where we could pass in a loaded course.  I
         # think we certainly need it since grading is happening here, and field
         # overrides would be important in handling that correctly
@@ -655,16 +877,42 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
     report_store = ReportStore.from_config(config_name)
     report_store.store_rows(
         course_id,
-        u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-            course_prefix=course_filename_prefix_generator(course_id),
-            csv_name=csv_name,
-            timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-        ),
+        _report_filename(csv_name, course_id, timestamp.strftime(REPORT_TIMESTAMP_FORMAT)),
         rows
     )
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": csv_name, })
 
 
+def _report_filename(csv_name, course_id, timestamp_str):
+    """
+    Returns the name of the CSV file of the report `csv_name` generated
+    for `course_id` at the time `timestamp_str`.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp_str,
+    )
+
+
+def _upload_report_file(report_store, report_file, csv_name, course_id, timestamp_str):
+    """
+    Upload the CSV data written to the temporary file `report_file` using
+    `report_store`.
+    """
+    _store_report_file(report_store, report_file, course_id, _report_filename(csv_name, course_id, timestamp_str))
+    tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": csv_name, })
+
+
+def _store_report_file(report_store, report_file, course_id, filename):
+    """
+    Store the data written to the temporary file `report_file` as the file
+    `filename` using `report_store`.
+    """
+    report_file.seek(0)
+    report_store.store(course_id, filename, File(report_file, name=filename))
+
+
 def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at, config_name='FINANCIAL_REPORTS'):
     """
     Upload Executive Summary Html file using ReportStore.
@@ -691,7 +939,7 @@ def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": report_name})
 
 
-def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
+def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
     For a given `course_id`, generate a grades CSV file for all students that
     are enrolled, and store using a `ReportStore`. Once created, the files can
@@ -700,109 +948,81 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
     that are visible in ReportStore will be complete ones.
 
-    As we start to add more CSV downloads, it will probably be worthwhile to
-    make a more general CSVDoc class instead of building out the rows like we
-    do here.
+    See `_upload_grade_report` for how the rows of the report are generated.
     """
-    start_time = time()
-    start_date = datetime.now(UTC)
-    status_interval = 100
-    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
-    total_enrolled_students = enrolled_students.count()
-    task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
-
-    fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Input: {task_input}'
-    task_info_string = fmt.format(
-        task_id=_xmodule_instance_args.get('task_id') if _xmodule_instance_args is not None else None,
-        entry_id=_entry_id,
-        course_id=course_id,
-        task_input=_task_input
+    return _upload_grade_report(
+        _CourseGradeReport, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name
     )
-    TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
-
-    course = get_course_by_id(course_id)
-    course_is_cohorted = is_course_cohorted(course.id)
-    teams_enabled = course.teams_enabled
-    cohorts_header = ['Cohort Name'] if course_is_cohorted else []
-    teams_header = ['Team Name'] if teams_enabled else []
-
-    experiment_partitions = get_split_user_partitions(course.user_partitions)
-    group_configs_header = [u'Experiment Group ({})'.format(partition.name) for partition in experiment_partitions]
 
-    certificate_info_header = ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
-    certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
-    whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
 
-    # Loop over all our students and build our CSV lists in memory
-    rows = []
-    err_rows = [["id", "username", "error_msg"]]
-    current_step = {'step': 'Calculating Grades'}
-
-    student_counter = 0
-    TASK_LOG.info(
-        u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
-        task_info_string,
-        action_name,
-        current_step,
-        total_enrolled_students,
-    )
-
-    graded_assignments = _graded_assignments(course_id)
-    grade_header = []
-    for assignment_info in graded_assignments.itervalues():
-        if assignment_info['use_subsection_headers']:
-            grade_header.extend(assignment_info['subsection_headers'].itervalues())
-        grade_header.append(assignment_info['average_header'])
-
-    rows.append(
-        ["Student ID", "Email", "Username", "Grade"] +
-        grade_header +
-        cohorts_header +
-        group_configs_header +
-        teams_header +
-        ['Enrollment Track', 'Verification Status'] +
-        certificate_info_header
-    )
-
-    for student, course_grade, err_msg in CourseGradeFactory().iter(course, enrolled_students):
-        # Periodically update task status (this is a cache write)
-        if task_progress.attempted % status_interval == 0:
-            task_progress.update_task_state(extra_meta=current_step)
-        task_progress.attempted += 1
+class _CourseGradeReport(object):
+    """
+    Builds the rows of the grades CSV of a course: the course grade and
+    the grades of each graded assignment of each student, along with
+    their cohort, experiment groups, team, enrollment and certificate
+    information.
+    """
+    report_name = 'grade_report'
+    error_report_name = 'grade_report_err'
+
+    # Whether to upload the report when no student could be graded.
+    upload_if_empty = True
+
+    def __init__(self, course):
+        self.course = course
+        self.course_is_cohorted = is_course_cohorted(course.id)
+        self.teams_enabled = course.teams_enabled
+        self.experiment_partitions = get_split_user_partitions(course.user_partitions)
+        self.whitelisted_user_ids = set(
+            CertificateWhitelist.objects.filter(course_id=course.id, whitelist=True).values_list('user_id', flat=True)
+        )
+        self.graded_assignments = _graded_assignments(course.id)
 
-        # Now add a log entry after each student is graded to get a sense
-        # of the task's progress
-        student_counter += 1
-        TASK_LOG.info(
-            u'%s, Task type: %s, Current step: %s, Grade calculation in-progress for students: %s/%s',
-            task_info_string,
-            action_name,
-            current_step,
-            student_counter,
-            total_enrolled_students
+    def header_row(self):
+        """
+        Returns the header row of the report.
+        """
+        grade_header = []
+        for assignment_info in self.graded_assignments.itervalues():
+            if assignment_info['use_subsection_headers']:
+                grade_header.extend(assignment_info['subsection_headers'].itervalues())
+            grade_header.append(assignment_info['average_header'])
+
+        return (
+            ["Student ID", "Email", "Username", "Grade"] +
+            grade_header +
+            (['Cohort Name'] if self.course_is_cohorted else []) +
+            [u'Experiment Group ({})'.format(partition.name) for partition in self.experiment_partitions] +
+            (['Team Name'] if self.teams_enabled else []) +
+            ['Enrollment Track', 'Verification Status'] +
+            ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
         )
 
-        if not course_grade:
-            # An empty gradeset means we failed to grade a student.
-            task_progress.failed += 1
-            err_rows.append([student.id, student.username, err_msg])
-            continue
+    def error_header_row(self):
+        """
+        Returns the header row of the report's errors.
+        """
+        return ["id", "username", "error_msg"]
 
-        # We were able to successfully grade this student for this course.
-        task_progress.succeeded += 1
+    def row(self, student, course_grade):
+        """
+        Returns the row of the report for the given student and their
+        course grade.
+        """
+        course_id = self.course.id
 
         cohorts_group_name = []
-        if course_is_cohorted:
+        if self.course_is_cohorted:
             group = get_cohort(student, course_id, assign=False)
             cohorts_group_name.append(group.name if group else '')
 
         group_configs_group_names = []
-        for partition in experiment_partitions:
+        for partition in self.experiment_partitions:
             group = LmsPartitionService(student, course_id).get_group(partition, assign=False)
             group_configs_group_names.append(group.name if group else '')
 
         team_name = []
-        if teams_enabled:
+        if self.teams_enabled:
             try:
                 membership = CourseTeamMembership.objects.get(user=student, team__course_id=course_id)
                 team_name.append(membership.team.name)
@@ -819,11 +1039,11 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             student,
             course_id,
             course_grade.letter_grade,
-            student.id in whitelisted_user_ids
+            student.id in self.whitelisted_user_ids
         )
 
         grade_results = []
-        for assignment_type, assignment_info in graded_assignments.iteritems():
+        for assignment_type, assignment_info in self.graded_assignments.iteritems():
             for subsection_location in assignment_info['subsection_headers']:
                 try:
                     subsection_grade = course_grade.graded_subsections_by_format[assignment_type][subsection_location]
@@ -837,41 +1057,23 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
                     else:
                         grade_results.append([u'Not Attempted'])
             if assignment_info['use_subsection_headers']:
-                assignment_average = course_grade.grade_value['grade_breakdown'].get(assignment_type, {}).get('percent')
+                assignment_average = course_grade.grade_breakdown.get(assignment_type, {}).get('percent')
                 grade_results.append([assignment_average])
 
         grade_results = list(chain.from_iterable(grade_results))
 
-        rows.append(
+        return (
             [student.id, student.email, student.username, course_grade.percent] +
             grade_results + cohorts_group_name + group_configs_group_names + team_name +
             [enrollment_mode] + [verification_status] + certificate_info
         )
 
-    TASK_LOG.info(
-        u'%s, Task type: %s, Current step: %s, Grade calculation completed for students: %s/%s',
-        task_info_string,
-        action_name,
-        current_step,
-        student_counter,
-        total_enrolled_students
-    )
-
-    # By this point, we've got the rows we're going to stuff into our CSV files.
-    current_step = {'step': 'Uploading CSVs'}
-    task_progress.update_task_state(extra_meta=current_step)
-    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
-
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
-
-    # If there are any error rows (don't count the header), write them out as well
-    if len(err_rows) > 1:
-        upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
-
-    # One last update before we close out...
-    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
-    return task_progress.update_task_state(extra_meta=current_step)
+    def error_row(self, student, err_msg):
+        """
+        Returns the error row of the report for the given student who
+        failed to be graded.
+        """
+        return [student.id, student.username, err_msg]
 
 
 def _graded_assignments(course_key):
@@ -969,40 +1171,57 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
     """
     Generate a CSV containing all students' problem grades within a given
     `course_id`.
+
+    See `_upload_grade_report` for how the rows of the report are generated.
     """
-    start_time = time()
-    start_date = datetime.now(UTC)
-    status_interval = 100
-    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
-    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
+    return _upload_grade_report(
+        _ProblemGradeReport, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name
+    )
+
+
+class _ProblemGradeReport(object):
+    """
+    Builds the rows of the problem grades CSV of a course: the course
+    grade and the earned and possible scores of each graded problem of
+    each student.
+    """
+    report_name = 'problem_grade_report'
+    error_report_name = 'problem_grade_report_err'
+
+    # Whether to upload the report when no student could be graded.
+    upload_if_empty = False
 
     # This struct encapsulates both the display names of each static item in the
     # header row as values as well as the django User field names of those items
     # as the keys.  It is structured in this way to keep the values related.
-    header_row = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
-
-    graded_scorable_blocks = _graded_scorable_blocks_to_header(course_id)
+    student_fields = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
 
-    # Just generate the static fields for now.
-    rows = [list(header_row.values()) + ['Grade'] + list(chain.from_iterable(graded_scorable_blocks.values()))]
-    error_rows = [list(header_row.values()) + ['error_msg']]
-    current_step = {'step': 'Calculating Grades'}
+    def __init__(self, course):
+        self.course = course
+        self.graded_scorable_blocks = _graded_scorable_blocks_to_header(course.id)
 
-    course = get_course_by_id(course_id)
-    for student, course_grade, err_msg in CourseGradeFactory().iter(course, enrolled_students):
-        student_fields = [getattr(student, field_name) for field_name in header_row]
-        task_progress.attempted += 1
+    def header_row(self):
+        """
+        Returns the header row of the report.
+        """
+        return (
+            list(self.student_fields.values()) + ['Grade'] +
+            list(chain.from_iterable(self.graded_scorable_blocks.values()))
+        )
 
-        if not course_grade:
-            # There was an error grading this student.
-            if not err_msg:
-                err_msg = u'Unknown error'
-            error_rows.append(student_fields + [err_msg])
-            task_progress.failed += 1
-            continue
+    def error_header_row(self):
+        """
+        Returns the header row of the report's errors.
+        """
+        return list(self.student_fields.values()) + ['error_msg']
 
+    def row(self, student, course_grade):
+        """
+        Returns the row of the report for the given student and their
+        course grade.
+        """
         earned_possible_values = []
-        for block_location in graded_scorable_blocks:
+        for block_location in self.graded_scorable_blocks:
             try:
                 problem_score = course_grade.locations_to_scores[block_location]
             except KeyError:
@@ -1013,20 +1232,349 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
                 else:
                     earned_possible_values.append([u'Not Attempted', problem_score.possible])
 
-        rows.append(student_fields + [course_grade.percent] + list(chain.from_iterable(earned_possible_values)))
+        return (
+            self._student_values(student) + [course_grade.percent] +
+            list(chain.from_iterable(earned_possible_values))
+        )
 
-        task_progress.succeeded += 1
-        if task_progress.attempted % status_interval == 0:
+    def error_row(self, student, err_msg):
+        """
+        Returns the error row of the report for the given student who
+        failed to be graded.
+        """
+        # There was an error grading this student.
+        if not err_msg:
+            err_msg = u'Unknown error'
+        return self._student_values(student) + [err_msg]
+
+    def _student_values(self, student):
+        """
+        Returns the values of the student's fields in the report.
+        """
+        return [getattr(student, field_name) for field_name in self.student_fields]
+
+
+# Map of the name of each grade report to the class that builds its rows.
+_GRADE_REPORTS = {
+    report_class.report_name: report_class
+    for report_class in (_CourseGradeReport, _ProblemGradeReport)
+}
+
+
+def _upload_grade_report(report_class, xmodule_instance_args, entry_id, course_id, task_input, action_name):
+    """
+    Generate the grade report built by `report_class` for all students
+    enrolled in the given `course_id`, and store it using a `ReportStore`,
+    along with a report of the students that failed to be graded, if any.
+
+    The rows of the report are streamed to a temporary file as students
+    are graded, rather than held in memory.
+
+    When the number of enrolled students exceeds
+    settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK, the students are instead
+    chopped up into chunks of at most that many students, each of which
+    is graded by its own subtask in parallel.  See
+    `_queue_grade_report_subtasks`.
+    """
+    start_time = time()
+    start_date = datetime.now(UTC)
+    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
+    total_enrolled_students = enrolled_students.count()
+
+    fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Input: {task_input}'
+    task_info_string = fmt.format(
+        task_id=xmodule_instance_args.get('task_id') if xmodule_instance_args is not None else None,
+        entry_id=entry_id,
+        course_id=course_id,
+        task_input=task_input
+    )
+    TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
+
+    students_per_task = settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK
+    if entry_id is not None and students_per_task and total_enrolled_students > students_per_task:
+        TASK_LOG.info(
+            u'%s, Task type: %s, Queueing subtasks to grade %s students, %s students per subtask',
+            task_info_string,
+            action_name,
+            total_enrolled_students,
+            students_per_task,
+        )
+        return _queue_grade_report_subtasks(
+            report_class, entry_id, enrolled_students, total_enrolled_students, students_per_task, start_date,
+            action_name,
+        )
+
+    task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
+    report = report_class(get_course_by_id(course_id))
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+
+    current_step = {'step': 'Calculating Grades'}
+    TASK_LOG.info(
+        u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
+        task_info_string,
+        action_name,
+        current_step,
+        total_enrolled_students,
+    )
+
+    with TemporaryFile() as report_file, TemporaryFile() as error_file:
+        report_store.write_rows(report_file, [report.header_row()])
+        report_store.write_rows(error_file, [report.error_header_row()])
+        _write_grade_report_rows(
+            report, enrolled_students, report_store, report_file, error_file, task_progress, current_step,
+        )
+
+        TASK_LOG.info(
+            u'%s, Task type: %s, Current step: %s, Grade calculation completed for students: %s/%s',
+            task_info_string,
+            action_name,
+            current_step,
+            task_progress.attempted,
+            total_enrolled_students
+        )
+
+        # By this point, we've got the rows we're going to stuff into our CSV files.
+        current_step = {'step': 'Uploading CSVs'}
+        task_progress.update_task_state(extra_meta=current_step)
+        TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
+
+        # Perform the actual upload
+        timestamp_str = start_date.strftime(REPORT_TIMESTAMP_FORMAT)
+        if task_progress.succeeded or report.upload_if_empty:
+            _upload_report_file(report_store, report_file, report.report_name, course_id, timestamp_str)
+
+        # If there are any error rows, write them out as well
+        if task_progress.failed:
+            _upload_report_file(report_store, error_file, report.error_report_name, course_id, timestamp_str)
+
+    # One last update before we close out...
+    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
+    return task_progress.update_task_state(extra_meta=current_step)
+
+
+def _write_grade_report_rows(report, students, report_store, report_file, error_file, task_progress, current_step=None):
+    """
+    Grade the given students, writing their rows of `report` to
+    `report_file`, or their error rows to `error_file` for those that
+    fail to be graded, and counting them in `task_progress`.
+
+    If `current_step` is given, the state of the current task is
+    periodically updated with it.
+    """
+    status_interval = 100
+    for student, course_grade, err_msg in CourseGradeFactory().iter(report.course, students):
+        # Periodically update task status (this is a cache write)
+        if current_step is not None and task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
+        task_progress.attempted += 1
+
+        if not course_grade:
+            # An empty gradeset means we failed to grade a student.
+            task_progress.failed += 1
+            report_store.write_rows(error_file, [report.error_row(student, err_msg)])
+            continue
+
+        # We were able to successfully grade this student for this course.
+        task_progress.succeeded += 1
+        report_store.write_rows(report_file, [report.row(student, course_grade)])
 
-    # Perform the upload if any students have been successfully graded
-    if len(rows) > 1:
-        upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
-    # If there are any error rows, write them out as well
-    if len(error_rows) > 1:
-        upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
 
-    return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
+def _queue_grade_report_subtasks(
+        report_class, entry_id, students, total_num_students, students_per_task, start_date, action_name,
+):
+    """
+    Queue subtasks that each grade a chunk of at most `students_per_task`
+    of the given students, and store their rows of the report built by
+    `report_class` as partial reports.  See `upload_grade_report_chunk`.
+
+    Returns the task progress as stored in the InstructorTask object.
+    """
+    # Imported here to avoid a circular import, as the tasks module imports this one.
+    from lms.djangoapps.instructor_task.tasks import generate_grade_report_chunk
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # As with bulk email, the same task may be called again when there is a
+    # loss of connection while it is being queued.  If subtasks have already
+    # been defined, there is no need to redefine them.
+    if len(entry.subtasks) > 0 and entry.task_output:
+        TASK_LOG.warning(u"Task %s has already been processed!  InstructorTask = %s", entry.task_id, entry)
+        return json.loads(entry.task_output)
+
+    # Subtasks are created in the order of their chunks of students, and
+    # their partial reports are merged in that order.
+    chunk_indices = count()
+    timestamp_str = start_date.strftime(REPORT_TIMESTAMP_FORMAT)
+
+    def _create_grade_report_subtask(student_items, initial_subtask_status):
+        """Creates a subtask to grade a given chunk of students."""
+        return generate_grade_report_chunk.subtask(
+            (
+                entry_id,
+                report_class.report_name,
+                next(chunk_indices),
+                student_items,
+                timestamp_str,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_grade_report_subtask,
+        [students],
+        [],
+        students_per_task,
+        total_num_students,
+    )
+
+
+def upload_grade_report_chunk(entry_id, report_name, chunk_index, student_items, timestamp_str, subtask_status_dict):
+    """
+    Grade a chunk of the students of the grade report `report_name` and
+    store their rows, and their error rows if any, as partial reports.
+
+    The last subtask of the InstructorTask to complete merges the partial
+    reports of all its subtasks into the report and error report, and
+    deletes them.
+
+    Arguments:
+        `entry_id` : the id of the InstructorTask that queued the subtask.
+        `report_name` : the name of the grade report being generated.
+        `chunk_index` : the index of the chunk of students among all the subtasks' chunks.
+        `student_items` : a list of dicts with the 'pk' of each student of the chunk.
+        `timestamp_str` : the formatted time at which the report was requested.
+        `subtask_status_dict` : the subtask's initial status, as a dict.
+
+    Returns the subtask's status, as a dict.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    TASK_LOG.info(
+        u"Preparing to grade chunk %s of %s students for %s as subtask %s for instructor task %d",
+        chunk_index, len(student_items), report_name, current_task_id, entry_id,
+    )
+
+    # Check that the requested subtask is actually known to the current InstructorTask entry.
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+    task_progress = TaskProgress(None, len(student_items), time())
+    try:
+        report = _GRADE_REPORTS[report_name](get_course_by_id(entry.course_id))
+
+        # Grade the students in the order of the chunk.
+        student_ids = [item['pk'] for item in student_items]
+        students_by_id = User.objects.in_bulk(student_ids)
+        students = [students_by_id[student_id] for student_id in student_ids if student_id in students_by_id]
+
+        with TemporaryFile() as report_file, TemporaryFile() as error_file:
+            _write_grade_report_rows(report, students, report_store, report_file, error_file, task_progress)
+            _store_report_file(
+                report_store, report_file, entry.course_id,
+                _partial_report_filename(entry, report.report_name, chunk_index),
+            )
+            if task_progress.failed:
+                _store_report_file(
+                    report_store, error_file, entry.course_id,
+                    _partial_report_filename(entry, report.error_report_name, chunk_index),
+                )
+    except Exception:
+        TASK_LOG.exception(u"Subtask %s of instructor task %d failed to grade its students", current_task_id, entry_id)
+        subtask_status.increment(
+            succeeded=task_progress.succeeded,
+            failed=len(student_items) - task_progress.succeeded,
+            state=FAILURE,
+        )
+        _update_grade_report_subtask_status(entry_id, current_task_id, subtask_status, report_name, timestamp_str)
+        raise
+
+    subtask_status.increment(succeeded=task_progress.succeeded, failed=task_progress.failed, state=SUCCESS)
+    _update_grade_report_subtask_status(entry_id, current_task_id, subtask_status, report_name, timestamp_str)
+    return subtask_status.to_dict()
+
+
+def _update_grade_report_subtask_status(entry_id, current_task_id, subtask_status, report_name, timestamp_str):
+    """
+    Update the status of a grade report subtask, and merge the partial
+    reports of all the subtasks if it was the last one to complete.
+
+    The InstructorTask stays in progress until the reports are uploaded,
+    and fails if they can't be.
+    """
+    if update_subtask_status(entry_id, current_task_id, subtask_status, complete_task=False):
+        try:
+            _merge_partial_grade_reports(entry_id, report_name, timestamp_str)
+        except Exception as exception:  # pylint: disable=broad-except
+            TASK_LOG.exception(u"Instructor task %d failed to upload %s", entry_id, report_name)
+            complete_subtasks_task(entry_id, exception, traceback.format_exc())
+        else:
+            complete_subtasks_task(entry_id)
+
+
+def _merge_partial_grade_reports(entry_id, report_name, timestamp_str):
+    """
+    Merge the partial reports stored by each of the subtasks of the given
+    InstructorTask into the grade report `report_name` and its error
+    report, and delete them.
+
+    Raises GradeReportSubtasksError without uploading the reports if any
+    of the subtasks failed, as they would be missing the rows of some students.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    subtask_dict = json.loads(entry.subtasks)
+    num_subtasks = subtask_dict['total']
+    task_progress = json.loads(entry.task_output)
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+    report_class = _GRADE_REPORTS[report_name]
+    csv_names = [report_class.report_name, report_class.error_report_name]
+
+    try:
+        if subtask_dict['failed']:
+            raise GradeReportSubtasksError(
+                u"Not uploading {}, as {} of its {} subtasks failed".format(
+                    report_name, subtask_dict['failed'], num_subtasks,
+                )
+            )
+
+        report = report_class(get_course_by_id(course_id))
+        merges = [
+            (report.report_name, report.header_row(), task_progress['succeeded'] or report.upload_if_empty),
+            (report.error_report_name, report.error_header_row(), task_progress['failed']),
+        ]
+        for csv_name, header_row, should_upload in merges:
+            if not should_upload:
+                continue
+            with TemporaryFile() as report_file:
+                report_store.write_rows(report_file, [header_row])
+                for chunk_index in range(num_subtasks):
+                    partial_filename = _partial_report_filename(entry, csv_name, chunk_index)
+                    if report_store.exists(course_id, partial_filename):
+                        with report_store.open(course_id, partial_filename) as partial_file:
+                            shutil.copyfileobj(partial_file, report_file)
+                _upload_report_file(report_store, report_file, csv_name, course_id, timestamp_str)
+        TASK_LOG.info(u"Task %s: merged %s partial reports into %s", entry.task_id, num_subtasks, report_name)
+    finally:
+        for csv_name in csv_names:
+            for chunk_index in range(num_subtasks):
+                report_store.delete(course_id, _partial_report_filename(entry, csv_name, chunk_index))
+
+
+def _partial_report_filename(entry, csv_name, chunk_index):
+    """
+    Returns the name of the partial CSV file of the report `csv_name` for
+    the chunk of students at `chunk_index` of the given InstructorTask.
+    """
+    return u"partial/{task_id}/{csv_name}_{chunk_index:05d}.csv".format(
+        task_id=entry.task_id,
+        csv_name=csv_name,
+        chunk_index=chunk_index,
+    )
 
 
 def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
@@ -1549,6 +2097,12 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
     # redundant cohort queries.
     cohorts_status = {}
 
+    # Users are added to their cohorts in bulk, a batch of rows at a time.
+    # Maps the name of each cohort to the usernames or emails of the users
+    # to add to it.
+    pending_additions = OrderedDict()
+    pending_usernames_or_emails = set()
+
     with DefaultStorage().open(task_input['file_name']) as f:
         for row in unicodecsv.DictReader(UniversalNewlineIterator(f), encoding='utf-8'):
             # Try to use the 'email' field to identify the user.  If it's not present, use 'username'.
@@ -1576,18 +2130,20 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
                 task_progress.failed += 1
                 continue
 
-            try:
-                add_user_to_cohort(cohorts_status[cohort_name]['cohort'], username_or_email)
-                cohorts_status[cohort_name]['Students Added'] += 1
-                task_progress.succeeded += 1
-            except User.DoesNotExist:
-                cohorts_status[cohort_name]['Students Not Found'].add(username_or_email)
-                task_progress.failed += 1
-            except ValueError:
-                # Raised when the user is already in the given cohort
-                task_progress.skipped += 1
+            # Rows are applied in order, so the pending rows are applied before
+            # a row that lists one of their users again.
+            if (
+                    username_or_email in pending_usernames_or_emails or
+                    len(pending_usernames_or_emails) >= BULK_COHORT_BATCH_SIZE
+            ):
+                _add_users_to_cohorts(pending_additions, cohorts_status, task_progress)
+                pending_usernames_or_emails.clear()
+                task_progress.update_task_state(extra_meta=current_step)
 
-            task_progress.update_task_state(extra_meta=current_step)
+            pending_additions.setdefault(cohort_name, []).append(username_or_email)
+            pending_usernames_or_emails.add(username_or_email)
+
+    _add_users_to_cohorts(pending_additions, cohorts_status, task_progress)
 
     current_step['step'] = 'Uploading CSV'
     task_progress.update_task_state(extra_meta=current_step)
@@ -1608,6 +2164,22 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def _add_users_to_cohorts(pending_additions, cohorts_status, task_progress):
+    """
+    Adds the users pending addition to each cohort in bulk, and records the
+    results in the given cohorts status and task progress.
+    """
+    for cohort_name, usernames_or_emails in pending_additions.iteritems():
+        cohort_status = cohorts_status[cohort_name]
+        added, already_present, not_found = add_users_to_cohort(cohort_status['cohort'], usernames_or_emails)
+        cohort_status['Students Added'] += len(added)
+        cohort_status['Students Not Found'].update(not_found)
+        task_progress.succeeded += len(added)
+        task_progress.failed += len(not_found)
+        task_progress.skipped += len(already_present)
+    pending_additions.clear()
+
+
 def students_require_certificate(course_id, enrolled_students, statuses_to_regenerate=None):
     """
     Returns list of students where certificates needs to be generated.
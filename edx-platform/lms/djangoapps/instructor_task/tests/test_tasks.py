@@ -12,6 +12,7 @@ from mock import Mock, MagicMock, patch
 from nose.plugins.attrib import attr
 
 from celery.states import SUCCESS, FAILURE
+from django.test.utils import override_settings
 from django.utils.translation import ugettext_noop
 from functools import partial
 
@@ -22,11 +23,12 @@ from courseware.models import StudentModule
 from courseware.tests.factories import StudentModuleFactory
 from student.tests.factories import UserFactory, CourseEnrollmentFactory
 
-from lms.djangoapps.instructor_task.models import InstructorTask
+from lms.djangoapps.instructor_task.models import InstructorTask, PROGRESS
 from lms.djangoapps.instructor_task.tests.test_base import InstructorTaskModuleTestCase
 from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tasks import (
     rescore_problem,
+    rescore_problem_chunk,
     reset_problem_attempts,
     delete_problem_state,
     generate_certificates,
@@ -378,6 +380,60 @@ class TestRescoreInstructorTask(TestInstructorTasks):
             action_name='rescored'
         )
 
+    @override_settings(RESCORE_STUDENT_MODULES_PER_TASK=3)
+    def test_rescoring_in_subtasks(self):
+        """
+        Tests that the problem is rescored by subtasks when there are more
+        modules to rescore than a subtask rescores.
+        """
+        input_state = json.dumps({'done': True})
+        num_students = 10
+        self._create_students_with_state(num_students, input_state)
+        task_entry = self._create_input_entry()
+        mock_instance = Mock()
+        mock_instance.rescore_problem = Mock(
+            return_value={
+                'success': 'correct',
+                'new_raw_earned': 1,
+                'new_raw_possible': 1,
+            }
+        )
+        with patch('lms.djangoapps.instructor_task.tasks_helper.get_module_for_descriptor_internal') as mock_get_module:
+            mock_get_module.return_value = mock_instance
+            self._run_task_with_mock_celery(rescore_problem, task_entry.id, task_entry.task_id)
+
+        self.assertEqual(mock_instance.rescore_problem.call_count, num_students)
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        subtasks = json.loads(entry.subtasks)
+        self.assertEqual(subtasks['total'], 4)
+        self.assertEqual(subtasks['succeeded'], 4)
+        self.assert_task_output(
+            output=self.get_task_output(task_entry.id),
+            total=num_students,
+            attempted=num_students,
+            succeeded=num_students,
+            skipped=0,
+            failed=0,
+            action_name='rescored'
+        )
+
+    def test_rescoring_subtask_failure(self):
+        """
+        Tests that the failure of a subtask is left for the subtask to record
+        in its status, instead of failing its InstructorTask.
+        """
+        task_entry = self._create_input_entry()
+        task_entry.subtasks = json.dumps({'total': 2, 'status': {}})
+        task_entry.task_state = PROGRESS
+        task_entry.save()
+        rescore_problem_chunk.on_failure(
+            TestTaskFailure('subtask failed'), str(uuid4()), [task_entry.id], {}, Mock()
+        )
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        self.assertEqual(entry.task_state, PROGRESS)
+        self.assertIsNone(entry.task_output)
+
 
 @attr(shard=3)
 class TestResetAttemptsInstructorTask(TestInstructorTasks):
@@ -8,12 +8,15 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 
 """
 
+import json
 import os
 import shutil
 from datetime import datetime
 import urllib
+from uuid import uuid4
 
 import ddt
+from celery.states import SUCCESS, FAILURE
 from freezegun import freeze_time
 from mock import Mock, patch, MagicMock
 from nose.plugins.attrib import attr
@@ -27,6 +30,7 @@ from certificates.models import CertificateStatuses, GeneratedCertificate
 from certificates.tests.factories import GeneratedCertificateFactory, CertificateWhitelistFactory
 from course_modes.models import CourseMode
 from courseware.tests.factories import InstructorFactory
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     TestReportMixin,
@@ -48,7 +52,7 @@ from student.models import CourseEnrollment, CourseEnrollmentAllowed, ManualEnro
 from lms.djangoapps.verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
-from lms.djangoapps.instructor_task.models import ReportStore
+from lms.djangoapps.instructor_task.models import ReportStore, InstructorTask
 from survey.models import SurveyForm, SurveyAnswer
 from lms.djangoapps.instructor_task.tasks_helper import (
     cohort_students_and_upload,
@@ -1591,6 +1595,129 @@ class TestGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
             )
 
 
+@override_settings(GRADES_DOWNLOAD_STUDENTS_PER_TASK=2)
+class TestGradeReportSubtasks(TestReportMixin, InstructorTaskCourseTestCase):
+    """
+    Test that grade reports are generated by subtasks grading chunks of
+    the enrolled students.
+    """
+    def setUp(self):
+        super(TestGradeReportSubtasks, self).setUp()
+        self.course = CourseFactory.create()
+        self.students = [self.create_student(u'student_{}'.format(index)) for index in range(5)]
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='dummy_task_key',
+            task_type='grade_course',
+        )
+
+    def _get_report_names(self):
+        """
+        Returns the names of the reports stored for the course.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        return [filename for filename, _ in report_store.links_for(self.course.id)]
+
+    def _assert_partial_reports_deleted(self):
+        """
+        Asserts that the partial reports of the subtasks were deleted.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        partial_dir = report_store.path_to(self.course.id, u'partial/{}'.format(self.entry.task_id))
+        if report_store.storage.exists(partial_dir):
+            self.assertEqual(report_store.storage.listdir(partial_dir), ([], []))
+
+    def _assert_subtasks(self, succeeded, failed, task_state=SUCCESS):
+        """
+        Asserts the number of subtasks of the task that succeeded and failed,
+        and the final state of the task.
+        """
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        subtasks = json.loads(entry.subtasks)
+        self.assertEqual(subtasks['total'], 3)
+        self.assertEqual(subtasks['succeeded'], succeeded)
+        self.assertEqual(subtasks['failed'], failed)
+        self.assertEqual(entry.task_state, task_state)
+        return json.loads(entry.task_output)
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task')
+    def test_grade_report(self, _mock_current_task):
+        upload_grades_csv(None, self.entry.id, self.course.id, None, 'graded')
+
+        task_output = self._assert_subtasks(succeeded=3, failed=0)
+        self.assertDictContainsSubset(
+            {'action_name': 'graded', 'attempted': 5, 'succeeded': 5, 'failed': 0},
+            task_output,
+        )
+        self.assertEqual(len(self._get_report_names()), 1)
+        self.verify_rows_in_csv(
+            [
+                {u'Student ID': unicode(student.id), u'Username': student.username, u'Grade': '0.0'}
+                for student in self.students
+            ],
+            verify_order=False,
+            ignore_other_columns=True,
+        )
+        self._assert_partial_reports_deleted()
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task')
+    @patch('lms.djangoapps.grades.new.course_grade.CourseGradeFactory.iter')
+    def test_grading_failure(self, mock_grades_iter, _mock_current_task):
+        mock_grades_iter.side_effect = lambda course, students: [
+            (student, None, u'Cannot grade student') for student in students
+        ]
+        upload_problem_grade_report(None, self.entry.id, self.course.id, None, 'graded')
+
+        task_output = self._assert_subtasks(succeeded=3, failed=0)
+        self.assertDictContainsSubset({'attempted': 5, 'succeeded': 0, 'failed': 5}, task_output)
+        report_names = self._get_report_names()
+        self.assertEqual(len(report_names), 1)
+        self.assertIn('problem_grade_report_err', report_names[0])
+        self.verify_rows_in_csv(
+            [
+                {u'Username': student.username, u'error_msg': u'Cannot grade student'}
+                for student in self.students
+            ],
+            verify_order=False,
+            ignore_other_columns=True,
+        )
+        self._assert_partial_reports_deleted()
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task')
+    @patch('lms.djangoapps.instructor_task.tasks_helper._write_grade_report_rows')
+    def test_subtask_failure(self, mock_write_rows, _mock_current_task):
+        mock_write_rows.side_effect = Exception('Cannot write rows')
+        upload_grades_csv(None, self.entry.id, self.course.id, None, 'graded')
+
+        task_output = self._assert_subtasks(succeeded=0, failed=3, task_state=FAILURE)
+        self.assertEqual(task_output['exception'], 'GradeReportSubtasksError')
+        self.assertIn('3 of its 3 subtasks failed', task_output['message'])
+        self.assertEqual(self._get_report_names(), [])
+        self._assert_partial_reports_deleted()
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task')
+    @patch('lms.djangoapps.instructor_task.tasks_helper._upload_report_file')
+    def test_upload_failure(self, mock_upload_report_file, _mock_current_task):
+        mock_upload_report_file.side_effect = Exception('Cannot upload report')
+        upload_grades_csv(None, self.entry.id, self.course.id, None, 'graded')
+
+        task_output = self._assert_subtasks(succeeded=3, failed=0, task_state=FAILURE)
+        self.assertEqual(task_output['exception'], 'Exception')
+        self.assertEqual(task_output['message'], 'Cannot upload report')
+        self.assertEqual(self._get_report_names(), [])
+        self._assert_partial_reports_deleted()
+
+    @override_settings(GRADES_DOWNLOAD_STUDENTS_PER_TASK=5)
+    @patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task')
+    def test_few_students(self, _mock_current_task):
+        result = upload_grades_csv(None, self.entry.id, self.course.id, None, 'graded')
+
+        self.assertDictContainsSubset({'attempted': 5, 'succeeded': 5, 'failed': 0}, result)
+        self.assertEqual(InstructorTask.objects.get(pk=self.entry.id).subtasks, '')
+        self.assertEqual(len(self._get_report_names()), 1)
+
+
 @ddt.ddt
 @patch('lms.djangoapps.instructor_task.tasks_helper.DefaultStorage', new=MockDefaultStorage)
 class TestGradeReportEnrollmentAndCertificateInfo(TestReportMixin, InstructorTaskModuleTestCase):
@@ -726,6 +726,15 @@ XBLOCK_FIELD_DATA_WRAPPERS = ()
 
 MODULESTORE_BRANCH = 'published-only'
 CONTENTSTORE = None
+
+# Directory of a local on-disk cache of the course assets served by the StaticContentServer,
+# in files named after the assets' content digests.  Set to None to disable it.
+COURSE_ASSETS_DISK_CACHE_DIR = None
+# Maximum total size, in bytes, of the files in the course assets disk cache.  Each process
+# keeps a running total of the sizes of the files it adds, and once that exceeds the maximum,
+# walks the directory to evict the least recently used files.  Set to None to leave the disk
+# cache unbounded.
+COURSE_ASSETS_DISK_CACHE_MAX_SIZE = 1024 * 1024 * 1024
 DOC_STORE_CONFIG = {
     'host': 'localhost',
     'db': 'xmodule',
@@ -780,6 +789,11 @@ CODE_JAIL = {
     },
 }
 
+# Maximum total size, in bytes, of the results of sandboxed code that are
+# cached in each process, in front of the shared cache.  Zero disables the
+# per-process cache.
+SAFE_EXEC_LOCAL_CACHE_SIZE = 10 * 1024 * 1024
+
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
 # of them must match the course id for that course to run unsafe code.
 #
@@ -1822,6 +1836,11 @@ BLOCK_STRUCTURES_SETTINGS = dict(
 
     # Maximum number of retries per task.
     BLOCK_STRUCTURES_TASK_MAX_RETRIES=5,
+
+    # Maximum total size, in bytes, of the serialized block structures
+    # kept in each process' local cache in front of the shared cache.
+    # Set to 0 to disable the local cache.
+    BLOCK_STRUCTURES_LOCAL_CACHE_MAX_SIZE=50 * 1024 * 1024,
 )
 
 ################################ Bulk Email ###################################
@@ -1868,6 +1887,10 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of threads with which each bulk email task sends its messages, each
+# over its own connection to the email backend.
+BULK_EMAIL_SEND_THREADS = 1
+
 ############################# Persistent Grades ####################################
 
 # Queue to use for updating persistent grades
@@ -2414,6 +2437,10 @@ REGISTRATION_EMAIL_PATTERNS_ALLOWED = None
 CERT_NAME_SHORT = "Certificate"
 CERT_NAME_LONG = "Certificate of Achievement"
 
+# Number of seconds that a student's generated certificates are cached for the
+# learner dashboard, until one of them changes. Set to 0 not to cache them.
+STUDENT_CERTIFICATES_CACHE_TIMEOUT = 0
+
 #################### OpenBadges Settings #######################
 
 BADGING_BACKEND = 'badges.backends.badgr.BadgrBackend'
@@ -2431,6 +2458,21 @@ BADGR_TIMEOUT = 10
 # the ones that contain information other than grades.
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
+# Parameters for breaking down the grading of grade reports into subtasks.
+# Grade reports of courses with more enrolled students than this are
+# generated in parallel by subtasks grading at most this many students each.
+# Set to None to always generate grade reports in a single task.
+GRADES_DOWNLOAD_STUDENTS_PER_TASK = None
+
+# Parameters for breaking down the rescoring of problems into subtasks.
+# Problems with more student modules to rescore than this are rescored in
+# parallel by subtasks rescoring at most this many student modules each.
+# Set to None to always rescore problems in a single task.
+RESCORE_STUDENT_MODULES_PER_TASK = None
+# The rescoring subtasks load the problem for each student module, so they
+# are routed with the grade report subtasks rather than to the default queue.
+RESCORE_STUDENT_MODULES_ROUTING_KEY = HIGH_MEM_QUEUE
+
 GRADES_DOWNLOAD = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-grades',
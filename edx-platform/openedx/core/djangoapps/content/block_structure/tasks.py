@@ -26,11 +26,15 @@ NO_RETRY_TASKS = (XMLSyntaxError, LoncapaProblemError, UnicodeEncodeError)
     max_retries=settings.BLOCK_STRUCTURES_SETTINGS['BLOCK_STRUCTURES_TASK_MAX_RETRIES'],
     bind=True,
 )
-def update_course_in_cache(self, course_id):
+def update_course_in_cache(self, course_id, incremental=False):
     """
     Updates the course blocks (in the database) for the specified course.
+    If incremental is True, only the blocks that changed since the last
+    update are recollected.
     """
-    _call_and_retry_if_needed(course_id, api.update_course_in_cache, update_course_in_cache, self.request.id)
+    _call_and_retry_if_needed(
+        course_id, api.update_course_in_cache, update_course_in_cache, self.request.id, incremental=incremental,
+    )
 
 
 @task(
@@ -45,13 +49,13 @@ def get_course_in_cache(self, course_id):
     _call_and_retry_if_needed(course_id, api.get_course_in_cache, get_course_in_cache, self.request.id)
 
 
-def _call_and_retry_if_needed(course_id, api_method, task_method, task_id):
+def _call_and_retry_if_needed(course_id, api_method, task_method, task_id, **kwargs):
     """
-    Calls the given api_method with the given course_id, retrying task_method upon failure.
+    Calls the given api_method with the given course_id and kwargs, retrying task_method upon failure.
     """
     try:
         course_key = CourseKey.from_string(course_id)
-        api_method(course_key)
+        api_method(course_key, **kwargs)
     except NO_RETRY_TASKS as exc:
         # Known unrecoverable errors
         log.exception(
@@ -63,11 +67,11 @@ def _call_and_retry_if_needed(course_id, api_method, task_method, task_id):
         raise
     except RETRY_TASKS as exc:
         log.exception("%s encountered expected error, retrying.", task_method.__name__)
-        raise task_method.retry(args=[course_id], exc=exc)
+        raise task_method.retry(args=[course_id], kwargs=kwargs, exc=exc)
     except Exception as exc:   # pylint: disable=broad-except
         log.exception(
             "%s encountered unknown error. Retry #%d",
             task_method.__name__,
             task_method.request.retries,
         )
-        raise task_method.retry(args=[course_id], exc=exc)
+        raise task_method.retry(args=[course_id], kwargs=kwargs, exc=exc)
@@ -1,10 +1,32 @@
 """
 Helper functions for caching course assets.
 """
+import errno
+import logging
+import os
+import re
+from tempfile import NamedTemporaryFile
+from threading import Lock
+
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
-from xmodule.contentstore.content import STATIC_CONTENT_VERSION
+from xmodule.contentstore.content import StaticContent, STATIC_CONTENT_VERSION
+
+log = logging.getLogger(__name__)
+
+# Content digests which are safe to use as file names in the disk cache.
+CONTENT_DIGEST_PATTERN = re.compile(r'^[0-9a-zA-Z]+$')
+
+# Fraction of COURSE_ASSETS_DISK_CACHE_MAX_SIZE that the disk cache is trimmed down to once it exceeds it, so
+# that it isn't trimmed again on every addition.
+DISK_CACHE_TRIM_RATIO = 0.9
+
+# Total size of the files in each disk cache directory, as last counted by this process plus the sizes of the
+# files it added since.
+_disk_cache_sizes = {}
+_disk_cache_sizes_lock = Lock()
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
@@ -28,6 +50,28 @@ def get_cached_content(location):
     return CONTENT_CACHE.get(unicode(location).encode("utf-8"), version=STATIC_CONTENT_VERSION)
 
 
+def set_cached_content_metadata(content):
+    """
+    Stores the metadata of the given piece of content, without its data, in the cache, using its
+    location as the key.
+    """
+    metadata = StaticContent(
+        content.location, content.name, content.content_type, None,
+        last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+        import_path=content.import_path, length=content.length, locked=content.locked,
+        content_digest=content.content_digest,
+    )
+    CONTENT_CACHE.set(_metadata_key(content.location), metadata, version=STATIC_CONTENT_VERSION)
+
+
+def get_cached_content_metadata(location):
+    """
+    Retrieves the metadata of the given piece of content by its location if cached, as a
+    StaticContent without data.
+    """
+    return CONTENT_CACHE.get(_metadata_key(location), version=STATIC_CONTENT_VERSION)
+
+
 def del_cached_content(location):
     """
     Delete content for the given location, as well versions of the content without a run.
@@ -46,4 +90,153 @@ def del_cached_content(location):
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
 
-    CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+    CONTENT_CACHE.delete_many(
+        locations + [_metadata_key(loc) for loc in locations],
+        version=STATIC_CONTENT_VERSION,
+    )
+
+
+def _metadata_key(location):
+    """
+    Returns the cache key of the metadata of the content at the given location.
+    """
+    if not isinstance(location, str):
+        location = unicode(location).encode("utf-8")
+    return "metadata." + location
+
+
+def is_disk_cache_enabled():
+    """
+    Returns whether course assets are to be cached on the local disk.
+    """
+    return bool(getattr(settings, 'COURSE_ASSETS_DISK_CACHE_DIR', None))
+
+
+def open_disk_cached_content(content_digest):
+    """
+    Returns the open file with the data of the content with the given digest in the disk
+    cache, if cached.  Returns None otherwise.
+
+    The file is opened rather than its path returned, so that it can still be read if it's
+    evicted from the disk cache meanwhile.  Its modification time is updated, to mark it as
+    recently used.
+    """
+    path = _disk_cache_path(content_digest)
+    if path is None:
+        return None
+    try:
+        content_file = open(path, 'rb')
+    except IOError:
+        return None
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+    return content_file
+
+
+def add_disk_cached_content(content):
+    """
+    Writes the data of the given piece of content to the disk cache, using its digest as the
+    file name, and returns the open file.  Returns None if the content can't be cached.
+
+    Since the files are named after the digests of their data, they never need to be
+    invalidated; a changed asset has a new digest.  The least recently used files are evicted
+    once the disk cache exceeds COURSE_ASSETS_DISK_CACHE_MAX_SIZE.
+    """
+    path = _disk_cache_path(content.content_digest)
+    if path is None:
+        return None
+
+    temp_file = None
+    try:
+        try:
+            os.makedirs(os.path.dirname(path))
+        except OSError as exception:
+            if exception.errno != errno.EEXIST:
+                raise
+
+        # Write to a temporary file first, so that a partially written file is never served.
+        with NamedTemporaryFile(dir=os.path.dirname(path), prefix='.', delete=False) as temp_file:
+            for chunk in content.stream_data():
+                temp_file.write(chunk)
+        os.rename(temp_file.name, path)
+        content_file = open(path, 'rb')
+        size = os.fstat(content_file.fileno()).st_size
+    except (IOError, OSError):
+        log.exception(u"Could not write content %s to the disk cache.", unicode(content.location))
+        if temp_file is not None and os.path.exists(temp_file.name):
+            os.remove(temp_file.name)
+        return None
+
+    _trim_disk_cache(size)
+    return content_file
+
+
+def _trim_disk_cache(added_size):
+    """
+    Counts the given size of a file added to the disk cache, and trims the disk cache if its total size
+    exceeds COURSE_ASSETS_DISK_CACHE_MAX_SIZE, if set.
+
+    The directory is only walked the first time a file is added by this process, and whenever the count
+    exceeds the maximum size.  Since the count only includes the files added by this process since then,
+    the disk cache can exceed the maximum size by what the other processes added meanwhile.
+    """
+    max_size = getattr(settings, 'COURSE_ASSETS_DISK_CACHE_MAX_SIZE', None)
+    if not max_size:
+        return
+
+    cache_dir = settings.COURSE_ASSETS_DISK_CACHE_DIR
+    with _disk_cache_sizes_lock:
+        total_size = _disk_cache_sizes.get(cache_dir)
+        if total_size is not None:
+            total_size += added_size
+            if total_size <= max_size:
+                _disk_cache_sizes[cache_dir] = total_size
+                return
+        _disk_cache_sizes[cache_dir] = _evict_disk_cached_files(cache_dir, max_size)
+
+
+def _evict_disk_cached_files(cache_dir, max_size):
+    """
+    Removes the least recently used files from the given disk cache directory, if their total size
+    exceeds max_size, until it's within DISK_CACHE_TRIM_RATIO of max_size.  Returns the total size of the
+    remaining files.
+
+    Files are ordered by their modification time, which is updated whenever they're read.
+    Other processes may be trimming or writing to the disk cache concurrently, so files that
+    are already removed are skipped.
+    """
+    files = []
+    total_size = 0
+    for dir_path, __, file_names in os.walk(cache_dir):
+        for file_name in file_names:
+            path = os.path.join(dir_path, file_name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+    if total_size <= max_size:
+        return total_size
+    for __, size, path in sorted(files):
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total_size -= size
+        if total_size <= max_size * DISK_CACHE_TRIM_RATIO:
+            break
+    return total_size
+
+
+def _disk_cache_path(content_digest):
+    """
+    Returns the path of the disk cache file for the content with the given digest, or None if
+    the disk cache is disabled or the digest can't be used.
+    """
+    if not is_disk_cache_enabled() or not content_digest or not CONTENT_DIGEST_PATTERN.match(content_digest):
+        return None
+    return os.path.join(settings.COURSE_ASSETS_DISK_CACHE_DIR, content_digest[:2], content_digest)
@@ -6,17 +6,21 @@ import logging
 import datetime
 import newrelic.agent
 from django.http import (
-    HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
+    FileResponse, HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
     HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect)
+from django.utils.http import parse_etags, quote_etag
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
 from openedx.core.djangoapps.header_control import force_header_for_response
-from .caching import get_cached_content, set_cached_content
+from .caching import (
+    add_disk_cached_content, get_cached_content, get_cached_content_metadata, is_disk_cache_enabled,
+    open_disk_cached_content, set_cached_content, set_cached_content_metadata
+)
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
@@ -64,11 +68,11 @@ class StaticContentServer(object):
             except (InvalidLocationError, InvalidKeyError):
                 return HttpResponseBadRequest()
 
-            # Attempt to load the asset to make sure it exists, and grab the asset digest
+            # Attempt to load the asset's metadata to make sure it exists, and grab the asset digest
             # if we're able to load it.
             actual_digest = None
             try:
-                content = self.load_asset_from_location(loc)
+                content = self.load_asset_metadata_from_location(loc, requested_digest)
                 actual_digest = getattr(content, "content_digest", None)
             except (ItemNotFoundError, NotFoundError):
                 return HttpResponseNotFound()
@@ -103,12 +107,34 @@ class StaticContentServer(object):
                 return HttpResponseForbidden('Unauthorized')
 
             # Figure out if the client sent us a conditional request, and let them know
-            # if this asset has changed since then.
+            # if this asset has changed since then.  This only needs the asset's metadata.
             last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+            if actual_digest is not None and 'HTTP_IF_NONE_MATCH' in request.META:
+                # If-None-Match takes precedence over If-Modified-Since.
+                etags = parse_etags(request.META['HTTP_IF_NONE_MATCH'])
+                if '*' in etags or actual_digest in etags:
+                    return self.not_modified_response(content)
+            elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
                 if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
                 if if_modified_since == last_modified_at_str:
-                    return HttpResponseNotModified()
+                    return self.not_modified_response(content)
+
+            # Serve the asset's data from the local disk cache if possible, adding it to the
+            # disk cache otherwise.
+            content_file = None
+            if actual_digest is not None and is_disk_cache_enabled():
+                content_file = open_disk_cached_content(actual_digest)
+                if content_file is None:
+                    content = self.load_asset_data(loc, content)
+                    content_file = add_disk_cached_content(content)
+                    if isinstance(content, StaticContentStream):
+                        # Its stream was read, so load it again if it couldn't be cached.
+                        content.close()
+                        if content_file is None:
+                            content = self.load_asset_from_location(loc)
+            newrelic.agent.add_custom_parameter('contentserver.disk_cached', content_file is not None)
+            if content_file is None:
+                content = self.load_asset_data(loc, content)
 
             # *** File streaming within a byte range ***
             # If a Range is provided, parse Range attribute of the request
@@ -119,7 +145,7 @@ class StaticContentServer(object):
             response = None
             if request.META.get('HTTP_RANGE'):
                 # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
+                if content_file is None and isinstance(content, StaticContent):
                     content = AssetManager.find(loc, as_stream=True)
 
                 header_value = request.META['HTTP_RANGE']
@@ -146,7 +172,10 @@ class StaticContentServer(object):
 
                         if 0 <= first <= last < content.length:
                             # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                            if content_file is not None:
+                                response = FileResponse(FileRange(content_file, first, last))
+                            else:
+                                response = HttpResponse(content.stream_data_in_range(first, last))
                             response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
@@ -158,11 +187,17 @@ class StaticContentServer(object):
                             log.warning(
                                 u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
                             )
+                            if content_file is not None:
+                                content_file.close()
                             return HttpResponse(status=416)  # Requested Range Not Satisfiable
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                if content_file is not None:
+                    # Lets the WSGI server send the file with its wsgi.file_wrapper, e.g. with sendfile.
+                    response = FileResponse(content_file)
+                else:
+                    response = HttpResponse(content.stream_data())
                 response['Content-Length'] = content.length
 
             newrelic.agent.add_custom_parameter('contentserver.content_len', content.length)
@@ -204,12 +239,22 @@ class StaticContentServer(object):
             response['Cache-Control'] = "private, no-cache, no-store"
 
         response['Last-Modified'] = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+        if getattr(content, "content_digest", None) is not None:
+            response['ETag'] = quote_etag(content.content_digest)
 
         # Force the Vary header to only vary responses on Origin, so that XHR and browser requests get cached
         # separately and don't screw over one another. i.e. a browser request that doesn't send Origin, and
         # caches a version of the response without CORS headers, in turn breaking XHR requests.
         force_header_for_response(response, 'Vary', 'Origin')
 
+    def not_modified_response(self, content):
+        """
+        Returns a response telling that the given content hasn't changed since the client got it.
+        """
+        response = HttpResponseNotModified()
+        self.set_caching_headers(content, response)
+        return response
+
     @staticmethod
     def is_cdn_request(request):
         """
@@ -281,6 +326,56 @@ class StaticContentServer(object):
 
         return content
 
+    def load_asset_metadata_from_location(self, location, requested_digest=None):
+        """
+        Loads the metadata of an asset based on its location, either retrieving it from a cache
+        or loading the asset itself.
+
+        Metadata retrieved from the cache comes as a StaticContent without data, which can be
+        loaded with load_asset_data.  If the requested digest doesn't match the cached one, the
+        asset is loaded in case it was changed since its metadata was cached.
+        """
+        content = get_cached_content_metadata(location)
+        if content is None or (requested_digest is not None and requested_digest != content.content_digest):
+            content = self.load_asset_from_location(location)
+            set_cached_content_metadata(content)
+        return content
+
+    def load_asset_data(self, location, content):
+        """
+        Returns the given content if it has its data, or loads the asset with its data otherwise.
+        """
+        if isinstance(content, StaticContentStream) or content.data is not None:
+            return content
+        return self.load_asset_from_location(location)
+
+
+class FileRange(object):
+    """
+    A read-only file-like object over a byte range of a file, for streaming the range in a
+    FileResponse.
+    """
+    def __init__(self, file_obj, first_byte, last_byte):
+        file_obj.seek(first_byte)
+        self._file = file_obj
+        self._remaining = last_byte - first_byte + 1
+
+    def read(self, size=-1):
+        """
+        Reads up to size bytes of the range, or the rest of the range if size is negative.
+        """
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        """
+        Closes the underlying file.
+        """
+        self._file.close()
+
 
 def parse_range_header(header_value, content_length):
     """
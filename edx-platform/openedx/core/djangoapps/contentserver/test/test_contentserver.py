@@ -6,6 +6,9 @@ import copy
 import datetime
 import ddt
 import logging
+import os
+import shutil
+import tempfile
 import unittest
 from uuid import uuid4
 
@@ -13,7 +16,7 @@ from django.conf import settings
 from django.test import RequestFactory
 from django.test.client import Client
 from django.test.utils import override_settings
-from mock import patch
+from mock import Mock, patch
 
 from xmodule.contentstore.django import contentstore
 from xmodule.contentstore.content import StaticContent, VERSIONED_ASSETS_PREFIX
@@ -27,6 +30,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory, AdminFactory
 
+from ..caching import _evict_disk_cached_files, add_disk_cached_content, open_disk_cached_content
 from ..middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
 
 log = logging.getLogger(__name__)
@@ -354,6 +358,80 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         self.assertNotIn('Expires', resp)
         self.assertEquals('private, no-cache, no-store', resp['Cache-Control'])
 
+    def test_etag_not_modified(self):
+        """
+        Tests that a request for an asset whose ETag the client has gets a 304 Not Modified.
+        """
+        resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp.status_code, 200)
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=resp['ETag'])
+        self.assertEqual(resp.status_code, 304)
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"{}"'.format(FAKE_MD5_HASH))
+        self.assertEqual(resp.status_code, 200)
+
+    def test_disk_cache(self):
+        """
+        Tests that assets are served from the disk cache, without loading them once they're cached.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        data = self.contentstore.find(self.unlocked_asset).data
+
+        with override_settings(COURSE_ASSETS_DISK_CACHE_DIR=cache_dir):
+            resp = self.client.get(self.url_unlocked)
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(''.join(resp.streaming_content), data)
+
+            with patch('openedx.core.djangoapps.contentserver.middleware.AssetManager.find') as mock_find:
+                resp = self.client.get(self.url_unlocked)
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+                self.assertEqual(''.join(resp.streaming_content), data)
+
+                resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=1-3')
+                self.assertEqual(resp.status_code, 206)
+                self.assertEqual(''.join(resp.streaming_content), data[1:4])
+                self.assertFalse(mock_find.called)
+
+    def test_disk_cache_eviction(self):
+        """
+        Tests that the least recently used files are evicted once the disk cache exceeds its maximum size.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        def add_content(content_digest, last_used):
+            """Adds 4 bytes of content to the disk cache, as last used at the given time."""
+            content = Mock(content_digest=content_digest)
+            content.stream_data.return_value = ['data']
+            add_disk_cached_content(content).close()
+            path = os.path.join(cache_dir, content_digest[:2], content_digest)
+            os.utime(path, (last_used, last_used))
+
+        with override_settings(COURSE_ASSETS_DISK_CACHE_DIR=cache_dir, COURSE_ASSETS_DISK_CACHE_MAX_SIZE=10):
+            # The directory is only walked when the first file is added, and once the cache exceeds its size.
+            with patch(
+                'openedx.core.djangoapps.contentserver.caching._evict_disk_cached_files',
+                wraps=_evict_disk_cached_files,
+            ) as mock_evict:
+                add_content('aa1', 1)
+                add_content('bb2', 2)
+                self.assertEqual(mock_evict.call_count, 1)
+                add_content('cc3', 3)
+                self.assertEqual(mock_evict.call_count, 2)
+            self.assertIsNone(open_disk_cached_content('aa1'))
+
+            # Reading a file marks it as recently used.
+            content_file = open_disk_cached_content('bb2')
+            self.assertEqual(content_file.read(), 'data')
+            content_file.close()
+            add_content('dd4', 4)
+            self.assertIsNone(open_disk_cached_content('cc3'))
+            for content_digest in ('bb2', 'dd4'):
+                content_file = open_disk_cached_content(content_digest)
+                self.assertIsNotNone(content_file)
+                content_file.close()
+
     def test_get_expiration_value(self):
         start_dt = datetime.datetime.strptime("Thu, 01 Dec 1983 20:00:00 GMT", HTTP_DATE_FORMAT)
         near_expire_dt = StaticContentServer.get_expiration_value(start_dt, 55)
@@ -5,7 +5,10 @@ forums, and to the cohort admin views.
 
 import logging
 import random
+from collections import OrderedDict, defaultdict
 
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.db import IntegrityError, transaction
 from django.db.models.signals import post_save, m2m_changed
 from django.dispatch import receiver
@@ -28,6 +31,10 @@ from .models import (
 
 log = logging.getLogger(__name__)
 
+# Maximum number of users that add_users_to_cohort looks up and adds to a
+# cohort at once.
+BULK_COHORT_BATCH_SIZE = 1000
+
 
 @receiver(post_save, sender=CourseUserGroup)
 def _cohort_added(sender, **kwargs):
@@ -407,6 +414,170 @@ def add_user_to_cohort(cohort, username_or_email):
     return (user, membership.previous_cohort_name)
 
 
+def add_users_to_cohort(cohort, usernames_or_emails):
+    """
+    Look up the given users, and add those found to the specified cohort, as
+    add_user_to_cohort does for a single user.
+
+    The users are looked up, and their memberships created or moved to the
+    cohort, in bulk, BULK_COHORT_BATCH_SIZE users at a time.
+
+    Arguments:
+        cohort: CourseUserGroup
+        usernames_or_emails: list of strings.  Each is treated as email if has '@'
+
+    Returns:
+        Tuple of:
+            list of (User object, string or None) tuples of the users added,
+                with the names of their previous cohorts
+            list of the usernames or emails of the users already present in
+                this cohort, including users listed more than once
+            list of the usernames or emails for which no user was found
+    """
+    if cohort.group_type != CourseUserGroup.COHORT:
+        raise ValidationError("CohortMembership cannot be used with CourseGroup types other than COHORT")
+
+    added, already_present, not_found = [], [], []
+    for start in xrange(0, len(usernames_or_emails), BULK_COHORT_BATCH_SIZE):
+        batch = usernames_or_emails[start:start + BULK_COHORT_BATCH_SIZE]
+        try:
+            with transaction.atomic():
+                batch_added, batch_already_present, batch_not_found = _add_users_to_cohort_in_bulk(cohort, batch)
+        except IntegrityError as integrity_error:
+            # An IntegrityError is raised when one of the users was assigned a
+            # cohort meanwhile, e.g. on their first visit to the courseware.
+            log.info(
+                "HANDLING_INTEGRITY_ERROR: IntegrityError encountered for course '%s' and cohort '%s': %s",
+                cohort.course_id, cohort.id, unicode(integrity_error)
+            )
+            batch_added, batch_already_present, batch_not_found = _add_users_to_cohort_one_by_one(cohort, batch)
+        else:
+            for user, previous_cohort in batch_added:
+                tracker.emit(
+                    "edx.cohort.user_add_requested",
+                    {
+                        "user_id": user.id,
+                        "cohort_id": cohort.id,
+                        "cohort_name": cohort.name,
+                        "previous_cohort_id": previous_cohort.id if previous_cohort else None,
+                        "previous_cohort_name": previous_cohort.name if previous_cohort else None,
+                    }
+                )
+            batch_added = [
+                (user, previous_cohort.name if previous_cohort else None) for user, previous_cohort in batch_added
+            ]
+
+        added.extend(batch_added)
+        already_present.extend(batch_already_present)
+        not_found.extend(batch_not_found)
+
+    return added, already_present, not_found
+
+
+def _add_users_to_cohort_in_bulk(cohort, usernames_or_emails):
+    """
+    Adds the users with the given usernames or emails to the specified
+    cohort with a few queries, creating their memberships with a single
+    insert and moving their existing memberships with a single update.
+
+    Expects to be called within a transaction.
+
+    Returns a tuple like add_users_to_cohort, except that the previous
+    cohorts of the users added are returned rather than their names.
+    """
+    users = _get_users_by_usernames_or_emails(usernames_or_emails)
+
+    already_present, not_found = [], []
+    users_to_add = OrderedDict()
+    for username_or_email in usernames_or_emails:
+        user = users.get(username_or_email)
+        if user is None:
+            not_found.append(username_or_email)
+        elif user.id in users_to_add:
+            already_present.append(username_or_email)
+        else:
+            users_to_add[user.id] = (username_or_email, user)
+
+    memberships = {
+        membership.user_id: membership
+        for membership in CohortMembership.objects.select_for_update().select_related('course_user_group').filter(
+            course_id=cohort.course_id,
+            user_id__in=users_to_add.keys(),
+        )
+    }
+
+    added = []
+    new_users = []
+    moved_users = defaultdict(list)
+    for user_id, (username_or_email, user) in users_to_add.iteritems():
+        membership = memberships.get(user_id)
+        if membership is None:
+            new_users.append(user)
+            added.append((user, None))
+        elif membership.course_user_group_id == cohort.id:
+            already_present.append(username_or_email)
+        else:
+            moved_users[membership.course_user_group].append(user)
+            added.append((user, membership.course_user_group))
+
+    CohortMembership.objects.bulk_create([
+        CohortMembership(course_user_group=cohort, user=user, course_id=cohort.course_id) for user in new_users
+    ])
+    if moved_users:
+        CohortMembership.objects.filter(
+            course_id=cohort.course_id,
+            user_id__in=[user.id for users in moved_users.itervalues() for user in users],
+        ).update(course_user_group=cohort)
+        for previous_cohort, users in moved_users.iteritems():
+            previous_cohort.users.remove(*users)
+    if added:
+        cohort.users.add(*[user for user, __ in added])
+
+    return added, already_present, not_found
+
+
+def _add_users_to_cohort_one_by_one(cohort, usernames_or_emails):
+    """
+    Adds the users with the given usernames or emails to the specified
+    cohort one at a time with add_user_to_cohort.
+
+    Returns a tuple like add_users_to_cohort.
+    """
+    added, already_present, not_found = [], [], []
+    for username_or_email in usernames_or_emails:
+        try:
+            added.append(add_user_to_cohort(cohort, username_or_email))
+        except User.DoesNotExist:
+            not_found.append(username_or_email)
+        except ValueError:
+            already_present.append(username_or_email)
+    return added, already_present, not_found
+
+
+def _get_users_by_usernames_or_emails(usernames_or_emails):
+    """
+    Returns a dict of the users with the given usernames or emails, keyed
+    by the given username or email.  Each of the given strings is treated
+    as email if it has '@'.  Emails match case-insensitively, while
+    usernames, which may differ only by case, must match exactly.
+    """
+    usernames = [value for value in usernames_or_emails if '@' not in value]
+    emails = [value for value in usernames_or_emails if '@' in value]
+
+    users = {}
+    if usernames:
+        users_by_username = {user.username: user for user in User.objects.filter(username__in=usernames)}
+        for username in usernames:
+            if username in users_by_username:
+                users[username] = users_by_username[username]
+    if emails:
+        users_by_email = {user.email.lower(): user for user in User.objects.filter(email__in=emails)}
+        for email in emails:
+            if email.lower() in users_by_email:
+                users[email] = users_by_email[email.lower()]
+    return users
+
+
 def get_group_info_for_cohort(cohort, use_cached=False):
     """
     Get the ids of the group and partition to which this cohort has been linked
@@ -19,7 +19,7 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import TEST_DATA_MIXED_MODULESTORE, ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import ToyCourseFactory
 
-from ..models import CourseUserGroup, CourseCohort, CourseUserGroupPartitionGroup
+from ..models import CohortMembership, CourseUserGroup, CourseCohort, CourseUserGroupPartitionGroup
 from .. import cohorts
 from ..tests.helpers import (
     topic_name_to_id, config_course_cohorts, config_course_cohorts_legacy,
@@ -633,6 +633,47 @@ class TestCohorts(ModuleStoreTestCase):
             lambda: cohorts.add_user_to_cohort(first_cohort, "non_existent_username")
         )
 
+    @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
+    def test_add_users_to_cohort(self, mock_tracker):
+        """
+        Make sure cohorts.add_users_to_cohort() adds and moves users to a cohort
+        in bulk, and reports the users already present or not found.
+        """
+        first_user = UserFactory(username="FirstUsername", email="first@b.com")
+        second_user = UserFactory(username="SecondUsername", email="second@b.com")
+        third_user = UserFactory(username="ThirdUsername", email="third@b.com")
+        course = modulestore().get_course(self.toy_course_key)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort")
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort")
+        cohorts.add_user_to_cohort(first_cohort, "SecondUsername")
+        cohorts.add_user_to_cohort(second_cohort, "ThirdUsername")
+
+        added, already_present, not_found = cohorts.add_users_to_cohort(
+            second_cohort,
+            ["firstusername", "second@b.com", "ThirdUsername", "non_existent_username", "FirstUsername"],
+        )
+
+        # usernames must match exactly, since they may differ only by case
+        self.assertEqual(added, [(second_user, "FirstCohort"), (first_user, None)])
+        self.assertEqual(already_present, ["ThirdUsername"])
+        self.assertEqual(not_found, ["firstusername", "non_existent_username"])
+        self.assertEqual(set(second_cohort.users.all()), {first_user, second_user, third_user})
+        self.assertFalse(first_cohort.users.exists())
+        self.assertEqual(
+            CohortMembership.objects.get(user=second_user, course_id=course.id).course_user_group,
+            second_cohort
+        )
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": second_user.id,
+                "cohort_id": second_cohort.id,
+                "cohort_name": second_cohort.name,
+                "previous_cohort_id": first_cohort.id,
+                "previous_cohort_name": first_cohort.name,
+            }
+        )
+
     @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
     def add_user_to_cohorts_race_condition(self, mock_tracker):
         """
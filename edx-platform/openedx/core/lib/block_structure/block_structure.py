@@ -12,7 +12,7 @@ from copy import deepcopy
 from functools import partial
 from logging import getLogger
 
-from openedx.core.lib.graph_traversals import traverse_topologically, traverse_post_order
+from openedx.core.lib.graph_traversals import traverse_topologically, traverse_post_order, traverse_pre_order
 
 from .exceptions import TransformerException
 
@@ -758,6 +758,12 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
     designed and implemented generically so it can work with any
     interface and implementation of an xBlock.
     """
+    # Name of the xBlock attribute that identifies the version of a
+    # block's own entry in the modulestore, if supported by the
+    # modulestore.  It is always collected so that a later collection
+    # can determine which blocks changed since.
+    BLOCK_VERSION_FIELD = 'update_version'
+
     def __init__(self, root_block_usage_key):
         super(BlockStructureModulestoreData, self).__init__(root_block_usage_key)
 
@@ -768,7 +774,13 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         # Set of xBlock field names that have been requested for
         # collection.
         # set(string)
-        self._requested_xblock_fields = set()
+        self._requested_xblock_fields = {self.BLOCK_VERSION_FIELD}
+
+        # Set of usage keys of the blocks that are to be yielded by
+        # traversals during an incremental collection.  None when all
+        # blocks are to be collected.
+        # set(UsageKey) or NoneType
+        self._blocks_to_collect = None
 
     def request_xblock_fields(self, *field_names):
         """
@@ -796,9 +808,99 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         """
         return self._xblock_map[usage_key]
 
+    def topological_traversal(self, *args, **kwargs):
+        """
+        See BlockStructure.topological_traversal.  During an incremental
+        collection, only blocks that are to be collected are yielded.
+        """
+        return self._filter_blocks_to_collect(
+            super(BlockStructureModulestoreData, self).topological_traversal(*args, **kwargs)
+        )
+
+    def post_order_traversal(self, *args, **kwargs):
+        """
+        See BlockStructure.post_order_traversal.  During an incremental
+        collection, only blocks that are to be collected are yielded.
+        """
+        return self._filter_blocks_to_collect(
+            super(BlockStructureModulestoreData, self).post_order_traversal(*args, **kwargs)
+        )
+
     #--- Internal methods ---#
     # To be used within the block_structure framework or by tests.
 
+    def _start_incremental_collect(self, previous_block_structure):
+        """
+        Prepares this block structure for an incremental collection by
+        reusing the transformer data previously collected in the given
+        block structure for all blocks that are unaffected by changes
+        in the modulestore since then.
+
+        A block is affected if its own entry in the modulestore changed,
+        if its relations changed, if it descends from such a block, or
+        if it is an ancestor of any affected block - since collected
+        data is percolated both down and up the structure.  Until
+        _end_incremental_collect is called, traversals only yield the
+        affected blocks, while transformers can still read the reused
+        data of unaffected parents and children.
+
+        Arguments:
+            previous_block_structure (BlockStructureBlockData) - A
+                block structure that was previously collected for the
+                same root block.
+
+        Returns:
+            set(UsageKey) - The usage keys of the affected blocks.
+
+            NoneType - If the versions of the blocks are not supported
+                by the modulestore, so an incremental collection is not
+                possible.
+        """
+        changed_blocks = set()
+        for usage_key in self.get_block_keys():
+            version = getattr(self._xblock_map.get(usage_key), self.BLOCK_VERSION_FIELD, None)
+            if version is None:
+                return None
+            if (
+                    usage_key not in previous_block_structure or
+                    previous_block_structure.get_xblock_field(usage_key, self.BLOCK_VERSION_FIELD) != version or
+                    previous_block_structure.get_children(usage_key) != self.get_children(usage_key) or
+                    previous_block_structure.get_parents(usage_key) != self.get_parents(usage_key)
+            ):
+                changed_blocks.add(usage_key)
+
+        affected_blocks = set()
+        for usage_key in changed_blocks:
+            if usage_key not in affected_blocks:
+                affected_blocks.update(traverse_pre_order(usage_key, self.get_children))
+        for usage_key in list(affected_blocks):
+            affected_blocks.update(traverse_pre_order(usage_key, self.get_parents))
+
+        for usage_key in self.get_block_keys():
+            if usage_key not in affected_blocks and usage_key in previous_block_structure._block_data_map:
+                previous_block_data = previous_block_structure[usage_key]
+                self._get_or_create_block(usage_key).transformer_data = previous_block_data.transformer_data
+        self.transformer_data = previous_block_structure.transformer_data
+
+        self._blocks_to_collect = affected_blocks
+        return affected_blocks
+
+    def _end_incremental_collect(self):
+        """
+        Restores the traversals of this block structure to yield all
+        blocks after an incremental collection.
+        """
+        self._blocks_to_collect = None
+
+    def _filter_blocks_to_collect(self, traversal):
+        """
+        Returns the given traversal, filtered to only the blocks that
+        are to be collected during an incremental collection.
+        """
+        if self._blocks_to_collect is None:
+            return traversal
+        return (usage_key for usage_key in traversal if usage_key in self._blocks_to_collect)
+
     def _add_xblock(self, usage_key, xblock):
         """
         Associates the given xBlock object with the given usage_key.
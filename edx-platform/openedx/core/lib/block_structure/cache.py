@@ -1,35 +1,168 @@
 """
-Module for the Cache class for BlockStructure objects.
+Module for the Cache classes for BlockStructure objects.
 """
 # pylint: disable=protected-access
+from collections import OrderedDict, namedtuple
 from logging import getLogger
+from threading import Lock
+from uuid import uuid4
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
-
+from . import serializer
 from .block_structure import BlockStructureBlockData
-from .factory import BlockStructureFactory
 
 
 logger = getLogger(__name__)  # pylint: disable=C0103
 
 
+# An entry in the BlockStructureLocalCache.
+_LocalCacheEntry = namedtuple('_LocalCacheEntry', 'version serialized_data')
+
+
+class BlockStructureLocalCache(object):
+    """
+    A per-process, size-bounded LRU cache of the serialized data of
+    collected BlockStructure objects, meant to be used as a tier in front
+    of a shared BlockStructureCache.
+
+    Entries are keyed by the root block's usage key and are only valid
+    for the collected version of the block structure that they were
+    added with.  The total size of the entries is bounded by the sum of
+    the sizes of their serialized data.
+
+    The serialized data, rather than the deserialized structure, is
+    kept since callers mutate the structures they get.  Deserializing,
+    which decodes the blocks' data lazily, is several times faster than
+    deep-copying a shared structure: about 75ms versus 280ms for a
+    course of 1,700 blocks.
+    """
+    def __init__(self, max_size):
+        """
+        Arguments:
+            max_size (int) - The maximum total size, in bytes, of the
+                serialized data of all the block structures in the cache.
+        """
+        self.max_size = max_size
+
+        # Map of a root block's usage key to its entry, ordered from the
+        # least to the most recently used.
+        # OrderedDict {UsageKey: _LocalCacheEntry}
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+        # Counters for measuring the effectiveness of the cache.
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, root_block_usage_key, version):
+        """
+        Returns the serialized data of the block structure for the given
+        root_block_usage_key if it was added with the given collected
+        version; returns None otherwise.
+        """
+        with self._lock:
+            entry = self._entries.pop(root_block_usage_key, None)
+            if entry is None or entry.version != version:
+                if entry is not None:
+                    self._size -= len(entry.serialized_data)
+                self.misses += 1
+                return None
+            self._entries[root_block_usage_key] = entry
+            self.hits += 1
+            return entry.serialized_data
+
+    def add(self, root_block_usage_key, version, serialized_data):
+        """
+        Adds the given serialized data of the block structure, of the
+        given collected version, to the cache, evicting the least
+        recently used entries as needed.
+        """
+        size = len(serialized_data)
+        if size > self.max_size:
+            return
+        with self._lock:
+            self._pop(root_block_usage_key)
+            self._entries[root_block_usage_key] = _LocalCacheEntry(version, serialized_data)
+            self._size += size
+            while self._size > self.max_size:
+                _, evicted_entry = self._entries.popitem(last=False)
+                self._size -= len(evicted_entry.serialized_data)
+                self.evictions += 1
+
+    def delete(self, root_block_usage_key):
+        """
+        Removes the block structure for the given root_block_usage_key
+        from the cache.
+        """
+        with self._lock:
+            self._pop(root_block_usage_key)
+
+    def clear(self):
+        """
+        Removes all block structures from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get_stats(self):
+        """
+        Returns a dict of the cache's hit, miss and eviction counters
+        along with its current number of entries and total size.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'size': self._size,
+        }
+
+    def _pop(self, root_block_usage_key):
+        """
+        Removes the entry for the given root_block_usage_key, if any.
+        Expects the lock to be held by the caller.
+        """
+        entry = self._entries.pop(root_block_usage_key, None)
+        if entry is not None:
+            self._size -= len(entry.serialized_data)
+
+
 class BlockStructureCache(object):
     """
     Cache for BlockStructure objects.
     """
-    def __init__(self, cache):
+    # The current version of the layout of the entries in the cache.
+    # Incrementally update this value whenever the layout changes, so
+    # entries of an older layout are not read.
+    ENTRY_VERSION = 2
+
+    def __init__(self, cache, local_cache=None):
         """
         Arguments:
             cache (django.core.cache.backends.base.BaseCache) - The
                 cache into which cacheable data of the block structure
                 is to be serialized.
+
+            local_cache (BlockStructureLocalCache) - An optional
+                per-process cache to consult before the given cache.
+                Only a small version entry is read from the given cache
+                when the block structure is found in the local cache,
+                so that a structure collected again, or deleted, by
+                another process is never served from the local cache.
         """
         self._cache = cache
+        self._local_cache = local_cache
 
     def add(self, block_structure):
         """
-        Store a compressed and pickled serialization of the given
-        block structure into the given cache.
+        Store a compressed serialization of the given block structure
+        into the given cache.  See the serializer module for details
+        of the serialization format.
 
         The key in the cache is 'root.key.<root_block_usage_key>'.
         The data stored in the cache includes the structure's
@@ -39,32 +172,38 @@ class BlockStructureCache(object):
             block_structure (BlockStructure) - The block structure
                 that is to be serialized to the given cache.
         """
-        data_to_cache = (
-            block_structure._block_relations,
-            block_structure.transformer_data,
-            block_structure._block_data_map,
-        )
-        zp_data_to_cache = zpickle(data_to_cache)
+        serialized_data = serializer.serialize(block_structure)
+
+        # Identify this collected version of the block structure for
+        # local caches.  The version is stored both on its own, so local
+        # caches can cheaply validate their entries, and along with the
+        # data, so local caches never associate data with the wrong
+        # version.
+        version = self._create_version(block_structure)
 
         # Set the timeout value for the cache to 1 day as a fail-safe
         # in case the signal to invalidate the cache doesn't come through.
         timeout_in_seconds = 60 * 60 * 24
-        self._cache.set(
-            self._encode_root_cache_key(block_structure.root_block_usage_key),
-            zp_data_to_cache,
+        self._cache.set_many(
+            {
+                self._encode_root_cache_key(block_structure.root_block_usage_key): (version, serialized_data),
+                self._encode_version_cache_key(block_structure.root_block_usage_key): version,
+            },
             timeout=timeout_in_seconds,
         )
 
         logger.info(
             "Wrote BlockStructure %s to cache, size: %s",
             block_structure.root_block_usage_key,
-            len(zp_data_to_cache),
+            len(serialized_data),
         )
 
     def get(self, root_block_usage_key):
         """
         Deserializes and returns the block structure starting at
         root_block_usage_key from the given cache, if it's found in the cache.
+        The block data of the returned structure is decoded lazily, as it
+        is accessed.
 
         The given root_block_usage_key must equate the root_block_usage_key
         previously passed to serialize_to_cache.
@@ -81,29 +220,36 @@ class BlockStructureCache(object):
             NoneType - If the root_block_usage_key is not found in the cache.
         """
 
+        # Find root_block_usage_key in the local cache.  The collected
+        # version is read from the given cache since the structure may
+        # have been collected again, or deleted, by another process.
+        serialized_data = None
+        if self._local_cache is not None:
+            version = self._cache.get(self._encode_version_cache_key(root_block_usage_key))
+            if version is not None:
+                serialized_data = self._local_cache.get(root_block_usage_key, version)
+
         # Find root_block_usage_key in the cache.
-        zp_data_from_cache = self._cache.get(self._encode_root_cache_key(root_block_usage_key))
-        if not zp_data_from_cache:
-            logger.info(
-                "Did not find BlockStructure %r in the cache.",
-                root_block_usage_key,
-            )
-            return None
-        else:
-            logger.info(
-                "Read BlockStructure %r from cache, size: %s",
-                root_block_usage_key,
-                len(zp_data_from_cache),
-            )
+        if serialized_data is None:
+            data_from_cache = self._cache.get(self._encode_root_cache_key(root_block_usage_key))
+            if not data_from_cache:
+                logger.info(
+                    "Did not find BlockStructure %r in the cache.",
+                    root_block_usage_key,
+                )
+                return None
+            else:
+                version, serialized_data = data_from_cache
+                logger.info(
+                    "Read BlockStructure %r from cache, size: %s",
+                    root_block_usage_key,
+                    len(serialized_data),
+                )
+                if self._local_cache is not None:
+                    self._local_cache.add(root_block_usage_key, version, serialized_data)
 
         # Deserialize and construct the block structure.
-        block_relations, transformer_data, block_data_map = zunpickle(zp_data_from_cache)
-        return BlockStructureFactory.create_new(
-            root_block_usage_key,
-            block_relations,
-            transformer_data,
-            block_data_map,
-        )
+        return serializer.deserialize(root_block_usage_key, serialized_data)
 
     def delete(self, root_block_usage_key):
         """
@@ -116,6 +262,9 @@ class BlockStructureCache(object):
                 the cache.
         """
         self._cache.delete(self._encode_root_cache_key(root_block_usage_key))
+        self._cache.delete(self._encode_version_cache_key(root_block_usage_key))
+        if self._local_cache is not None:
+            self._local_cache.delete(root_block_usage_key)
         logger.info(
             "Deleted BlockStructure %r from the cache.",
             root_block_usage_key,
@@ -127,7 +276,33 @@ class BlockStructureCache(object):
         Returns the cache key to use for storing the block structure
         for the given root_block_usage_key.
         """
-        return "v{version}.root.key.{root_usage_key}".format(
+        return "v{version}.f{format_version}.e{entry_version}.root.key.{root_usage_key}".format(
             version=unicode(BlockStructureBlockData.VERSION),
+            format_version=unicode(serializer.FORMAT_VERSION),
+            entry_version=unicode(cls.ENTRY_VERSION),
             root_usage_key=unicode(root_block_usage_key),
         )
+
+    @classmethod
+    def _encode_version_cache_key(cls, root_block_usage_key):
+        """
+        Returns the cache key to use for storing the collected version
+        of the block structure for the given root_block_usage_key.
+        """
+        return "v{version}.f{format_version}.e{entry_version}.root.version.{root_usage_key}".format(
+            version=unicode(BlockStructureBlockData.VERSION),
+            format_version=unicode(serializer.FORMAT_VERSION),
+            entry_version=unicode(cls.ENTRY_VERSION),
+            root_usage_key=unicode(root_block_usage_key),
+        )
+
+    @classmethod
+    def _create_version(cls, block_structure):
+        """
+        Returns a new identifier for the collected version of the given
+        block structure, prefixed with its course version, if collected.
+        """
+        return u"{course_version}.{uuid}".format(
+            course_version=block_structure.get_xblock_field(block_structure.root_block_usage_key, 'course_version'),
+            uuid=uuid4().hex,
+        )
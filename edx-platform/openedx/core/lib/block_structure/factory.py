@@ -10,7 +10,7 @@ class BlockStructureFactory(object):
     Factory class for BlockStructure objects.
     """
     @classmethod
-    def create_from_modulestore(cls, root_block_usage_key, modulestore):
+    def create_from_modulestore(cls, root_block_usage_key, modulestore, lazy=False):
         """
         Creates and returns a block structure from the modulestore
         starting at the given root_block_usage_key.
@@ -23,6 +23,11 @@ class BlockStructureFactory(object):
                 contains the data for the xBlocks within the block
                 structure starting at root_block_usage_key.
 
+            lazy (bool) - Whether the modulestore may defer loading the
+                content of the xBlocks until it is accessed.  Useful when
+                only a subset of the xBlocks are expected to be accessed,
+                such as during an incremental collection.
+
         Returns:
             BlockStructureModulestoreData - The created block structure
                 with instantiated xBlocks from the given modulestore
@@ -54,7 +59,7 @@ class BlockStructureFactory(object):
                 block_structure._add_relation(xblock.location, child.location)  # pylint: disable=protected-access
                 build_block_structure(child)
 
-        root_xblock = modulestore.get_item(root_block_usage_key, depth=None, lazy=False)
+        root_xblock = modulestore.get_item(root_block_usage_key, depth=None, lazy=lazy)
         build_block_structure(root_xblock)
         return block_structure
 
@@ -67,6 +72,10 @@ class BlockStructureFactory(object):
         The given root_block_usage_key must equate the root_block_usage_key
         previously passed to serialize_to_cache.
 
+        The xBlock fields and block-specific transformer data of the
+        returned structure are decoded lazily, so only the data that
+        is actually accessed by the requested transformers is decoded.
+
         Arguments:
             root_block_usage_key (UsageKey) - The usage_key for the root
                 of the block structure that is to be deserialized from
@@ -15,7 +15,7 @@ class BlockStructureManager(object):
     Top-level class for managing Block Structures.
     """
 
-    def __init__(self, root_block_usage_key, modulestore, cache):
+    def __init__(self, root_block_usage_key, modulestore, cache, local_cache=None):
         """
         Arguments:
             root_block_usage_key (UsageKey) - The usage_key for the root
@@ -28,10 +28,13 @@ class BlockStructureManager(object):
             cache (django.core.cache.backends.base.BaseCache) - The
                 cache to use for storing/retrieving the block structure's
                 collected data.
+
+            local_cache (BlockStructureLocalCache) - An optional
+                per-process cache to use in front of the given cache.
         """
         self.root_block_usage_key = root_block_usage_key
         self.modulestore = modulestore
-        self.block_structure_cache = BlockStructureCache(cache)
+        self.block_structure_cache = BlockStructureCache(cache, local_cache)
 
     def get_transformed(self, transformers, starting_block_usage_key=None, collected_block_structure=None):
         """
@@ -101,19 +104,31 @@ class BlockStructureManager(object):
 
         return block_structure
 
-    def update_collected(self):
+    def update_collected(self, incremental=False):
         """
         Updates the collected Block Structure for the root_block_usage_key.
 
         Details: The cache is updated by collecting transformers data from
         the modulestore.
+
+        Arguments:
+            incremental (bool) - If True and a compatible collected
+                Block Structure is found in the cache, transformers data
+                is only recollected for the blocks that changed in the
+                modulestore since (along with their ancestors and
+                descendants), and is reused for all other blocks.
         """
         with self._bulk_operations():
+            previous_block_structure = self._get_cached_for_update() if incremental else None
             block_structure = BlockStructureFactory.create_from_modulestore(
                 self.root_block_usage_key,
                 self.modulestore,
+                lazy=previous_block_structure is not None,
             )
-            BlockStructureTransformers.collect(block_structure)
+            if previous_block_structure is not None:
+                BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
+            else:
+                BlockStructureTransformers.collect(block_structure)
             self.block_structure_cache.add(block_structure)
             return block_structure
 
@@ -124,6 +139,21 @@ class BlockStructureManager(object):
         """
         self.block_structure_cache.delete(self.root_block_usage_key)
 
+    def _get_cached_for_update(self):
+        """
+        Returns the collected Block Structure from the cache if it is
+        compatible with the current transformers; returns None otherwise.
+        """
+        try:
+            block_structure = BlockStructureFactory.create_from_cache(
+                self.root_block_usage_key,
+                self.block_structure_cache
+            )
+            BlockStructureTransformers.verify_versions(block_structure)
+        except (BlockStructureNotFound, TransformerDataIncompatible):
+            return None
+        return block_structure
+
     @contextmanager
     def _bulk_operations(self):
         """
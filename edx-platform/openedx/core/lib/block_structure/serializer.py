@@ -0,0 +1,327 @@
+"""
+Module for a compact, versioned serialization format for BlockStructure
+objects.
+
+Rather than pickling the structure's dict-of-objects wholesale, the
+serialized payload is laid out as follows:
+
+    * Interned usage keys - Each usage key in the structure is stored
+      exactly once, in a key table.  Everything else refers to a block
+      by its integer index into this table.
+
+    * Adjacency arrays - Children and parents relations are stored as
+      flat integer arrays with offsets into them (CSR layout).
+
+    * Column-oriented fields - Each collected xBlock field and each
+      transformer's block-specific data is stored as its own column of
+      (block indices, values).  Columns are encoded independently so
+      they can be decoded lazily, i.e., only when a field or a
+      transformer's data is first accessed on the deserialized
+      structure.
+"""
+# pylint: disable=protected-access
+from array import array
+import cPickle as pickle
+from itertools import izip
+from logging import getLogger
+import zlib
+
+from .block_structure import _BlockRelations, BlockData, TransformerData, TransformerDataMap
+from .factory import BlockStructureFactory
+
+
+logger = getLogger(__name__)  # pylint: disable=invalid-name
+
+
+# The current version of the serialization format.  Incrementally update
+# this value whenever the layout of the serialized payload changes.
+FORMAT_VERSION = 1
+
+# Array typecode used for block indices and offsets.
+_INDEX_TYPECODE = 'i'
+
+
+class _LazyColumns(object):
+    """
+    Holds the still-encoded columns of a deserialized block structure
+    and decodes each one into the structure's BlockData objects on
+    first access.
+    """
+    def __init__(self, block_data_list, field_columns, transformer_columns):
+        # List of BlockData objects, indexed by block index.  Blocks
+        # without any collected data have a None entry.
+        # list [BlockData or None]
+        self.block_data_list = block_data_list
+
+        # Map of an xBlock field name to its encoded column.
+        # dict {string: str}
+        self.field_columns = field_columns
+
+        # Map of a transformer's name to its encoded column.
+        # dict {string: str}
+        self.transformer_columns = transformer_columns
+
+    def load_field(self, field_name):
+        """
+        Decodes the column for the given xBlock field name into the
+        blocks' data.  Returns whether a column was found.
+        """
+        column = self.field_columns.pop(field_name, None)
+        if column is None:
+            return False
+        for index, value in _decode_column(column):
+            dict.__setitem__(self.block_data_list[index].fields, field_name, value)
+        return True
+
+    def load_transformer(self, transformer_name):
+        """
+        Decodes the column for the given transformer's block-specific
+        data into the blocks' data.  Returns whether a column was found.
+        """
+        column = self.transformer_columns.pop(transformer_name, None)
+        if column is None:
+            return False
+        for index, fields in _decode_column(column):
+            transformer_data = TransformerData()
+            transformer_data.fields = fields
+            dict.__setitem__(self.block_data_list[index].transformer_data, transformer_name, transformer_data)
+        return True
+
+    def load_all(self):
+        """
+        Decodes all remaining columns.
+        """
+        for field_name in self.field_columns.keys():
+            self.load_field(field_name)
+        for transformer_name in self.transformer_columns.keys():
+            self.load_transformer(transformer_name)
+
+
+class _LazyFieldsDict(dict):
+    """
+    A BlockData fields dict that decodes a field's column from its
+    _LazyColumns the first time the field is looked up.
+    """
+    def __init__(self, lazy_columns):
+        super(_LazyFieldsDict, self).__init__()
+        self.lazy_columns = lazy_columns
+
+    def __missing__(self, field_name):
+        if self.lazy_columns.load_field(field_name):
+            return dict.__getitem__(self, field_name)
+        raise KeyError(field_name)
+
+
+class _LazyTransformerDataMap(TransformerDataMap):
+    """
+    A block's TransformerDataMap that decodes a transformer's column
+    from its _LazyColumns the first time the transformer's data is
+    looked up.
+    """
+    def __init__(self, lazy_columns):
+        super(_LazyTransformerDataMap, self).__init__()
+        self.lazy_columns = lazy_columns
+
+    def __missing__(self, transformer_name):
+        if self.lazy_columns.load_transformer(transformer_name):
+            return dict.__getitem__(self, transformer_name)
+        raise KeyError(transformer_name)
+
+
+def serialize(block_structure):
+    """
+    Returns a compressed serialization of the given block structure's
+    relations, transformer data, and block data.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            that is to be serialized.
+
+    Returns:
+        str - The serialized block structure.
+    """
+    block_relations = block_structure._block_relations
+    block_data_map = block_structure._block_data_map
+
+    # Intern the usage keys.
+    usage_keys = list(block_relations)
+    usage_keys.extend(key for key in block_data_map if key not in block_relations)
+    key_index = {usage_key: index for index, usage_key in enumerate(usage_keys)}
+
+    # Only the leading usage keys, which are in block_relations, have
+    # entries in the adjacency arrays.
+    related_keys = usage_keys[:len(block_relations)]
+    children_offsets, children = _encode_adjacency(
+        related_keys, key_index, block_relations, lambda relations: relations.children,
+    )
+    parents_offsets, parents = _encode_adjacency(
+        related_keys, key_index, block_relations, lambda relations: relations.parents,
+    )
+
+    # Pivot block data into columns.
+    data_indices = array(_INDEX_TYPECODE)
+    field_columns = {}
+    transformer_columns = {}
+    for index, usage_key in enumerate(usage_keys):
+        block_data = block_data_map.get(usage_key)
+        if block_data is None:
+            continue
+        data_indices.append(index)
+        _load_all_lazy_columns(block_data)
+        for field_name, value in block_data.fields.iteritems():
+            field_columns.setdefault(field_name, ([], []))
+            field_columns[field_name][0].append(index)
+            field_columns[field_name][1].append(value)
+        for transformer_name, transformer_data in block_data.transformer_data.iteritems():
+            transformer_columns.setdefault(transformer_name, ([], []))
+            transformer_columns[transformer_name][0].append(index)
+            transformer_columns[transformer_name][1].append(transformer_data.fields)
+
+    transformer_data = {
+        transformer_name: data.fields
+        for transformer_name, data in block_structure.transformer_data.iteritems()
+    }
+
+    return zlib.compress(pickle.dumps(
+        (
+            FORMAT_VERSION,
+            usage_keys,
+            children_offsets.tostring(),
+            children.tostring(),
+            parents_offsets.tostring(),
+            parents.tostring(),
+            data_indices.tostring(),
+            transformer_data,
+            {name: _encode_column(*column) for name, column in field_columns.iteritems()},
+            {name: _encode_column(*column) for name, column in transformer_columns.iteritems()},
+        ),
+        pickle.HIGHEST_PROTOCOL,
+    ))
+
+
+def deserialize(root_block_usage_key, serialized_data):
+    """
+    Returns a new block structure from the given serialized data.
+    Block relations and structure-wide transformer data are decoded
+    immediately, while xBlock fields and block-specific transformer
+    data are decoded lazily, one column at a time, upon first access.
+
+    Arguments:
+        root_block_usage_key (UsageKey) - The usage_key for the root
+            of the serialized block structure.
+
+        serialized_data (str) - Data previously returned by serialize.
+
+    Returns:
+        BlockStructureBlockData - The deserialized block structure.
+
+        NoneType - If the serialized data is of an unknown version of
+            the format.
+    """
+    payload = pickle.loads(zlib.decompress(serialized_data))
+    if payload[0] != FORMAT_VERSION:
+        logger.info(
+            "Ignoring serialized BlockStructure %r of format version %s.",
+            root_block_usage_key,
+            payload[0],
+        )
+        return None
+
+    (
+        _,
+        usage_keys,
+        children_offsets,
+        children,
+        parents_offsets,
+        parents,
+        data_indices,
+        transformer_data,
+        field_columns,
+        transformer_columns,
+    ) = payload
+
+    # Rebuild the block relations of the leading usage keys that have
+    # entries in the adjacency arrays.
+    block_relations = {}
+    children_offsets, children = _decode_array(children_offsets), _decode_array(children)
+    parents_offsets, parents = _decode_array(parents_offsets), _decode_array(parents)
+    for index, offset in enumerate(children_offsets[:-1]):
+        usage_key = usage_keys[index]
+        block_relations[usage_key] = relations = _BlockRelations()
+        relations.children = [usage_keys[child] for child in children[offset:children_offsets[index + 1]]]
+        relations.parents = [
+            usage_keys[parent] for parent in parents[parents_offsets[index]:parents_offsets[index + 1]]
+        ]
+
+    # Create empty block data to be filled in lazily.
+    block_data_list = [None] * len(usage_keys)
+    lazy_columns = _LazyColumns(block_data_list, field_columns, transformer_columns)
+    block_data_map = {}
+    for index in _decode_array(data_indices):
+        usage_key = usage_keys[index]
+        block_data = BlockData(usage_key)
+        block_data.fields = _LazyFieldsDict(lazy_columns)
+        block_data.transformer_data = _LazyTransformerDataMap(lazy_columns)
+        block_data_list[index] = block_data_map[usage_key] = block_data
+
+    structure_transformer_data = TransformerDataMap()
+    for transformer_name, fields in transformer_data.iteritems():
+        structure_transformer_data[transformer_name] = TransformerData()
+        structure_transformer_data[transformer_name].fields = fields
+
+    return BlockStructureFactory.create_new(
+        root_block_usage_key,
+        block_relations,
+        structure_transformer_data,
+        block_data_map,
+    )
+
+
+def _load_all_lazy_columns(block_data):
+    """
+    Ensures that all lazily decoded columns that the given block data
+    depends upon have been decoded.
+    """
+    for lazy_dict in (block_data.fields, block_data.transformer_data):
+        lazy_columns = getattr(lazy_dict, 'lazy_columns', None)
+        if lazy_columns is not None:
+            lazy_columns.load_all()
+
+
+def _encode_adjacency(usage_keys, key_index, block_relations, get_related):
+    """
+    Returns an (offsets, indices) pair of arrays encoding the relations
+    returned by get_related for each of the given usage_keys.
+    """
+    offsets = array(_INDEX_TYPECODE, [0])
+    indices = array(_INDEX_TYPECODE)
+    for usage_key in usage_keys:
+        indices.extend(key_index[related_key] for related_key in get_related(block_relations[usage_key]))
+        offsets.append(len(indices))
+    return offsets, indices
+
+
+def _encode_column(indices, values):
+    """
+    Returns an encoded column for the given block indices and their
+    corresponding values.
+    """
+    return pickle.dumps((array(_INDEX_TYPECODE, indices).tostring(), values), pickle.HIGHEST_PROTOCOL)
+
+
+def _decode_column(column):
+    """
+    Returns an iterator of (block index, value) pairs of the given
+    encoded column.
+    """
+    indices, values = pickle.loads(column)
+    return izip(_decode_array(indices), values)
+
+
+def _decode_array(data):
+    """
+    Returns an array of block indices from the given string.
+    """
+    decoded = array(_INDEX_TYPECODE)
+    decoded.fromstring(data)
+    return decoded
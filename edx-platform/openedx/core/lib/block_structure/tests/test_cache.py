@@ -1,10 +1,11 @@
 """
 Tests for block_structure/cache.py
 """
+from mock import patch
 from nose.plugins.attrib import attr
 from unittest import TestCase
 
-from ..cache import BlockStructureCache
+from ..cache import BlockStructureCache, BlockStructureLocalCache
 from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer
 
 
@@ -47,6 +48,13 @@ class TestBlockStructureCache(ChildrenMapTestMixin, TestCase):
             self.block_structure_cache.get(self.block_structure.root_block_usage_key)
         )
 
+    def test_get_entry_of_other_version(self):
+        self.block_structure_cache.add(self.block_structure)
+        with patch.object(BlockStructureCache, 'ENTRY_VERSION', BlockStructureCache.ENTRY_VERSION + 1):
+            self.assertIsNone(
+                self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+            )
+
     def test_delete(self):
         self.add_transformers()
         self.block_structure_cache.add(self.block_structure)
@@ -54,3 +62,60 @@ class TestBlockStructureCache(ChildrenMapTestMixin, TestCase):
         self.assertIsNone(
             self.block_structure_cache.get(self.block_structure.root_block_usage_key)
         )
+
+
+@attr(shard=2)
+class TestBlockStructureLocalCache(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for BlockStructureLocalCache
+    """
+    def setUp(self):
+        super(TestBlockStructureLocalCache, self).setUp()
+        self.children_map = self.SIMPLE_CHILDREN_MAP
+        self.block_structure = self.create_block_structure(self.children_map)
+        self.mock_cache = MockCache()
+        self.local_cache = BlockStructureLocalCache(max_size=10 ** 6)
+        self.block_structure_cache = BlockStructureCache(self.mock_cache, self.local_cache)
+
+    def test_hit_after_miss(self):
+        self.block_structure_cache.add(self.block_structure)
+        for _ in range(3):
+            cached_value = self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+            self.assert_block_structure(cached_value, self.children_map)
+        self.assertEquals(self.local_cache.get_stats()['misses'], 1)
+        self.assertEquals(self.local_cache.get_stats()['hits'], 2)
+
+    def test_hits_are_copies(self):
+        self.block_structure_cache.add(self.block_structure)
+        first_value = self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+        first_value.remove_block(1, keep_descendants=False)
+        second_value = self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(second_value, self.children_map)
+
+    def test_new_version_misses(self):
+        self.block_structure_cache.add(self.block_structure)
+        self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+
+        updated_children_map = self.LINEAR_CHILDREN_MAP
+        self.block_structure_cache.add(self.create_block_structure(updated_children_map))
+        cached_value = self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(cached_value, updated_children_map)
+        self.assertEquals(self.local_cache.get_stats()['misses'], 2)
+        self.assertEquals(len(self.local_cache), 1)
+
+    def test_delete(self):
+        self.block_structure_cache.add(self.block_structure)
+        self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+        self.block_structure_cache.delete(self.block_structure.root_block_usage_key)
+        self.assertEquals(len(self.local_cache), 0)
+        self.assertIsNone(self.block_structure_cache.get(self.block_structure.root_block_usage_key))
+
+    def test_eviction(self):
+        local_cache = BlockStructureLocalCache(max_size=10)
+        for root_block_usage_key in range(4):
+            local_cache.add(root_block_usage_key, 'version', 'data')
+        self.assertEquals(len(local_cache), 2)
+        self.assertEquals(local_cache.get_stats()['evictions'], 2)
+        self.assertIsNone(local_cache.get(0, 'version'))
+        self.assertIsNotNone(local_cache.get(3, 'version'))
+        self.assertIsNone(local_cache.get(3, 'other_version'))
@@ -1,6 +1,7 @@
 """
 Tests for manager.py
 """
+from mock import patch
 from nose.plugins.attrib import attr
 from unittest import TestCase
 
@@ -195,3 +196,72 @@ class TestBlockStructureManager(TestCase, ChildrenMapTestMixin):
         self.bs_manager.clear()
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         self.assertEquals(TestTransformer1.collect_call_count, 2)
+
+
+class TestIncrementalTransformer(TestTransformer1):
+    """
+    Test Transformer class that supports incremental collection and
+    records the blocks it collected data for.
+    """
+    SUPPORTS_INCREMENTAL_COLLECT = True
+    collected_blocks = []
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects block data for the block structure, recording the
+        blocks that were traversed.
+        """
+        super(TestIncrementalTransformer, cls).collect(block_structure)
+        cls.collected_blocks = list(block_structure.topological_traversal())
+
+
+@attr(shard=2)
+class TestBlockStructureManagerIncrementalUpdate(TestCase, ChildrenMapTestMixin):
+    """
+    Test class for incremental updates by the BlockStructureManager.
+    """
+    def setUp(self):
+        super(TestBlockStructureManagerIncrementalUpdate, self).setUp()
+        self.registered_transformers = [TestIncrementalTransformer()]
+        self.children_map = self.SIMPLE_CHILDREN_MAP
+        self.modulestore = MockModulestoreFactory.create(self.children_map)
+        for block in self.modulestore.blocks.itervalues():
+            block.field_map['update_version'] = 'version1'
+        self.bs_manager = BlockStructureManager(
+            root_block_usage_key=0,
+            modulestore=self.modulestore,
+            cache=MockCache(),
+        )
+
+    def update_collected(self, incremental):
+        """
+        Updates the collected block structure and verifies its data.
+        """
+        with mock_registered_transformers(self.registered_transformers):
+            block_structure = self.bs_manager.update_collected(incremental=incremental)
+        self.assert_block_structure(block_structure, self.children_map)
+        TestIncrementalTransformer.assert_collected(block_structure)
+        return block_structure
+
+    def test_incremental_update(self):
+        self.update_collected(incremental=True)
+        self.assertItemsEqual(TestIncrementalTransformer.collected_blocks, range(5))
+
+        self.modulestore.blocks[3].field_map['update_version'] = 'version2'
+        block_structure = self.update_collected(incremental=True)
+        self.assertItemsEqual(TestIncrementalTransformer.collected_blocks, [0, 1, 3])
+        self.assertEquals(block_structure.get_xblock_field(3, 'update_version'), 'version2')
+        self.assertItemsEqual(block_structure.topological_traversal(), range(5))
+
+    def test_incremental_update_unsupported_transformer(self):
+        self.update_collected(incremental=True)
+        self.modulestore.blocks[3].field_map['update_version'] = 'version2'
+        with patch.object(TestIncrementalTransformer, 'SUPPORTS_INCREMENTAL_COLLECT', False):
+            self.update_collected(incremental=True)
+        self.assertItemsEqual(TestIncrementalTransformer.collected_blocks, range(5))
+
+    def test_full_update(self):
+        self.update_collected(incremental=False)
+        self.update_collected(incremental=False)
+        self.assertItemsEqual(TestIncrementalTransformer.collected_blocks, range(5))
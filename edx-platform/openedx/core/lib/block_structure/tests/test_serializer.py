@@ -0,0 +1,90 @@
+"""
+Tests for block_structure/serializer.py
+"""
+# pylint: disable=protected-access
+import cPickle as pickle
+import ddt
+from nose.plugins.attrib import attr
+from unittest import TestCase
+import zlib
+
+from .. import serializer
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+@attr(shard=2)
+@ddt.ddt
+class TestBlockStructureSerializer(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the block structure serializer.
+    """
+    def create_collected_structure(self, children_map):
+        """
+        Returns a block structure for the given children_map, with
+        mock xBlock fields and transformer data set on its blocks.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)
+        for block_key in range(len(children_map)):
+            block_data = block_structure._get_or_create_block(block_key)
+            block_data.display_name = 'Block {}'.format(block_key)
+            if block_key % 2:
+                block_data.graded = True
+            block_structure.set_transformer_block_field(block_key, MockTransformer, 'test', block_key * 10)
+        return block_structure
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_round_trip(self, children_map):
+        block_structure = self.create_collected_structure(children_map)
+        deserialized = serializer.deserialize(0, serializer.serialize(block_structure))
+
+        self.assert_block_structure(deserialized, children_map)
+        self.assertEquals(deserialized._get_transformer_data_version(MockTransformer), MockTransformer.WRITE_VERSION)
+        for block_key in range(len(children_map)):
+            self.assertEquals(deserialized.get_xblock_field(block_key, 'display_name'), 'Block {}'.format(block_key))
+            self.assertEquals(deserialized.get_xblock_field(block_key, 'graded'), True if block_key % 2 else None)
+            self.assertEquals(
+                deserialized.get_transformer_block_field(block_key, MockTransformer, 'test'),
+                block_key * 10,
+            )
+
+    def test_lazy_decoding(self):
+        block_structure = self.create_collected_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = serializer.deserialize(0, serializer.serialize(block_structure))
+        lazy_columns = deserialized[0].fields.lazy_columns
+        self.assertItemsEqual(lazy_columns.field_columns, ['display_name', 'graded'])
+        self.assertItemsEqual(lazy_columns.transformer_columns, [MockTransformer.name()])
+
+        deserialized.get_xblock_field(1, 'graded')
+        self.assertItemsEqual(lazy_columns.field_columns, ['display_name'])
+        self.assertItemsEqual(lazy_columns.transformer_columns, [MockTransformer.name()])
+
+        deserialized.get_transformer_block_field(2, MockTransformer, 'test')
+        self.assertItemsEqual(lazy_columns.transformer_columns, [])
+
+    def test_copy_and_reserialize(self):
+        block_structure = self.create_collected_structure(self.DAG_CHILDREN_MAP)
+        deserialized = serializer.deserialize(0, serializer.serialize(block_structure))
+        copied = deserialized.copy()
+        reserialized = serializer.deserialize(0, serializer.serialize(copied))
+
+        self.assert_block_structure(reserialized, self.DAG_CHILDREN_MAP)
+        self.assertEquals(reserialized.get_xblock_field(3, 'display_name'), 'Block 3')
+        self.assertEquals(reserialized.get_transformer_block_field(3, MockTransformer, 'test'), 30)
+
+    def test_blocks_without_data(self):
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = serializer.deserialize(0, serializer.serialize(block_structure))
+        self.assert_block_structure(deserialized, self.SIMPLE_CHILDREN_MAP)
+        self.assertEquals(deserialized._block_data_map, {})
+
+    def test_unknown_format_version(self):
+        payload = list(pickle.loads(zlib.decompress(
+            serializer.serialize(self.create_block_structure(self.SIMPLE_CHILDREN_MAP))
+        )))
+        payload[0] = serializer.FORMAT_VERSION + 1
+        self.assertIsNone(serializer.deserialize(0, zlib.compress(pickle.dumps(tuple(payload)))))
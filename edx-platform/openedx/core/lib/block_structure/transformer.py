@@ -55,6 +55,19 @@ class BlockStructureTransformer(object):
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the transformer's collect method supports incremental
+    # collection.  During an incremental collection, the block
+    # structure's traversals only yield the blocks that are affected by
+    # changes in the modulestore, while the transformer's data that was
+    # previously collected for the remaining blocks is retained and
+    # remains readable.  A transformer can support this if the data it
+    # collects for a block depends only on the block itself and on the
+    # data collected for the block's ancestors or descendants.
+    #
+    # Block structures are only collected incrementally if all
+    # registered transformers support it.
+    SUPPORTS_INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
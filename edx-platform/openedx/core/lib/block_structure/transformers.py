@@ -82,6 +82,55 @@ class BlockStructureTransformers(object):
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+    @classmethod
+    def collect_incrementally(cls, block_structure, previous_block_structure):
+        """
+        Collects data for each registered transformer, only for the
+        blocks that are affected by changes since the given previously
+        collected block structure, reusing its data for all other blocks.
+
+        Falls back to a full collection if any registered transformer
+        does not support incremental collection or if the modulestore
+        does not support versions of blocks.
+        """
+        unsupported_transformers = [
+            transformer for transformer in TransformerRegistry.get_registered_transformers()
+            if not transformer.SUPPORTS_INCREMENTAL_COLLECT or (
+                # Data collected by a different version of the
+                # transformer cannot be reused.
+                previous_block_structure._get_transformer_data_version(transformer)  # pylint: disable=protected-access
+                != transformer.WRITE_VERSION
+            )
+        ]
+        if unsupported_transformers:
+            logger.info(
+                "Collecting BlockStructure %s in full since transformers cannot collect incrementally: %s",
+                block_structure.root_block_usage_key,
+                [transformer.name() for transformer in unsupported_transformers],
+            )
+            return cls.collect(block_structure)
+
+        affected_blocks = block_structure._start_incremental_collect(  # pylint: disable=protected-access
+            previous_block_structure
+        )
+        if affected_blocks is None:
+            logger.info(
+                "Collecting BlockStructure %s in full since block versions are not supported.",
+                block_structure.root_block_usage_key,
+            )
+            return cls.collect(block_structure)
+
+        logger.info(
+            "Collecting BlockStructure %s incrementally for %d of %d blocks.",
+            block_structure.root_block_usage_key,
+            len(affected_blocks),
+            len(block_structure),
+        )
+        try:
+            cls.collect(block_structure)
+        finally:
+            block_structure._end_incremental_collect()  # pylint: disable=protected-access
+
     @classmethod
     def verify_versions(cls, block_structure):
         """
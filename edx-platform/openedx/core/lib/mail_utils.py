@@ -7,16 +7,34 @@ import textwrap
 MAX_LINE_LENGTH = 900
 
 
-def wrap_message(message, width=MAX_LINE_LENGTH):
+def wrap_message(message, width=MAX_LINE_LENGTH, cache=None):
     """
     RFC 2822 states that line lengths in emails must be less than 998. Some MTA's add newlines to messages if any line
     exceeds a certain limit (the exact limit varies). Sendmail goes so far as to add '!\n' after the 990th character in
     a line. To ensure that messages look consistent this helper function wraps long lines to a conservative length.
+
+    When wrapping many similar messages, a dict may be passed as `cache`, in which the wrapped version of each line is
+    kept so that lines common to the messages are only wrapped once.
     """
     lines = message.split('\n')
-    wrapped_lines = [textwrap.fill(
-        line, width, expand_tabs=False, replace_whitespace=False, drop_whitespace=False, break_on_hyphens=False
-    ) for line in lines]
+    wrapped_lines = [_wrap_line(line, width, cache) for line in lines]
     wrapped_message = '\n'.join(wrapped_lines)
 
     return wrapped_message
+
+
+def _wrap_line(line, width, cache):
+    """
+    Wraps a single line to the given width, using the cache of previously wrapped lines, if any.
+    """
+    if cache is not None:
+        wrapped_line = cache.get((line, width))
+        if wrapped_line is not None:
+            return wrapped_line
+
+    wrapped_line = textwrap.fill(
+        line, width, expand_tabs=False, replace_whitespace=False, drop_whitespace=False, break_on_hyphens=False
+    )
+    if cache is not None:
+        cache[(line, width)] = wrapped_line
+    return wrapped_line
@@ -237,6 +237,31 @@ def replace_course_urls(course_id, block, view, frag, context):  # pylint: disab
     return wrap_fragment(frag, static_replace.replace_course_urls(frag.content, course_id))
 
 
+def replace_urls(
+        course_id,
+        block,                          # pylint: disable=unused-argument
+        view,                           # pylint: disable=unused-argument
+        frag,
+        context,                        # pylint: disable=unused-argument
+        data_dir=None,
+        static_asset_path='',
+        jump_to_id_base_url=None
+):
+    """
+    Updates the supplied module with a new get_html function that wraps
+    the old get_html function and substitutes, in a single pass, the urls that
+    replace_static_urls, replace_course_urls and replace_jump_to_id_urls substitute.
+    See static_replace.replace_urls
+    """
+    return wrap_fragment(frag, static_replace.replace_urls(
+        frag.content,
+        course_id,
+        data_directory=data_dir,
+        static_asset_path=static_asset_path,
+        jump_to_id_base_url=jump_to_id_base_url,
+    ))
+
+
 def replace_static_urls(data_dir, block, view, frag, context, course_id=None, static_asset_path=''):  # pylint: disable=unused-argument
     """
     Updates the supplied module with a new get_html function that wraps